@@ -4,7 +4,7 @@ from typing import Optional
 from PyQt5 import QtGui, QtWidgets
 
 from effects_window import EffectsWindow
-from stream_window import StreamWindow, DXCAM_AVAILABLE, NUMPY_AVAILABLE, OPENCV_AVAILABLE
+from stream_window import StreamWindow, DXCAM_AVAILABLE, NUMBA_AVAILABLE, NUMPY_AVAILABLE, OPENCV_AVAILABLE
 from gl_view import GL_AVAILABLE
 from wgc_capture import WGC_AVAILABLE
 from window_utils import list_windows
@@ -82,20 +82,32 @@ class SelectorWindow(QtWidgets.QWidget):
             GL_AVAILABLE,
             WGC_AVAILABLE,
             OPENCV_AVAILABLE,
+            NUMBA_AVAILABLE,
         )
 
         self.effects_win.effects_changed.connect(self.stream_win.set_effects)
+        self.effects_win.effects_chain_changed.connect(self.stream_win.set_effects_chain)
         self.effects_win.fps_changed.connect(self.stream_win.set_target_fps)
         self.effects_win.scale_changed.connect(self.stream_win.set_scale_percent)
         self.effects_win.perf_changed.connect(self.stream_win.set_fast_mode)
+        self.effects_win.downscale_changed.connect(self.stream_win.set_downscale_mode)
         self.effects_win.gpu_changed.connect(self.stream_win.set_gpu_mode)
         self.effects_win.client_area_changed.connect(self.stream_win.set_capture_client_area)
         self.effects_win.dxcam_async_changed.connect(self.stream_win.set_dxcam_async)
+        self.effects_win.shared_capture_changed.connect(self.stream_win.set_shared_capture)
+        self.effects_win.adaptive_quality_changed.connect(self.stream_win.set_adaptive_quality)
         self.effects_win.crop_changed.connect(self.stream_win.set_crop)
         self.effects_win.blob_changed.connect(self.stream_win.set_blob_params)
         self.effects_win.backend_changed.connect(self.stream_win.set_capture_backend)
         self.effects_win.effects_backend_changed.connect(self.stream_win.set_effects_backend)
+        self.effects_win.effects_workers_changed.connect(self.stream_win.set_effects_workers)
         self.stream_win.fps_updated.connect(self.effects_win.set_actual_fps)
+        self.stream_win.capture_stats_updated.connect(self.effects_win.set_capture_stats)
+        self.stream_win.change_stats_updated.connect(self.effects_win.set_change_stats)
+        self.stream_win.capture_probe_updated.connect(self.effects_win.set_capture_probe)
+        self.stream_win.latency_updated.connect(self.effects_win.set_latency_stats)
+        self.stream_win.frame_timing_updated.connect(self.effects_win.set_frame_timing)
+        self.stream_win.quality_changed.connect(self.effects_win.set_quality_status)
         self.stream_win.destroyed.connect(self.effects_win.close)
 
         self.effects_win.emit_current()
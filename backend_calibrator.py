@@ -0,0 +1,84 @@
+import statistics
+from collections import OrderedDict
+from typing import Dict, List, Sequence
+
+from config_store import load_backend_cache, save_backend_cache
+from logger_utils import get_logger
+
+
+class BackendCalibrator:
+    """Picks the fastest effects backend per frame signature, for "auto".
+
+    The first frames of an unknown signature are rendered with each
+    candidate in turn: ``warmup`` untimed frames (JIT, plans, buffers), then
+    ``samples`` timed ones. The lowest median wins and is kept in
+    ``backend_cache.json`` next to ``configs.json``, so a known signature
+    starts with its winner on the next run. Only the ``max_entries`` most
+    recently used signatures are kept.
+    """
+
+    def __init__(self, samples: int = 3, warmup: int = 1, persist: bool = True, max_entries: int = 32):
+        self._samples = max(1, int(samples))
+        self._warmup = max(0, int(warmup))
+        self._persist = persist
+        self._max_entries = max(1, int(max_entries))
+        self._winners = OrderedDict(load_backend_cache() if persist else {})
+        self._evict()
+        self._key = None
+        self._candidates: List[str] = []
+        self._seen: Dict[str, int] = {}
+        self._times: Dict[str, List[float]] = {}
+        self._log = get_logger()
+
+    def pick(self, key: str, candidates: Sequence[str]) -> str:
+        """Backend to render the next frame of ``key`` with."""
+        winner = self._winners.get(key)
+        if winner in candidates:
+            self._winners.move_to_end(key)
+            return winner
+        if key != self._key:
+            self._key = key
+            self._candidates = list(candidates)
+            self._seen = {name: 0 for name in self._candidates}
+            self._times = {name: [] for name in self._candidates}
+        for name in self._candidates:
+            if len(self._times[name]) < self._samples:
+                return name
+        return self._candidates[-1] if self._candidates else candidates[-1]
+
+    def record(self, key: str, backend: str, seconds: float, ok: bool = True) -> None:
+        """Time of one frame rendered by ``backend``; ``ok=False`` drops a backend that cannot render it."""
+        if key != self._key or backend not in self._times:
+            return
+        if not ok:
+            self._candidates.remove(backend)
+            del self._times[backend]
+        else:
+            self._seen[backend] += 1
+            if self._seen[backend] > self._warmup:
+                self._times[backend].append(seconds)
+        if self._candidates and all(len(self._times[name]) >= self._samples for name in self._candidates):
+            self._finish()
+
+    def _finish(self) -> None:
+        medians = {name: statistics.median(times) for name, times in self._times.items()}
+        winner = min(medians, key=medians.get)
+        self._winners[self._key] = winner
+        self._winners.move_to_end(self._key)
+        self._evict()
+        self._log.info(
+            "auto effects: %s for %s (%s)",
+            winner,
+            self._key,
+            ", ".join(f"{name} {ms * 1000.0:.1f} ms" for name, ms in sorted(medians.items(), key=lambda item: item[1])),
+        )
+        self._key = None
+        if self._persist:
+            try:
+                save_backend_cache(self._winners)
+            except OSError:
+                self._log.warning("auto effects: could not write the backend cache")
+
+    def _evict(self) -> None:
+        while len(self._winners) > self._max_entries:
+            self._winners.popitem(last=False)
@@ -0,0 +1,99 @@
+"""
+Headless pipeline benchmark on the synthetic capture source.
+
+Usage:
+- pip install PyQt5 mss pillow numpy
+- python bench.py --res 1080p 1440p 4k --frames 300 --blob
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import QtWidgets
+
+from backend_calibrator import BackendCalibrator
+from stream_window import StreamWindow
+
+
+RESOLUTIONS = {
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160),
+}
+
+
+def run_case(app: QtWidgets.QApplication, args, width: int, height: int) -> None:
+    # Calibrate "auto" in memory only: a benchmark must not touch backend_cache.json.
+    window = StreamWindow(0, calibrator=BackendCalibrator(persist=False))
+    window.scheduler.stop()
+    window.set_capture_threaded(False)
+    window.resize(args.view_w, args.view_h)
+    window.show()
+    window.set_scale_percent(args.scale)
+    window.set_effects(args.brightness, args.contrast)
+    window.set_fast_mode(args.fast)
+    window.set_downscale_mode(args.downscale)
+    window.set_gpu_mode(args.gpu)
+    window.set_effects_backend(args.effects)
+    window.set_effects_workers(args.workers)
+    window.set_blob_params({"enabled": args.blob, "max_fps": 0})
+    window.set_capture_backend("synthetic", width=width, height=height, fps=0)
+
+    for _ in range(args.warmup):
+        window.update_frame()
+        app.processEvents()
+
+    allocations = window.pipeline_stats()["buffer_allocs"]
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        window.update_frame()
+        app.processEvents()
+    elapsed = time.perf_counter() - start
+    stats = window.pipeline_stats()
+    latency = stats["latency"]
+    allocations = stats["buffer_allocs"] - allocations
+    auto_backend = stats["auto_backend"]
+    window.close()
+
+    ms = elapsed * 1000.0 / max(1, args.frames)
+    fps = args.frames / elapsed if elapsed > 0 else 0.0
+    print(
+        f"{width}x{height} effects={args.effects} downscale={args.downscale} gpu={args.gpu} blob={args.blob}: {ms:.2f} ms/frame, {fps:.1f} fps, "
+        f"{allocations} buffer allocations after warmup"
+    )
+    if args.effects == "auto":
+        print(f"  auto backend: {auto_backend}")
+    for stage, (p50, p95, p99) in latency.items():
+        print(f"  {stage:<12} p50 {p50:7.2f}  p95 {p95:7.2f}  p99 {p99:7.2f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Visuef headless benchmark")
+    parser.add_argument("--res", nargs="+", default=["1080p", "1440p", "4k"], choices=sorted(RESOLUTIONS))
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--scale", type=int, default=100)
+    parser.add_argument("--brightness", type=float, default=1.2)
+    parser.add_argument("--contrast", type=float, default=1.1)
+    parser.add_argument("--effects", default="numpy", choices=["auto", "numpy", "opencv", "numba"])
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--downscale", default="nearest", choices=["nearest", "box"])
+    parser.add_argument("--fast", action="store_true")
+    parser.add_argument("--gpu", action="store_true")
+    parser.add_argument("--blob", action="store_true")
+    parser.add_argument("--view-w", type=int, default=1280)
+    parser.add_argument("--view-h", type=int, default=720)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication([])
+    for name in args.res:
+        width, height = RESOLUTIONS[name]
+        run_case(app, args, width, height)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
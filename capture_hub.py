@@ -0,0 +1,322 @@
+import itertools
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from capture_sources import (
+    CapturedFrame,
+    DxcamCaptureSource,
+    Rect,
+    create_capture_source,
+)
+from logger_utils import get_logger
+from window_geometry import WindowGeometry, WindowGeometryTracker
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+SHARED_BACKENDS = ("mss", "dxcam")
+CAPTURE_HUB_AVAILABLE = np is not None
+
+
+class _MonitorGeometry:
+    """Geometry stand-in that pins a capture source to one monitor."""
+
+    def __init__(self, index: int, rect: Rect):
+        self._geometry = WindowGeometry(rect, rect, index, rect)
+
+    def geometry(self) -> WindowGeometry:
+        return self._geometry
+
+    def is_window(self) -> bool:
+        return True
+
+    def is_foreground(self) -> bool:
+        return False
+
+
+class MonitorFeed:
+    """One capture loop for one (backend, monitor), shared by its subscribers.
+
+    The loop grabs the bounding box of the rects the subscribers asked for
+    (so a lone subscriber costs the same as grabbing its own window) at the
+    highest fps any of them wants. Subscribers get views into that frame.
+    """
+
+    def __init__(self, backend: str, monitor_index: int, monitor_rect: Rect):
+        self.backend = backend
+        self.monitor_index = monitor_index
+        self.monitor_rect = tuple(monitor_rect)
+        self._lock = threading.Lock()
+        self._tokens = itertools.count(1)
+        self._subscribers: Dict[int, Tuple[Optional[Rect], int]] = {}
+        self._latest = None
+        self._async = False
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._last_error = 0.0
+        self._log = get_logger()
+
+    def add_subscriber(self, fps: int) -> int:
+        with self._lock:
+            token = next(self._tokens)
+            self._subscribers[token] = (None, fps)
+            return token
+
+    def remove_subscriber(self, token: int) -> int:
+        with self._lock:
+            self._subscribers.pop(token, None)
+            return len(self._subscribers)
+
+    def update(self, token: int, rect: Optional[Rect], fps: int) -> None:
+        with self._lock:
+            if token in self._subscribers:
+                self._subscribers[token] = (rect, fps)
+
+    def set_async(self, enabled: bool) -> None:
+        self._async = bool(enabled)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"visuef-hub-{self.backend}-{self.monitor_index}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop_event.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive() and threading.current_thread() is not thread:
+            thread.join(timeout)
+        with self._lock:
+            self._latest = None
+
+    def latest(self, rect: Rect) -> Optional[CapturedFrame]:
+        """View of the newest frame cut to ``rect``, None if it does not cover it."""
+        with self._lock:
+            latest = self._latest
+        if latest is None:
+            return None
+        arr, frame_rect, seq, timestamp = latest
+        left, top, right, bottom = rect
+        if left < frame_rect[0] or top < frame_rect[1] or right > frame_rect[2] or bottom > frame_rect[3]:
+            return None
+        x0, y0 = left - frame_rect[0], top - frame_rect[1]
+        view = arr[y0 : y0 + bottom - top, x0 : x0 + right - left]
+        return CapturedFrame(view, view.shape[1], view.shape[0], seq, timestamp)
+
+    def _request(self) -> Tuple[Optional[Rect], int]:
+        with self._lock:
+            entries = list(self._subscribers.values())
+        rects = [rect for rect, _ in entries if rect is not None]
+        fps = max((fps for _, fps in entries), default=1)
+        if not rects:
+            return None, fps
+        return (
+            min(rect[0] for rect in rects),
+            min(rect[1] for rect in rects),
+            max(rect[2] for rect in rects),
+            max(rect[3] for rect in rects),
+        ), fps
+
+    def _run(self) -> None:
+        # Subscribers keep views of the latest frame, so it must not be pooled.
+        options = {"pooled": False} if self.backend == "mss" else {}
+        source = create_capture_source(
+            self.backend, 0, geometry=_MonitorGeometry(self.monitor_index, self.monitor_rect), **options
+        )
+        if source is None:
+            self._log.warning("capture hub: %s unavailable for monitor %s", self.backend, self.monitor_index)
+            return
+        fps_started = None
+        async_applied = None
+        deadline = time.perf_counter()
+        try:
+            while not self._stop_event.is_set():
+                rect, fps = self._request()
+                if isinstance(source, DxcamCaptureSource) and async_applied != self._async:
+                    async_applied = self._async
+                    source.set_async(async_applied)
+                if fps != fps_started:
+                    fps_started = fps
+                    source.start(fps)
+                if rect is not None:
+                    self._grab(source, rect)
+
+                period = 1.0 / max(1, fps)
+                deadline += period
+                now = time.perf_counter()
+                if deadline < now:
+                    deadline = now + period - ((now - deadline) % period)
+                self._stop_event.wait(deadline - now)
+        finally:
+            source.stop()
+
+    def _grab(self, source, rect: Rect) -> None:
+        try:
+            frame = source.grab(rect)
+        except Exception as exc:
+            now = time.perf_counter()
+            if now - self._last_error >= 2.0:
+                self._log.warning("capture hub: %s grab failed: %s", self.backend, exc)
+                self._last_error = now
+            return
+        if frame is None:
+            return
+        arr = _frame_array(frame)
+        if arr is None:
+            return
+        if frame.release is not None:
+            arr = arr.copy()
+            frame.release()
+        # Sources may clamp the rect (dxcam); the frame covers its top-left corner.
+        frame_rect = (rect[0], rect[1], rect[0] + arr.shape[1], rect[1] + arr.shape[0])
+        with self._lock:
+            self._latest = (arr, frame_rect, frame.seq, frame.timestamp)
+
+
+def _frame_array(frame: CapturedFrame):
+    data = frame.data
+    if isinstance(data, np.ndarray):
+        return data if data.ndim == 3 else None
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        arr = np.frombuffer(data, dtype=np.uint8)
+        if arr.size == frame.width * frame.height * 4:
+            return arr.reshape(frame.height, frame.width, 4)
+    return None
+
+
+class CaptureHub:
+    """Process-wide registry of monitor feeds, reference counted by subscriber."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._feeds: Dict[Tuple[str, int], MonitorFeed] = {}
+
+    def subscribe(self, backend: str, monitor_index: int, monitor_rect: Rect, fps: int) -> Tuple[MonitorFeed, int]:
+        key = (backend, monitor_index)
+        with self._lock:
+            feed = self._feeds.get(key)
+            if feed is None:
+                feed = MonitorFeed(backend, monitor_index, monitor_rect)
+                self._feeds[key] = feed
+            token = feed.add_subscriber(fps)
+            feed.start()
+        return feed, token
+
+    def unsubscribe(self, feed: MonitorFeed, token: int) -> None:
+        with self._lock:
+            if feed.remove_subscriber(token) > 0:
+                return
+            key = (feed.backend, feed.monitor_index)
+            if self._feeds.get(key) is feed:
+                del self._feeds[key]
+        feed.stop()
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def get_capture_hub() -> CaptureHub:
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            _hub = CaptureHub()
+        return _hub
+
+
+class SharedCaptureSource:
+    """CaptureSource that reads its window out of the shared monitor feed.
+
+    A feed covers one monitor, so a rect that spans monitors is grabbed
+    directly by a private source of the same backend instead.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        hwnd: int,
+        geometry: Optional[WindowGeometryTracker] = None,
+        hub: Optional[CaptureHub] = None,
+        **options,
+    ):
+        self.name = backend
+        self._hwnd = hwnd
+        self._geometry = geometry if geometry is not None else WindowGeometryTracker(hwnd)
+        self._hub = hub if hub is not None else get_capture_hub()
+        self._options = options
+        self._feed = None
+        self._token = None
+        self._direct = None
+        self._fps = 30
+        self._async = False
+        self._running = False
+
+    def set_async(self, enabled: bool) -> None:
+        self._async = bool(enabled)
+        if self._feed is not None:
+            self._feed.set_async(self._async)
+        if isinstance(self._direct, DxcamCaptureSource):
+            self._direct.set_async(self._async)
+
+    def start(self, fps: int) -> bool:
+        self._fps = max(1, int(fps))
+        self._running = True
+        return True
+
+    def stop(self) -> None:
+        self._unsubscribe()
+        self._stop_direct()
+        self._running = False
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def fixed_rect(self) -> Optional[Rect]:
+        return None
+
+    def grab(self, rect: Rect) -> Optional[CapturedFrame]:
+        geo = self._geometry.geometry()
+        if geo is None or geo.monitor_rect is None:
+            return None
+        if self._feed is None or self._feed.monitor_index != geo.monitor_index:
+            self._unsubscribe()
+            self._feed, self._token = self._hub.subscribe(
+                self.name, geo.monitor_index, geo.monitor_rect, self._fps
+            )
+            self._feed.set_async(self._async)
+        mon_left, mon_top, mon_right, mon_bottom = self._feed.monitor_rect
+        if rect[0] < mon_left or rect[1] < mon_top or rect[2] > mon_right or rect[3] > mon_bottom:
+            self._feed.update(self._token, None, self._fps)
+            return self._grab_direct(rect)
+        self._stop_direct()
+        self._feed.update(self._token, rect, self._fps)
+        return self._feed.latest(rect)
+
+    def _grab_direct(self, rect: Rect) -> Optional[CapturedFrame]:
+        if self._direct is None:
+            self._direct = create_capture_source(self.name, self._hwnd, geometry=self._geometry, **self._options)
+            if self._direct is None:
+                return None
+            if isinstance(self._direct, DxcamCaptureSource):
+                self._direct.set_async(self._async)
+        if not self._direct.is_running() and not self._direct.start(self._fps):
+            return None
+        return self._direct.grab(rect)
+
+    def _stop_direct(self) -> None:
+        if self._direct is not None:
+            self._direct.stop()
+        self._direct = None
+
+    def _unsubscribe(self) -> None:
+        if self._feed is not None:
+            self._hub.unsubscribe(self._feed, self._token)
+        self._feed = None
+        self._token = None
@@ -0,0 +1,919 @@
+import itertools
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Protocol, Tuple
+
+from gdi_capture import GDI_AVAILABLE, GdiGrabber
+from logger_utils import get_logger
+from wgc_capture import WGCCapture, WGC_AVAILABLE
+from window_geometry import WindowGeometryTracker
+
+try:
+    import mss
+except ImportError:  # pragma: no cover - optional dependency
+    mss = None
+
+try:
+    import dxcam
+except ImportError:  # pragma: no cover - optional dependency
+    dxcam = None
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+MSS_AVAILABLE = mss is not None
+DXCAM_AVAILABLE = dxcam is not None
+NUMPY_AVAILABLE = np is not None
+
+Rect = Tuple[int, int, int, int]
+
+
+_frame_seq = itertools.count(1)
+
+
+def next_frame_seq() -> int:
+    """Process-wide frame id; two frames share a seq only if they are the same capture."""
+    return next(_frame_seq)
+
+
+class CapturedFrame(NamedTuple):
+    data: Any
+    width: int
+    height: int
+    seq: int
+    timestamp: float
+    # Set when ``data`` is a pooled buffer that must be handed back once consumed.
+    release: Optional[Callable[[], None]] = None
+
+
+class CaptureSource(Protocol):
+    """A frame provider. ``rect`` is (left, top, right, bottom) in screen coordinates."""
+
+    name: str
+
+    def start(self, fps: int) -> bool:
+        ...
+
+    def stop(self) -> None:
+        ...
+
+    def is_running(self) -> bool:
+        ...
+
+    def fixed_rect(self) -> Optional[Rect]:
+        """Rect to capture when the source does not follow a real window, else None."""
+        ...
+
+    def grab(self, rect: Rect) -> Optional[CapturedFrame]:
+        ...
+
+
+_CAPTURE_SOURCES: Dict[str, Tuple[Callable[..., CaptureSource], bool]] = {}
+
+
+def register_capture_source(name: str, factory: Callable[..., CaptureSource], available: bool = True) -> None:
+    """Register ``factory(hwnd, geometry=None, **options)`` under ``name``."""
+    _CAPTURE_SOURCES[name.lower()] = (factory, bool(available))
+
+
+def capture_source_available(name: str) -> bool:
+    entry = _CAPTURE_SOURCES.get(name.lower())
+    return entry is not None and entry[1]
+
+
+def available_capture_sources() -> List[str]:
+    return [name for name, (_, available) in _CAPTURE_SOURCES.items() if available]
+
+
+def create_capture_source(name: str, hwnd: int, **options) -> Optional[CaptureSource]:
+    entry = _CAPTURE_SOURCES.get(name.lower())
+    if entry is None or not entry[1]:
+        return None
+    factory, _ = entry
+    try:
+        return factory(hwnd, **options)
+    except Exception:
+        get_logger().exception("capture source %s creation failed", name)
+        return None
+
+
+class RegionNegotiator:
+    """Turns screen rects into regions a dxcam output accepts.
+
+    Regions are clamped to the output size (dxcam raises on anything that
+    sticks out, e.g. the negative borders of a maximized window). When a rect
+    clamps to nothing the last valid region is kept, so the camera is not
+    restarted for a transient off-screen rect.
+    """
+
+    def __init__(self):
+        self._output_rect = None
+        self._size = None
+        self._key = None
+        self._region = None
+        self._last_valid = None
+
+    def set_output(self, output_rect: Optional[Rect], size: Optional[Tuple[int, int]]) -> None:
+        output_rect = tuple(output_rect) if output_rect is not None else None
+        if output_rect != self._output_rect or size != self._size:
+            self._output_rect = output_rect
+            self._size = size
+            self._key = None
+            self._last_valid = None
+
+    def negotiate(self, rect: Optional[Rect]) -> Optional[Rect]:
+        if rect is None:
+            return self._last_valid
+        key = tuple(rect)
+        if key == self._key:
+            return self._region
+        region = self._clamp(key)
+        if region is None:
+            region = self._last_valid
+        else:
+            self._last_valid = region
+        self._key = key
+        self._region = region
+        return region
+
+    def _clamp(self, rect: Rect) -> Optional[Rect]:
+        left, top, right, bottom = rect
+        if self._output_rect is not None:
+            mon_left, mon_top = self._output_rect[0], self._output_rect[1]
+            left, top, right, bottom = left - mon_left, top - mon_top, right - mon_left, bottom - mon_top
+        if self._size is not None:
+            width, height = self._size
+            left, top = max(0, left), max(0, top)
+            right, bottom = min(width, right), min(height, bottom)
+        if right <= left or bottom <= top:
+            return None
+        return (left, top, right, bottom)
+
+
+class FramePool:
+    """Reusable uint8 frame buffers of one shape, handed out with a release callback.
+
+    Buffers are reallocated when the shape changes; leases taken before that
+    stay valid (the old arrays live as long as someone references them).
+    """
+
+    def __init__(self, size: int = 3):
+        self._size = max(1, int(size))
+        self._lock = threading.Lock()
+        self._shape = None
+        self._buffers = []
+        self._leased = []
+        self._generation = 0
+        self.allocations = 0
+
+    def acquire(self, shape: Tuple[int, ...]):
+        """Return (array, release) for a free buffer, or None if all are leased."""
+        with self._lock:
+            if shape != self._shape:
+                self._shape = shape
+                self._buffers = []
+                self._leased = []
+                self._generation += 1
+            for idx, leased in enumerate(self._leased):
+                if not leased:
+                    break
+            else:
+                if len(self._buffers) >= self._size:
+                    return None
+                self._buffers.append(np.empty(shape, dtype=np.uint8))
+                self._leased.append(False)
+                self.allocations += 1
+                idx = len(self._buffers) - 1
+            self._leased[idx] = True
+            return self._buffers[idx], self._releaser(idx, self._generation)
+
+    def _releaser(self, idx: int, generation: int) -> Callable[[], None]:
+        done = []
+
+        def release() -> None:
+            if done:
+                return
+            done.append(True)
+            with self._lock:
+                if generation == self._generation:
+                    self._leased[idx] = False
+
+        return release
+
+
+_gdi_keys = itertools.count(1)
+_gdi_local = threading.local()
+
+
+def _thread_gdi_grabbers() -> Dict[int, Tuple[Any, int, Any]]:
+    # GDI handles belong to the thread that created them: every thread keeps
+    # its own grabbers, as {source key: (source weakref, generation, grabber)}.
+    grabbers = getattr(_gdi_local, "grabbers", None)
+    if grabbers is None:
+        grabbers = _gdi_local.grabbers = {}
+    return grabbers
+
+
+def release_thread_capture_resources() -> None:
+    """Close the GDI grabbers the calling thread created; call it before a capture thread exits."""
+    grabbers = _thread_gdi_grabbers()
+    for _, _, grabber in grabbers.values():
+        grabber.close()
+    grabbers.clear()
+
+
+class MssCaptureSource:
+    """mss backend handing out BGRA ndarrays.
+
+    On Windows the grab goes straight into a pooled buffer (GdiGrabber), so
+    there is no per-frame allocation; elsewhere the mss buffer is wrapped
+    without copying. ``pooled=False`` gives every frame its own array, for
+    consumers that keep frames past their release.
+    """
+
+    name = "mss"
+
+    def __init__(self, hwnd: int, geometry: Optional[WindowGeometryTracker] = None, pooled: bool = True):
+        self._hwnd = hwnd
+        self._sct = None
+        self._gdi_key = next(_gdi_keys)
+        self._gdi_generation = 0
+        self._gdi_failed = False
+        self._pool = FramePool() if pooled and NUMPY_AVAILABLE else None
+
+    def start(self, fps: int) -> bool:
+        if self._sct is None:
+            # Kept even when grabbing through GDI: it makes the process DPI
+            # aware and is the fallback path.
+            self._sct = mss.mss()
+        return True
+
+    def stop(self) -> None:
+        if self._sct is not None:
+            try:
+                self._sct.close()
+            except Exception:
+                pass
+        self._sct = None
+        # Grabbers made by other threads are closed by those threads, on
+        # their next grab or when they exit.
+        self._gdi_generation += 1
+        entry = _thread_gdi_grabbers().pop(self._gdi_key, None)
+        if entry is not None:
+            entry[2].close()
+
+    def is_running(self) -> bool:
+        return self._sct is not None
+
+    def pool_allocations(self) -> int:
+        """Frame buffers the pool has allocated, 0 when not pooled."""
+        return self._pool.allocations if self._pool is not None else 0
+
+    def fixed_rect(self) -> Optional[Rect]:
+        return None
+
+    def grab(self, rect: Rect) -> Optional[CapturedFrame]:
+        if self._sct is None:
+            return None
+        left, top, right, bottom = rect
+        width, height = right - left, bottom - top
+        if GDI_AVAILABLE and not self._gdi_failed:
+            frame = self._grab_gdi(left, top, width, height)
+            if frame is not None:
+                return frame
+        raw = self._sct.grab({"left": left, "top": top, "width": width, "height": height})
+        if np is None:
+            return CapturedFrame(raw.raw, raw.width, raw.height, next_frame_seq(), time.perf_counter())
+        arr = np.frombuffer(raw.raw, dtype=np.uint8).reshape(raw.height, raw.width, 4)
+        return CapturedFrame(arr, raw.width, raw.height, next_frame_seq(), time.perf_counter())
+
+    def _thread_gdi(self) -> Optional[GdiGrabber]:
+        grabbers = _thread_gdi_grabbers()
+        for key, (ref, generation, grabber) in list(grabbers.items()):
+            source = ref()
+            if source is None or source._gdi_generation != generation:
+                # Source stopped or dropped since this thread made the grabber.
+                del grabbers[key]
+                grabber.close()
+        entry = grabbers.get(self._gdi_key)
+        if entry is not None:
+            return entry[2]
+        try:
+            grabber = GdiGrabber()
+        except Exception:
+            get_logger().exception("GDI grabber unavailable, using mss")
+            self._gdi_failed = True
+            return None
+        grabbers[self._gdi_key] = (weakref.ref(self), self._gdi_generation, grabber)
+        return grabber
+
+    def _grab_gdi(self, left: int, top: int, width: int, height: int) -> Optional[CapturedFrame]:
+        gdi = self._thread_gdi()
+        if gdi is None:
+            return None
+        lease = self._pool.acquire((height, width, 4)) if self._pool is not None else None
+        if lease is None:
+            # Every pooled buffer is still held downstream.
+            arr, release = np.empty((height, width, 4), dtype=np.uint8), None
+        else:
+            arr, release = lease
+        if not gdi.grab_into(left, top, arr):
+            if release is not None:
+                release()
+            return None
+        return CapturedFrame(arr, width, height, next_frame_seq(), time.perf_counter(), release)
+
+
+class DxcamCaptureSource:
+    name = "dxcam"
+
+    def __init__(self, hwnd: int, geometry: Optional[WindowGeometryTracker] = None):
+        self._hwnd = hwnd
+        self._geometry = geometry if geometry is not None else WindowGeometryTracker(hwnd)
+        self._camera = None
+        self._async = False
+        self._fps = 30
+        self._running = False
+        self._started = False
+        self._region = None
+        self._output_idx = None
+        self._output_rect = None
+        self._negotiator = RegionNegotiator()
+        self._last_frame = None
+        self._last_seq = 0
+        self._last_ts = 0.0
+
+    def set_async(self, enabled: bool) -> None:
+        self._async = bool(enabled)
+        # Start lazily on next grab with current region.
+        self._stop_camera()
+
+    def start(self, fps: int) -> bool:
+        self._fps = max(1, int(fps))
+        self._stop_camera()
+        self._running = True
+        return True
+
+    def stop(self) -> None:
+        self._stop_camera()
+        self._camera = None
+        self._output_idx = None
+        self._output_rect = None
+        self._running = False
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def fixed_rect(self) -> Optional[Rect]:
+        return None
+
+    def grab(self, rect: Rect) -> Optional[CapturedFrame]:
+        # Failures raise so the caller's circuit breaker can back off.
+        self._ensure_instance()
+        region = self._negotiator.negotiate(rect)
+        if self._camera is None or region is None:
+            return None
+        if not self._async:
+            # grab() returns None when nothing changed, so any frame is new.
+            frame = self._camera.grab(region=region)
+            if frame is None:
+                return None
+            return CapturedFrame(frame, frame.shape[1], frame.shape[0], next_frame_seq(), time.perf_counter())
+        self._ensure_started(region)
+        frame = self._camera.get_latest_frame()
+        if frame is None:
+            return None
+        # get_latest_frame hands back the same array object until a new frame
+        # lands; holding it keeps its address from being reused meanwhile.
+        if frame is not self._last_frame:
+            self._last_frame = frame
+            self._last_seq = next_frame_seq()
+            self._last_ts = time.perf_counter()
+        return CapturedFrame(frame, frame.shape[1], frame.shape[0], self._last_seq, self._last_ts)
+
+    def _ensure_instance(self) -> None:
+        geo = self._geometry.geometry()
+        output_idx = geo.monitor_index if geo is not None else None
+        output_rect = geo.monitor_rect if geo is not None else None
+        if output_rect is None:
+            output_idx = None
+        if self._camera is None or output_idx != self._output_idx:
+            self._stop_camera()
+            try:
+                if output_idx is None:
+                    self._camera = dxcam.create(output_color="BGRA")
+                else:
+                    self._camera = dxcam.create(output_color="BGRA", output_idx=output_idx)
+            except Exception:
+                self._camera = None
+                self._output_idx = None
+                self._output_rect = None
+                raise
+        self._output_idx = output_idx
+        self._output_rect = output_rect
+        self._negotiator.set_output(output_rect, self._output_size())
+
+    def _output_size(self) -> Optional[Tuple[int, int]]:
+        # dxcam validates against the output's physical size, which differs
+        # from the monitor rect when the process is not DPI aware.
+        width = getattr(self._camera, "width", None)
+        height = getattr(self._camera, "height", None)
+        if width and height:
+            return int(width), int(height)
+        if self._output_rect is not None:
+            left, top, right, bottom = self._output_rect
+            return right - left, bottom - top
+        return None
+
+    def _stop_camera(self) -> None:
+        if self._camera and self._started:
+            try:
+                self._camera.stop()
+            except Exception:
+                pass
+        self._started = False
+        self._region = None
+        self._last_frame = None
+
+    def _ensure_started(self, region) -> None:
+        if self._started and self._region == region:
+            return
+        self._stop_camera()
+        try:
+            self._camera.start(target_fps=self._fps, region=region)
+        except TypeError:
+            try:
+                self._camera.start(target_fps=self._fps)
+            except TypeError:
+                self._camera.start()
+        self._started = True
+        self._region = region
+
+
+class WgcCaptureSource:
+    name = "wgc"
+
+    def __init__(self, hwnd: int, geometry: Optional[WindowGeometryTracker] = None):
+        self._wgc = WGCCapture(hwnd)
+        self._running = False
+        self._last_frame_id = None
+        self._last_seq = 0
+
+    def start(self, fps: int) -> bool:
+        self._running = self._wgc.start(fps)
+        return self._running
+
+    def stop(self) -> None:
+        self._wgc.stop()
+        self._running = False
+
+    def pool_drops(self) -> int:
+        """Frames WGC delivered while every pool slot was leased, since start."""
+        return self._wgc.pool_drops()
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def fixed_rect(self) -> Optional[Rect]:
+        return None
+
+    def grab(self, rect: Rect) -> Optional[CapturedFrame]:
+        self._wgc.set_capture_rect(rect)
+        lease = self._wgc.get_latest()
+        if lease is None:
+            return None
+        data, width, height = self._coerce_frame(lease.data, lease.rect, rect)
+        if data is None:
+            lease.release()
+            return None
+        if lease.frame_id != self._last_frame_id:
+            self._last_frame_id = lease.frame_id
+            self._last_seq = next_frame_seq()
+        return CapturedFrame(data, width, height, self._last_seq, lease.timestamp, lease.release)
+
+    def _coerce_frame(self, frame, frame_rect, rect: Rect):
+        if frame is None:
+            return None, 0, 0
+        data = frame
+        for attr in ("image", "frame", "data", "buffer"):
+            if hasattr(data, attr):
+                data = getattr(data, attr)
+                break
+
+        if isinstance(data, tuple) and len(data) >= 3:
+            buf, w, h = data[0], int(data[1]), int(data[2])
+            return buf, w, h
+
+        if np is not None and isinstance(data, np.ndarray):
+            data = self._crop(data, frame_rect, rect)
+            return data, data.shape[1], data.shape[0]
+
+        w = getattr(data, "width", None)
+        h = getattr(data, "height", None)
+        if w and h and isinstance(data, (bytes, bytearray, memoryview)):
+            return data, int(w), int(h)
+
+        return None, 0, 0
+
+    def _crop(self, frame, frame_rect, rect: Rect):
+        # The capture already crops at source; this only trims frames that
+        # were taken before the last rect change (or the whole monitor).
+        if not frame_rect or tuple(frame_rect) == tuple(rect):
+            return frame
+        left, top, right, bottom = rect
+        frame_left, frame_top = frame_rect[0], frame_rect[1]
+        rel_left = max(0, left - frame_left)
+        rel_top = max(0, top - frame_top)
+        rel_right = min(frame.shape[1], right - frame_left)
+        rel_bottom = min(frame.shape[0], bottom - frame_top)
+        if rel_right <= rel_left or rel_bottom <= rel_top:
+            return frame
+        return frame[rel_top:rel_bottom, rel_left:rel_right]
+
+
+class SyntheticCaptureSource:
+    """Moving rectangles over static noise, for benchmarking without a desktop.
+
+    ``fps`` is the rate at which new frames appear; 0 renders a new frame on
+    every grab.
+    """
+
+    name = "synthetic"
+
+    def __init__(
+        self,
+        hwnd: int = 0,
+        width: int = 1920,
+        height: int = 1080,
+        fps: int = 0,
+        rects: int = 12,
+        seed: int = 1234,
+        geometry: Optional[WindowGeometryTracker] = None,
+    ):
+        self._width = max(1, int(width))
+        self._height = max(1, int(height))
+        self._fps = max(0, int(fps))
+        self._rect_count = max(0, int(rects))
+        self._seed = seed
+        self._base = None
+        self._rects = []
+        self._running = False
+        self._t0 = 0.0
+        self._frame_index = -1
+        self._last = None
+        self._last_seq = 0
+        self._last_ts = 0.0
+
+    def start(self, fps: int) -> bool:
+        if np is None:
+            return False
+        rng = np.random.default_rng(self._seed)
+        base = rng.integers(0, 256, size=(self._height, self._width, 4), dtype=np.uint8)
+        base[:, :, 3] = 255
+        self._base = base
+        self._rects = []
+        for _ in range(self._rect_count):
+            rw = int(rng.integers(max(1, self._width // 20), max(2, self._width // 6)))
+            rh = int(rng.integers(max(1, self._height // 20), max(2, self._height // 6)))
+            x0 = int(rng.integers(0, max(1, self._width - rw)))
+            y0 = int(rng.integers(0, max(1, self._height - rh)))
+            vx = int(rng.integers(2, 12)) * (1 if rng.random() < 0.5 else -1)
+            vy = int(rng.integers(2, 12)) * (1 if rng.random() < 0.5 else -1)
+            color = rng.integers(0, 256, size=3, dtype=np.uint8)
+            self._rects.append((rw, rh, x0, y0, vx, vy, color))
+        self._t0 = time.perf_counter()
+        self._frame_index = -1
+        self._last = None
+        self._running = True
+        return True
+
+    def stop(self) -> None:
+        self._running = False
+        self._base = None
+        self._last = None
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def fixed_rect(self) -> Optional[Rect]:
+        return (0, 0, self._width, self._height)
+
+    def grab(self, rect: Rect) -> Optional[CapturedFrame]:
+        if not self._running:
+            return None
+        now = time.perf_counter()
+        if self._fps > 0:
+            index = int((now - self._t0) * self._fps)
+        else:
+            index = self._frame_index + 1
+        if index != self._frame_index or self._last is None:
+            self._last = self._render(index)
+            self._frame_index = index
+            self._last_seq = next_frame_seq()
+            self._last_ts = now
+        return CapturedFrame(self._last, self._width, self._height, self._last_seq, self._last_ts)
+
+    def _render(self, index: int):
+        frame = self._base.copy()
+        for rw, rh, x0, y0, vx, vy, color in self._rects:
+            x = _bounce(x0 + vx * index, self._width - rw)
+            y = _bounce(y0 + vy * index, self._height - rh)
+            frame[y : y + rh, x : x + rw, :3] = color
+        return frame
+
+
+class ProbeResult(NamedTuple):
+    name: str
+    grabs: int
+    frames: int
+    failures: int
+    latency_ms: float  # median grab call time
+    age_ms: float  # median age of the returned frame, capped at one frame period
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.grabs if self.grabs else 1.0
+
+    @property
+    def usable(self) -> bool:
+        return self.frames > 0 and self.failure_rate <= AutoCaptureSource.MAX_FAILURE_RATE
+
+    @property
+    def cost_ms(self) -> float:
+        return self.latency_ms + self.age_ms
+
+
+class CaptureProbe:
+    """Running measurement of one backend, fed one grab at a time."""
+
+    def __init__(self, name: str, fps: int):
+        self.name = name
+        self._period = 1.0 / max(1, fps)
+        self._latencies: List[float] = []
+        self._ages: List[float] = []
+        self._failures = 0
+        self._seqs = set()
+        self._started = None
+
+    def sample(self, source: CaptureSource, rect: Rect) -> Optional[CapturedFrame]:
+        """One timed grab from ``source``; the frame is returned, not released."""
+        start = time.perf_counter()
+        try:
+            frame = source.grab(rect)
+        except Exception:
+            self.add(start, time.perf_counter(), None, failed=True)
+            return None
+        self.add(start, time.perf_counter(), frame)
+        return frame
+
+    def add(self, start: float, done: float, frame: Optional[CapturedFrame], failed: bool = False) -> None:
+        if self._started is None:
+            self._started = start
+        self._latencies.append(done - start)
+        if failed:
+            self._failures += 1
+        if frame is not None:
+            self._seqs.add(frame.seq)
+            self._ages.append(min(self._period, max(0.0, done - frame.timestamp)))
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started if self._started is not None else 0.0
+
+    def result(self) -> ProbeResult:
+        return ProbeResult(
+            self.name,
+            len(self._latencies),
+            len(self._seqs),
+            self._failures,
+            _median(self._latencies) * 1000.0,
+            _median(self._ages) * 1000.0 if self._ages else self._period * 1000.0,
+        )
+
+
+def _median(values: List[float]) -> float:
+    values = sorted(values)
+    return values[len(values) // 2] if values else 0.0
+
+
+class AutoCaptureSource:
+    """Probes the other backends on the real window and grabs from the best one.
+
+    The choice is made again when the window changes monitor, gains or loses
+    focus, when the active backend keeps failing or when its grab latency
+    degrades well past what the probe measured. A probe is spread over the
+    following grabs, one timed grab of the candidate per call, while the
+    current backend keeps serving frames, so no call blocks for the whole
+    probe.
+    """
+
+    name = "auto"
+    MAX_FAILURE_RATE = 0.2
+    EXCLUDED = ("auto", "synthetic")
+
+    def __init__(
+        self,
+        hwnd: int,
+        geometry: Optional[WindowGeometryTracker] = None,
+        probe_time: float = 0.3,
+        min_reprobe_interval: float = 2.0,
+        degrade_factor: float = 2.0,
+    ):
+        self._hwnd = hwnd
+        self._geometry = geometry if geometry is not None else WindowGeometryTracker(hwnd)
+        self._probe_time = probe_time
+        self._min_reprobe_interval = min_reprobe_interval
+        self._degrade_factor = degrade_factor
+        self._fps = 30
+        self._async = False
+        self._sources: Dict[str, CaptureSource] = {}
+        self._active = None
+        self._active_result = None
+        self._latency_ema = 0.0
+        self._failures = 0
+        self._probe_key = None
+        self._probe_time_last = 0.0
+        self._probe_queue: Optional[List[str]] = None
+        self._probing: Optional[CaptureProbe] = None
+        self._probe_reason = ""
+        self._probe_results: List[ProbeResult] = []
+        self._results: List[ProbeResult] = []
+        self._results_version = 0
+        self._results_lock = threading.Lock()
+        self._running = False
+        self._log = get_logger()
+
+    def set_async(self, enabled: bool) -> None:
+        self._async = bool(enabled)
+        source = self._sources.get("dxcam")
+        if isinstance(source, DxcamCaptureSource):
+            source.set_async(self._async)
+
+    def start(self, fps: int) -> bool:
+        self._fps = max(1, int(fps))
+        if self._active is not None:
+            self._sources[self._active].start(self._fps)
+        self._running = True
+        return True
+
+    def stop(self) -> None:
+        for source in self._sources.values():
+            source.stop()
+        self._sources.clear()
+        self._active = None
+        self._probe_key = None
+        self._probe_queue = None
+        self._probing = None
+        self._running = False
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def fixed_rect(self) -> Optional[Rect]:
+        return None
+
+    def active_backend(self) -> Optional[str]:
+        return self._active
+
+    def active_source(self) -> Optional[CaptureSource]:
+        return self._sources.get(self._active) if self._active is not None else None
+
+    def probe_results(self) -> Tuple[int, List[ProbeResult]]:
+        """(version, results); the version changes every time a probe runs."""
+        with self._results_lock:
+            return self._results_version, list(self._results)
+
+    def grab(self, rect: Rect) -> Optional[CapturedFrame]:
+        if self._probe_queue is None:
+            reason = self._reprobe_reason()
+            if reason is not None:
+                self._begin_probe(reason)
+        probe = self._current_probe() if self._probe_queue is not None else None
+        frame = None
+        if probe is not None and probe.name != self._active:
+            frame = probe.sample(self._sources[probe.name], rect)
+            if self._active is not None and frame is not None and frame.release is not None:
+                frame.release()
+        if self._active is None:
+            # Nothing to serve from yet: the candidate being probed does.
+            return frame
+        if probe is not None and probe.name != self._active:
+            probe = None
+        source = self._sources[self._active]
+        start = time.perf_counter()
+        try:
+            frame = source.grab(rect)
+        except Exception as exc:
+            if probe is not None:
+                probe.add(start, time.perf_counter(), None, failed=True)
+            self._failures += 1
+            if self._failures >= 3:
+                self._log.warning("auto capture: %s failing (%s), re-probing", self._active, exc)
+                self._probe_key = None
+            return None
+        done = time.perf_counter()
+        if probe is not None:
+            probe.add(start, done, frame)
+        self._failures = 0
+        latency = (done - start) * 1000.0
+        self._latency_ema += (latency - self._latency_ema) * 0.1
+        return frame
+
+    def _reprobe_reason(self) -> Optional[str]:
+        if self._probe_key is None and not self._results:
+            return "initial"
+        if time.perf_counter() - self._probe_time_last < self._min_reprobe_interval:
+            return None
+        if self._probe_key is None or self._active is None:
+            return "failure"
+        key = self._window_key()
+        if key[0] != self._probe_key[0]:
+            return "monitor"
+        if key[1] != self._probe_key[1]:
+            return "focus"
+        expected = self._active_result.latency_ms if self._active_result is not None else 0.0
+        if self._latency_ema > max(expected * self._degrade_factor, expected + 4.0):
+            return "latency"
+        return None
+
+    def _window_key(self):
+        geo = self._geometry.geometry()
+        return (geo.monitor_index if geo is not None else None, self._geometry.is_foreground())
+
+    def _begin_probe(self, reason: str) -> None:
+        self._probe_reason = reason
+        self._probe_queue = [name for name in available_capture_sources() if name not in self.EXCLUDED]
+        self._probing = None
+        self._probe_results = []
+
+    def _current_probe(self) -> Optional[CaptureProbe]:
+        """Candidate to sample on this grab, moving on once it has had its probe time."""
+        while True:
+            probe = self._probing
+            if probe is not None:
+                if probe.elapsed() < self._probe_time:
+                    return probe
+                self._probe_results.append(probe.result())
+                self._probing = None
+            if not self._probe_queue:
+                self._finish_probe()
+                return None
+            name = self._probe_queue.pop(0)
+            source = self._sources.get(name)
+            if source is None:
+                source = create_capture_source(name, self._hwnd, geometry=self._geometry)
+                if source is None:
+                    continue
+                if isinstance(source, DxcamCaptureSource):
+                    source.set_async(self._async)
+                self._sources[name] = source
+            if not source.is_running() and not source.start(self._fps):
+                self._probe_results.append(ProbeResult(name, 0, 0, 0, 0.0, 0.0))
+                continue
+            self._probing = CaptureProbe(name, self._fps)
+
+    def _finish_probe(self) -> None:
+        results = self._probe_results
+        usable = [result for result in results if result.usable]
+        best = min(usable, key=lambda result: result.cost_ms) if usable else None
+        active = best.name if best is not None else None
+        if active is None and "mss" in self._sources:
+            active = "mss"
+        for name in list(self._sources):
+            if name != active:
+                self._sources.pop(name).stop()
+
+        self._active = active
+        self._active_result = best
+        self._latency_ema = best.latency_ms if best is not None else 0.0
+        self._failures = 0
+        self._probe_key = self._window_key()
+        self._probe_time_last = time.perf_counter()
+        self._probe_queue = None
+        self._probe_results = []
+        with self._results_lock:
+            self._results = results
+            self._results_version += 1
+        self._log.info(
+            "auto capture (%s): %s -> %s",
+            self._probe_reason,
+            ", ".join(f"{r.name} {r.cost_ms:.1f}ms/{r.failure_rate:.0%}" for r in results) or "-",
+            active,
+        )
+
+
+def _bounce(pos: int, span: int) -> int:
+    if span <= 0:
+        return 0
+    pos %= 2 * span
+    return pos if pos <= span else 2 * span - pos
+
+
+register_capture_source("mss", MssCaptureSource, MSS_AVAILABLE)
+register_capture_source("dxcam", DxcamCaptureSource, DXCAM_AVAILABLE)
+register_capture_source("wgc", WgcCaptureSource, WGC_AVAILABLE)
+register_capture_source("synthetic", SyntheticCaptureSource, NUMPY_AVAILABLE)
+register_capture_source("auto", AutoCaptureSource, MSS_AVAILABLE or DXCAM_AVAILABLE or WGC_AVAILABLE)
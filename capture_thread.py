@@ -0,0 +1,159 @@
+import threading
+import time
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+
+from logger_utils import get_logger
+
+
+class MailboxStats(NamedTuple):
+    produced: int
+    consumed: int
+    overwritten: int
+    dropped: int
+    repeated: int
+    stale: int
+
+
+class FrameMailbox:
+    """Single-slot mailbox: the producer overwrites, the consumer takes the newest.
+
+    ``overwritten`` counts frames replaced before the consumer saw them (capture
+    ahead of display), ``dropped`` counts grabs that produced nothing,
+    ``stale`` counts grabs that returned the same ``seq`` as the previous put and
+    ``repeated`` counts takes that found no new frame (display ahead of capture).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frame = None
+        self._seq = 0
+        self._taken_seq = 0
+        self._produced = 0
+        self._consumed = 0
+        self._overwritten = 0
+        self._dropped = 0
+        self._repeated = 0
+        self._stale = 0
+        self._last_frame_seq = None
+
+    def put(self, frame: Any) -> int:
+        frame_seq = getattr(frame, "seq", None)
+        with self._lock:
+            if frame_seq is not None and frame_seq == self._last_frame_seq:
+                self._stale += 1
+                replaced = frame
+            else:
+                replaced = self._frame if self._seq != self._taken_seq else None
+                if replaced is not None:
+                    self._overwritten += 1
+                self._last_frame_seq = frame_seq
+                self._seq += 1
+                self._frame = frame
+                self._produced += 1
+            seq = self._seq
+        _release(replaced)
+        return seq
+
+    def invalidate(self) -> None:
+        """Accept the next put even if it repeats the last ``seq``."""
+        with self._lock:
+            self._last_frame_seq = None
+
+    def drop(self) -> None:
+        with self._lock:
+            self._dropped += 1
+
+    def take(self) -> Optional[Tuple[int, Any]]:
+        """Return (seq, frame) for a frame not taken yet, else None."""
+        with self._lock:
+            if self._seq == self._taken_seq:
+                self._repeated += 1
+                return None
+            self._taken_seq = self._seq
+            self._consumed += 1
+            return self._seq, self._frame
+
+    def clear(self) -> None:
+        replaced = None
+        with self._lock:
+            if self._seq != self._taken_seq:
+                replaced = self._frame
+            self._frame = None
+            self._taken_seq = self._seq
+        _release(replaced)
+
+    def stats(self) -> MailboxStats:
+        with self._lock:
+            return MailboxStats(
+                self._produced,
+                self._consumed,
+                self._overwritten,
+                self._dropped,
+                self._repeated,
+                self._stale,
+            )
+
+
+def _release(frame: Any) -> None:
+    release = getattr(frame, "release", None)
+    if release is not None:
+        release()
+
+
+class CaptureThread(threading.Thread):
+    """Calls ``grab()`` at ``fps`` and posts each result to ``mailbox``.
+
+    ``on_exit`` runs on the thread once it stops, to free resources ``grab``
+    created there.
+    """
+
+    def __init__(
+        self,
+        grab: Callable[[], Any],
+        mailbox: FrameMailbox,
+        fps: int,
+        on_exit: Optional[Callable[[], None]] = None,
+    ):
+        super().__init__(name="visuef-capture", daemon=True)
+        self._grab = grab
+        self._on_exit = on_exit
+        self._mailbox = mailbox
+        self._period = 1.0 / max(1, fps)
+        self._stop_event = threading.Event()
+        self._log = get_logger()
+
+    def set_fps(self, fps: int) -> None:
+        self._period = 1.0 / max(1, fps)
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
+
+    def run(self) -> None:
+        try:
+            self._run()
+        finally:
+            if self._on_exit is not None:
+                self._on_exit()
+
+    def _run(self) -> None:
+        deadline = time.perf_counter()
+        while not self._stop_event.is_set():
+            try:
+                frame = self._grab()
+            except Exception:
+                self._log.exception("capture thread grab failed")
+                frame = None
+            if frame is None:
+                self._mailbox.drop()
+            else:
+                self._mailbox.put(frame)
+
+            period = self._period
+            deadline += period
+            now = time.perf_counter()
+            if deadline < now:
+                # Running late: skip the missed slots instead of bursting.
+                deadline = now + period - ((now - deadline) % period)
+            self._stop_event.wait(deadline - now)
@@ -0,0 +1,46 @@
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+class FrameChangeDetector:
+    """Tells whether a BGRA frame looks identical to the previous one.
+
+    Only a strided sample of the pixels is checksummed (about ``samples``
+    pixels), so a change that falls entirely between sampled pixels can be
+    missed; ``max_skip`` bounds how many frames in a row may be reported as
+    unchanged before one is forced through.
+    """
+
+    def __init__(self, samples: int = 65536, max_skip: int = 30):
+        self._samples = max(1, int(samples))
+        self._max_skip = max(0, int(max_skip))
+        self._last = None
+        self._skipped = 0
+        self.hits = 0
+        self.misses = 0
+
+    def reset(self) -> None:
+        self._last = None
+        self._skipped = 0
+
+    def is_unchanged(self, arr) -> bool:
+        if np is None or arr is None or getattr(arr, "ndim", 0) != 3:
+            self.misses += 1
+            return False
+        height, width = arr.shape[0], arr.shape[1]
+        step = max(1, int(((height * width) / self._samples) ** 0.5))
+        sample = np.ascontiguousarray(arr[step // 2 :: step, step // 2 :: step])
+        key = (arr.shape, zlib.crc32(sample.data))
+        unchanged = key == self._last and self._skipped < self._max_skip
+        self._last = key
+        if unchanged:
+            self._skipped += 1
+            self.hits += 1
+        else:
+            self._skipped = 0
+            self.misses += 1
+        return unchanged
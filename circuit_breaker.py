@@ -0,0 +1,51 @@
+import time
+
+from logger_utils import get_logger
+
+
+class CircuitBreaker:
+    """Stops calling a failing backend for an exponentially growing delay.
+
+    After ``threshold`` consecutive failures the breaker opens for
+    ``base_delay`` seconds; every failed retry after that doubles the delay up
+    to ``max_delay``. One success closes it and resets the delay.
+    """
+
+    def __init__(self, name: str, threshold: int = 3, base_delay: float = 0.5, max_delay: float = 30.0):
+        self.name = name
+        self._threshold = max(1, int(threshold))
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._log = get_logger()
+
+    def allow(self) -> bool:
+        """False while open; once the delay expired, lets a retry through."""
+        return time.perf_counter() >= self._open_until
+
+    def record_success(self) -> None:
+        if self._trips:
+            self._log.info("%s capture recovered", self.name)
+        self._failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+
+    def record_failure(self, exc: BaseException) -> bool:
+        """Count a failure; returns True if it opened the breaker."""
+        self._failures += 1
+        if self._trips == 0 and self._failures < self._threshold:
+            return False
+        delay = min(self._max_delay, self._base_delay * (2 ** self._trips))
+        self._trips += 1
+        self._open_until = time.perf_counter() + delay
+        self._log.warning(
+            "%s capture disabled for %.1fs after %d failures: %s", self.name, delay, self._failures, exc
+        )
+        return True
+
+    def reset(self) -> None:
+        self._failures = 0
+        self._trips = 0
+        self._open_until = 0.0
@@ -5,6 +5,7 @@ from typing import Dict, Any
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_PATH = os.path.join(BASE_DIR, "configs.json")
+BACKEND_CACHE_PATH = os.path.join(BASE_DIR, "backend_cache.json")
 
 
 def load_configs() -> Dict[str, Dict[str, Any]]:
@@ -26,3 +27,25 @@ def save_configs(configs: Dict[str, Dict[str, Any]]) -> None:
     payload = {"version": 1, "profiles": configs}
     with open(CONFIG_PATH, "w", encoding="utf-8") as f:
         json.dump(payload, f, indent=2, sort_keys=True)
+
+
+def load_backend_cache() -> Dict[str, str]:
+    """Auto effects backend winners, by frame signature."""
+    if not os.path.exists(BACKEND_CACHE_PATH):
+        return {}
+    try:
+        with open(BACKEND_CACHE_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return {}
+    winners = data.get("winners") if isinstance(data, dict) else None
+    if not isinstance(winners, dict):
+        return {}
+    return {str(key): str(value) for key, value in winners.items()}
+
+
+def save_backend_cache(winners: Dict[str, str]) -> None:
+    # Insertion order is the LRU order: not sorted.
+    payload = {"version": 1, "winners": dict(winners)}
+    with open(BACKEND_CACHE_PATH, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
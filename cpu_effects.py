@@ -0,0 +1,629 @@
+import functools
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Tuple
+
+from effects_chain import EffectsChain, color_matrix_bgr, effects_lut
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+try:
+    import cv2
+except ImportError:  # pragma: no cover - optional dependency
+    cv2 = None
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - optional dependency
+    numba = None
+
+
+NUMBA_AVAILABLE = numba is not None and np is not None
+
+
+def _lut_key(lut) -> bytes:
+    return lut.tobytes()
+
+
+@functools.lru_cache(maxsize=16)
+def _pair_luts(key: bytes) -> Tuple:
+    # BGRA read as two little-endian uint16 per pixel: (G << 8 | B) and
+    # (A << 8 | R). One 64K lookup maps two channels at once, and the
+    # second table passes alpha through unchanged.
+    lut = np.frombuffer(key, dtype=np.uint8).astype(np.uint16)
+    index = np.arange(65536, dtype=np.uint32)
+    low = lut[index & 0xFF]
+    both = low | (lut[index >> 8] << 8)
+    keep_high = low | (index & 0xFF00).astype(np.uint16)
+    both.flags.writeable = False
+    keep_high.flags.writeable = False
+    return both, keep_high
+
+
+@functools.lru_cache(maxsize=16)
+def _cv2_bgra_lut(key: bytes):
+    lut = np.frombuffer(key, dtype=np.uint8)
+    return np.stack((lut, lut, lut, np.arange(256, dtype=np.uint8)), axis=-1).reshape(1, 256, 4)
+
+
+def apply_lut(arr, lut, out=None):
+    """``lut`` applied to B, G, R of ``arr``; alpha is kept as is.
+
+    Writes into ``out`` (C-contiguous, same shape) when given, which may be
+    ``arr`` itself.
+    """
+    if out is None:
+        out = np.empty(arr.shape, dtype=np.uint8)
+    if arr.shape[2] == 4:
+        try:
+            pairs = arr.view(np.uint16)
+        except ValueError:
+            arr = np.ascontiguousarray(arr)
+            pairs = arr.view(np.uint16)
+        both, keep_high = _pair_luts(_lut_key(lut))
+        out_pairs = out.view(np.uint16)
+        np.take(both, pairs[:, :, 0], out=out_pairs[:, :, 0], mode="clip")
+        np.take(keep_high, pairs[:, :, 1], out=out_pairs[:, :, 1], mode="clip")
+        return out
+    return np.take(lut, arr, out=out, mode="clip")
+
+
+def _into(out, result):
+    # cv2 only writes into ``dst`` when it fits; make sure ``out`` holds the result.
+    if out is not None and result is not out:
+        np.copyto(out, result)
+        return out
+    return result
+
+
+def apply_lut_cv2(arr, lut, out=None):
+    """Same as :func:`apply_lut`, through ``cv2.LUT``."""
+    if arr.shape[2] == 4:
+        return _into(out, cv2.LUT(arr, _cv2_bgra_lut(_lut_key(lut)), dst=out))
+    return _into(out, cv2.LUT(arr, lut, dst=out))
+
+
+def apply_color_matrix(arr, matrix, out, buffers=None):
+    """3x4 ``matrix`` applied to the B, G, R of ``arr`` into ``out``; alpha is copied.
+
+    Every channel is ``b*m0 + g*m1 + r*m2 + m3`` in float32, in that order,
+    rounded and clipped: the numba kernel does the exact same steps.
+    """
+    height, width = arr.shape[0], arr.shape[1]
+    if buffers is not None:
+        acc = buffers.get((3, height, width), np.float32)
+        tmp = buffers.get((height, width), np.float32)
+    else:
+        acc = np.empty((3, height, width), dtype=np.float32)
+        tmp = np.empty((height, width), dtype=np.float32)
+    half = np.float32(0.5)
+    for c in range(3):
+        plane = acc[c]
+        np.multiply(arr[:, :, 0], matrix[c, 0], out=plane)
+        np.multiply(arr[:, :, 1], matrix[c, 1], out=tmp)
+        plane += tmp
+        np.multiply(arr[:, :, 2], matrix[c, 2], out=tmp)
+        plane += tmp
+        plane += matrix[c, 3]
+        plane += half
+        np.clip(plane, 0, 255, out=plane)
+    # All three planes are computed before ``out`` is written: it may be ``arr``.
+    for c in range(3):
+        np.copyto(out[:, :, c], acc[c], casting="unsafe")
+    if arr.shape[2] == 4 and out is not arr:
+        out[:, :, 3] = arr[:, :, 3]
+    return out
+
+
+def apply_color_matrix_cv2(arr, matrix, out):
+    m = np.array(matrix, dtype=np.float32)
+    if arr.shape[2] == 4:
+        m = np.vstack((np.insert(m, 3, 0.0, axis=1), [[0.0, 0.0, 0.0, 1.0, 0.0]])).astype(np.float32)
+    return _into(out, cv2.transform(arr, m, dst=out))
+
+
+def apply_chain(arr, chain: EffectsChain, out, buffers=None):
+    """Color matrix (if any) then LUT (if any): at most two passes, whatever the chain."""
+    matrix = color_matrix_bgr(chain)
+    if matrix is not None:
+        apply_color_matrix(arr, matrix, out, buffers)
+        arr = out
+    if chain.has_lut() or arr is not out:
+        apply_lut(arr, effects_lut(chain), out=out)
+    return out
+
+
+def apply_chain_cv2(arr, chain: EffectsChain, out):
+    matrix = color_matrix_bgr(chain)
+    if matrix is not None:
+        apply_color_matrix_cv2(arr, matrix, out)
+        arr = out
+    if chain.has_lut() or arr is not out:
+        apply_lut_cv2(arr, effects_lut(chain), out=out)
+    return out
+
+
+class OutputBuffers:
+    """Output frames (and scratch planes) reused across frames, one per shape.
+
+    Only the most recent ``max_shapes`` shapes are kept so a resize does not
+    pin the old resolution's memory. ``allocations`` counts every new
+    buffer; once the resolution is stable it stops moving.
+    """
+
+    def __init__(self, max_shapes: int = 2):
+        self._max_shapes = max(1, int(max_shapes))
+        self._buffers = OrderedDict()
+        self.allocations = 0
+
+    def get(self, shape: Tuple[int, ...], dtype=None, tag=None):
+        """Buffer for ``(shape, dtype)``; ``tag`` separates same-shape scratch."""
+        key = (shape, dtype, tag)
+        buf = self._buffers.get(key)
+        if buf is None:
+            buf = np.empty(shape, dtype=dtype or np.uint8)
+            self.allocations += 1
+            self._buffers[key] = buf
+            while len(self._buffers) > self._max_shapes:
+                self._buffers.popitem(last=False)
+        else:
+            self._buffers.move_to_end(key)
+        return buf
+
+    def clear(self) -> None:
+        self._buffers.clear()
+
+
+class ResizePlan:
+    """Nearest-neighbour resize from (src_w, src_h) to (dst_w, dst_h).
+
+    Axes whose ratio is an integer are sampled with a strided slice; the
+    others with a precomputed index vector. Both are built once per size.
+    """
+
+    __slots__ = ("size", "rows", "cols", "strided", "_flat", "_indices")
+
+    def __init__(self, src_w: int, src_h: int, dst_w: int, dst_h: int):
+        self.size = (dst_w, dst_h)
+        self.rows = _axis_plan(src_h, dst_h)
+        self.cols = _axis_plan(src_w, dst_w)
+        self.strided = isinstance(self.rows, slice) and isinstance(self.cols, slice)
+        self._flat = None
+        rows = np.arange(src_h, dtype=np.intp)[self.rows]
+        cols = np.arange(src_w, dtype=np.intp)[self.cols]
+        self._indices = (rows, cols)
+        if not self.strided:
+            # Pixel offsets into a contiguous (src_h, src_w) frame read as uint32.
+            self._flat = rows[:, None] * src_w + cols[None, :]
+
+    def indices(self):
+        """(rows, cols) source index vectors, for kernels that gather themselves."""
+        return self._indices
+
+    def apply(self, arr, out=None):
+        """Resized ``arr``: a strided view for integer ratios, else gathered into ``out``."""
+        if self.strided:
+            return arr[self.rows, self.cols]
+        if out is None:
+            out = np.empty((self.size[1], self.size[0]) + arr.shape[2:], dtype=arr.dtype)
+        return self.apply_rows(arr, out, 0, self.size[1])
+
+    def apply_rows(self, arr, out, y0: int, y1: int):
+        """Gather output rows ``y0:y1`` into the same rows of ``out`` (non-strided plans)."""
+        band = out[y0:y1]
+        if arr.ndim == 3 and arr.shape[2] == 4 and arr.dtype == np.uint8 and arr.flags.c_contiguous:
+            # One gather of whole 4-byte pixels.
+            np.take(
+                arr.view(np.uint32).ravel(),
+                self._flat[y0:y1].ravel(),
+                out=band.view(np.uint32).ravel(),
+                mode="clip",
+            )
+            return out
+        if isinstance(self.rows, slice):
+            rows = arr[self.rows][y0:y1]
+        else:
+            rows = np.take(arr, self.rows[y0:y1], axis=0, mode="clip")
+        if isinstance(self.cols, slice):
+            np.copyto(band, rows[:, self.cols])
+        else:
+            np.take(rows, self.cols, axis=1, out=band, mode="clip")
+        return out
+
+
+def _axis_plan(src: int, dst: int):
+    step = src // dst if dst > 0 else 0
+    if step >= 1 and src // step == dst:
+        return slice(0, step * dst, step)
+    return np.linspace(0, src - 1, dst).astype(np.intp)
+
+
+class BandRunner:
+    """Runs ``fn(y0, y1, band)`` over horizontal bands of a frame and waits.
+
+    numpy ufuncs, ``np.take`` and cv2 calls release the GIL, so bands run
+    truly in parallel. The calling thread takes the first band itself;
+    ``band`` is a stable index in ``range(workers)`` for per-band scratch.
+    """
+
+    def __init__(self, workers: int, min_rows: int = 32):
+        self.workers = max(1, int(workers))
+        self._min_rows = max(1, int(min_rows))
+        self._executor = None
+        if self.workers > 1:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers - 1, thread_name_prefix="visuef-effects")
+
+    def run(self, height: int, fn: Callable[[int, int, int], None]) -> None:
+        count = min(self.workers, max(1, height // self._min_rows))
+        if count <= 1 or self._executor is None:
+            fn(0, height, 0)
+            return
+        bounds = [height * idx // count for idx in range(count + 1)]
+        futures = [self._executor.submit(fn, bounds[idx], bounds[idx + 1], idx) for idx in range(1, count)]
+        try:
+            fn(bounds[0], bounds[1], 0)
+        finally:
+            for future in futures:
+                future.result()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class ResizePlanCache:
+    """ResizePlan per (src_w, src_h, dst_w, dst_h)."""
+
+    def __init__(self, max_plans: int = 8):
+        self._max_plans = max(1, int(max_plans))
+        self._plans = OrderedDict()
+
+    def get(self, src_w: int, src_h: int, dst_w: int, dst_h: int) -> ResizePlan:
+        key = (src_w, src_h, dst_w, dst_h)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = ResizePlan(src_w, src_h, dst_w, dst_h)
+            self._plans[key] = plan
+            while len(self._plans) > self._max_plans:
+                self._plans.popitem(last=False)
+        else:
+            self._plans.move_to_end(key)
+        return plan
+
+    def clear(self) -> None:
+        self._plans.clear()
+
+
+_SWAR_MASK = 0xFEFEFEFE
+
+
+def _packed(arr):
+    """2-D uint32 view of a BGRA uint8 array (any row/pixel stride), else None."""
+    if arr.dtype != np.uint8 or arr.ndim != 3 or arr.shape[2] != 4 or arr.strides[2] != 1:
+        return None
+    if arr.strides[1] % 4 or arr.strides[0] % 4:
+        return None
+    return arr.view(np.uint32)[:, :, 0]
+
+
+def average_pair(x, y, out, buffers: OutputBuffers, round_up: bool):
+    """``out = (x + y) / 2`` per channel, rounded up or down.
+
+    BGRA pixels are averaged as packed uint32 words (four bytes per op,
+    no widening); other layouts go through a uint16 accumulator.
+    """
+    px, py, po = _packed(x), _packed(y), _packed(out)
+    if px is not None and py is not None and po is not None:
+        tmp = buffers.get(po.shape, np.uint32, tag="average")
+        np.bitwise_xor(px, py, out=tmp)
+        np.bitwise_and(tmp, np.uint32(_SWAR_MASK), out=tmp)
+        np.right_shift(tmp, 1, out=tmp)
+        if round_up:
+            np.bitwise_or(px, py, out=po)
+            np.subtract(po, tmp, out=po)
+        else:
+            np.bitwise_and(px, py, out=po)
+            np.add(po, tmp, out=po)
+        return out
+    acc = buffers.get(out.shape, np.uint16, tag="average")
+    np.add(x, y, out=acc, dtype=np.uint16)
+    if round_up:
+        acc += 1
+    acc >>= 1
+    np.copyto(out, acc, casting="unsafe")
+    return out
+
+
+def box_halve(arr, out, buffers: OutputBuffers):
+    """2x2 box filter: ``out`` is (h // 2, w // 2) of ``arr``.
+
+    Rows round up and columns round down, so the two truncations cancel on
+    average and the result is within 1 of the exact mean.
+    """
+    h, w = out.shape[0], out.shape[1]
+    rows = buffers.get((h, 2 * w) + arr.shape[2:], arr.dtype, tag="halve")
+    average_pair(arr[0 : 2 * h : 2, : 2 * w], arr[1 : 2 * h : 2, : 2 * w], rows, buffers, True)
+    return average_pair(rows[:, 0::2], rows[:, 1::2], out, buffers, False)
+
+
+def box_integer(arr, kx: int, ky: int, out, buffers: OutputBuffers):
+    """Mean of each ``ky`` x ``kx`` block (trailing partial blocks are dropped)."""
+    h, w = out.shape[0], out.shape[1]
+    blocks = arr[: h * ky, : w * kx].reshape((h, ky, w, kx) + arr.shape[2:])
+    dtype = np.uint16 if kx * ky * 255 <= 0xFFFF else np.uint32
+    rows = buffers.get((h, w, kx) + arr.shape[2:], dtype, tag="rows")
+    np.copyto(rows, blocks[:, 0])
+    for i in range(1, ky):
+        np.add(rows, blocks[:, i], out=rows)
+    acc = buffers.get(out.shape, dtype, tag="blocks")
+    np.copyto(acc, rows[:, :, 0])
+    for j in range(1, kx):
+        np.add(acc, rows[:, :, j], out=acc)
+    acc += (kx * ky) // 2
+    acc //= kx * ky
+    np.copyto(out, acc, casting="unsafe")
+    return out
+
+
+@functools.lru_cache(maxsize=16)
+def _box_taps(src: int, dst: int):
+    # The two source samples closest to each output footprint's centre.
+    centres = (np.arange(dst, dtype=np.float64) + 0.5) * (src / dst) - 0.5
+    first = np.clip(np.floor(centres), 0, src - 1).astype(np.intp)
+    second = np.minimum(first + 1, src - 1)
+    first.flags.writeable = False
+    second.flags.writeable = False
+    return first, second
+
+
+@functools.lru_cache(maxsize=16)
+def _area_weights(src: int, dst: int):
+    """(first, weights): output ``i`` is ``sum(weights[i, t] * in[first[i] + t]) / 256``.
+
+    Weights are the overlap of each output footprint with the source samples,
+    in 8-bit fixed point summing to exactly 256 per output.
+    """
+    outputs = np.arange(dst, dtype=np.int64)
+    lo = outputs * src // dst
+    hi = -(-(outputs + 1) * src // dst)
+    taps = int((hi - lo).max())
+    first = np.minimum(lo, src - taps)
+    idx = first[:, None] + np.arange(taps)
+    scale = src / dst
+    starts = outputs[:, None] * scale
+    cover = np.minimum(starts + scale, idx + 1) - np.maximum(starts, idx)
+    weights = np.rint(np.clip(cover, 0.0, None) * (256.0 / scale)).astype(np.int64)
+    weights[outputs, np.argmax(weights, axis=1)] += 256 - weights.sum(axis=1)
+    first = first.astype(np.intp)
+    weights = weights.astype(np.uint32)
+    first.flags.writeable = False
+    weights.flags.writeable = False
+    return first, weights
+
+
+def box_resample(arr, out, buffers: OutputBuffers):
+    """Separable area resample for ratios between 1 and 2 (after :class:`MipPyramid` levels).
+
+    With numba, BGRA frames get the exact area sum: every output pixel is
+    the overlap-weighted mean of the source pixels under its footprint.
+    Without it, the two source samples nearest the footprint's centre are
+    averaged instead, which costs less in numpy and is close for these
+    ratios.
+    """
+    h, w = out.shape[0], out.shape[1]
+    packed, packed_out = _packed(arr), _packed(out)
+    if NUMBA_AVAILABLE and packed is not None and packed_out is not None:
+        rows = buffers.get((h, arr.shape[1]), np.uint32, tag="area")
+        lo = buffers.get((h, arr.shape[1]), np.uint32, tag="area_lo")
+        hi = buffers.get((h, arr.shape[1]), np.uint32, tag="area_hi")
+        _area_rows_kernel(packed, *_area_weights(arr.shape[0], h), lo, hi, rows)
+        _area_cols_kernel(rows, *_area_weights(arr.shape[1], w), packed_out)
+        return out
+    row_a, row_b = _box_taps(arr.shape[0], h)
+    col_a, col_b = _box_taps(arr.shape[1], w)
+    rows = buffers.get((h, arr.shape[1]) + arr.shape[2:], arr.dtype, tag="rows")
+    other = buffers.get((h, arr.shape[1]) + arr.shape[2:], arr.dtype, tag="rows2")
+    np.take(arr, row_a, axis=0, out=rows, mode="clip")
+    np.take(arr, row_b, axis=0, out=other, mode="clip")
+    average_pair(rows, other, rows, buffers, True)
+    right = buffers.get(out.shape, arr.dtype, tag="cols")
+    packed = _packed(rows)
+    if packed is not None and packed_out is not None:
+        np.take(packed, col_a, axis=1, out=packed_out, mode="clip")
+        np.take(packed, col_b, axis=1, out=_packed(right), mode="clip")
+    else:
+        np.take(rows, col_a, axis=1, out=out, mode="clip")
+        np.take(rows, col_b, axis=1, out=right, mode="clip")
+    return average_pair(out, right, out, buffers, False)
+
+
+def _integer_ratio(src: int, dst: int) -> int:
+    step = src // dst if dst > 0 else 0
+    return step if step >= 1 and src // step == dst else 0
+
+
+class MipPyramid:
+    """Box-filtered half-resolution levels of the current frame.
+
+    :meth:`set_frame` points level 0 at the frame; the other levels are
+    built on first use and shared by every downscale of that frame, so a
+    frame is halved at most once per level. Setting the same frame again
+    under the same ``key`` (a re-render after a resize or a settings
+    change) keeps its levels. Level buffers and scratch are reused across
+    frames.
+    """
+
+    def __init__(self, max_levels: int = 6):
+        self._max_levels = max(1, int(max_levels))
+        self.buffers = OutputBuffers(max_shapes=4 * self._max_levels + 8)
+        self._levels = []
+        self._key = None
+
+    def set_frame(self, arr, key=None) -> None:
+        """Start a frame (``None`` drops the reference to it, built levels stay)."""
+        if arr is None:
+            if self._levels:
+                self._levels[0] = None
+            return
+        levels = self._levels
+        if key is not None and key == self._key and len(levels) > 1 and levels[1].shape[:2] == (
+            arr.shape[0] // 2,
+            arr.shape[1] // 2,
+        ):
+            levels[0] = arr
+        else:
+            self._levels = [arr]
+        self._key = key
+
+    def has_frame(self) -> bool:
+        return bool(self._levels) and self._levels[0] is not None
+
+    def clear(self) -> None:
+        self._levels = []
+        self._key = None
+        self.buffers.clear()
+
+    def level(self, index: int):
+        """Level ``index`` (0 = the frame), or the smallest one that exists."""
+        levels = self._levels
+        while len(levels) <= min(index, self._max_levels):
+            src = levels[-1]
+            h, w = src.shape[0] // 2, src.shape[1] // 2
+            if h < 1 or w < 1:
+                break
+            out = self.buffers.get((h, w) + src.shape[2:], src.dtype, tag=("level", len(levels)))
+            levels.append(box_halve(src, out, self.buffers))
+        return levels[min(index, len(levels) - 1)]
+
+    def downscale(self, dst_w: int, dst_h: int, out=None):
+        """Box-filtered (dst_h, dst_w) frame: a pyramid level, or ``out``.
+
+        A pyramid level is returned as is when it has the exact size, so
+        callers must not write into the result unless it is ``out``.
+        """
+        src = self._levels[0]
+        kx = _integer_ratio(src.shape[1], dst_w)
+        ky = _integer_ratio(src.shape[0], dst_h)
+        if kx and ky:
+            # Integer ratios: halve while both factors are even, then one
+            # block mean for what is left (1/3, 1/5...).
+            index = 0
+            while kx % 2 == 0 and ky % 2 == 0 and index < self._max_levels:
+                kx, ky, index = kx // 2, ky // 2, index + 1
+            src = self.level(index)
+            if kx == 1 and ky == 1 and src.shape[:2] == (dst_h, dst_w):
+                return src
+            if src.shape[1] // kx == dst_w and src.shape[0] // ky == dst_h:
+                if out is None:
+                    out = self.buffers.get((dst_h, dst_w) + src.shape[2:], src.dtype, tag="out")
+                return box_integer(src, kx, ky, out, self.buffers)
+            src = self._levels[0]
+        index = 0
+        while src.shape[1] >= 2 * dst_w and src.shape[0] >= 2 * dst_h and index < self._max_levels:
+            index += 1
+            src = self.level(index)
+        if src.shape[:2] == (dst_h, dst_w):
+            return src
+        if out is None:
+            out = self.buffers.get((dst_h, dst_w) + src.shape[2:], src.dtype, tag="out")
+        return box_resample(src, out, self.buffers)
+
+
+if NUMBA_AVAILABLE:
+
+    @numba.njit(parallel=True, cache=True, nogil=True)
+    def _resize_chain_kernel(src, rows, cols, matrix, use_matrix, lut, out):
+        has_alpha = out.shape[2] == 4
+        half = np.float32(0.5)
+        for y in numba.prange(rows.shape[0]):
+            row = src[rows[y]]
+            dst = out[y]
+            for x in range(cols.shape[0]):
+                pixel = row[cols[x]]
+                if use_matrix:
+                    b = np.float32(pixel[0])
+                    g = np.float32(pixel[1])
+                    r = np.float32(pixel[2])
+                    for c in range(3):
+                        acc = b * matrix[c, 0] + g * matrix[c, 1] + r * matrix[c, 2] + matrix[c, 3] + half
+                        if acc < 0:
+                            acc = np.float32(0)
+                        elif acc > 255:
+                            acc = np.float32(255)
+                        dst[x, c] = lut[np.uint8(acc)]
+                else:
+                    dst[x, 0] = lut[pixel[0]]
+                    dst[x, 1] = lut[pixel[1]]
+                    dst[x, 2] = lut[pixel[2]]
+                if has_alpha:
+                    dst[x, 3] = pixel[3]
+
+
+    @numba.njit(parallel=True, cache=True, nogil=True)
+    def _area_rows_kernel(src, first, weights, lo, hi, out):
+        # Packed BGRA: B/R and G/A are summed as two 16-bit lanes each, the
+        # 8-bit weights summing to 256 keep every lane below 65536.
+        mask = np.uint32(0x00FF00FF)
+        half = np.uint32(0x00800080)
+        shift = np.uint32(8)
+        for y in numba.prange(out.shape[0]):
+            acc_lo = lo[y]
+            acc_hi = hi[y]
+            row = src[first[y]]
+            w = weights[y, 0]
+            for x in range(out.shape[1]):
+                acc_lo[x] = (row[x] & mask) * w
+                acc_hi[x] = ((row[x] >> shift) & mask) * w
+            for t in range(1, weights.shape[1]):
+                w = weights[y, t]
+                if w == 0:
+                    continue
+                row = src[first[y] + t]
+                for x in range(out.shape[1]):
+                    acc_lo[x] += (row[x] & mask) * w
+                    acc_hi[x] += ((row[x] >> shift) & mask) * w
+            dst = out[y]
+            for x in range(out.shape[1]):
+                dst[x] = (((acc_lo[x] + half) >> shift) & mask) | ((acc_hi[x] + half) & ~mask)
+
+    @numba.njit(parallel=True, cache=True, nogil=True)
+    def _area_cols_kernel(src, first, weights, out):
+        mask = np.uint32(0x00FF00FF)
+        half = np.uint32(0x00800080)
+        shift = np.uint32(8)
+        for y in numba.prange(out.shape[0]):
+            row = src[y]
+            dst = out[y]
+            for x in range(out.shape[1]):
+                start = first[x]
+                acc_lo = np.uint32(0)
+                acc_hi = np.uint32(0)
+                for t in range(weights.shape[1]):
+                    w = weights[x, t]
+                    pixel = row[start + t]
+                    acc_lo += (pixel & mask) * w
+                    acc_hi += ((pixel >> shift) & mask) * w
+                dst[x] = (((acc_lo + half) >> shift) & mask) | ((acc_hi + half) & ~mask)
+
+
+_NO_MATRIX = np.zeros((3, 4), dtype=np.float32) if np is not None else None
+
+
+def resize_chain_numba(arr, plan: ResizePlan, chain: EffectsChain, out):
+    """Nearest resize along ``plan`` and the whole effects chain in one parallel pass.
+
+    Reads ``arr`` (any strides, e.g. a crop view) once and writes ``out``
+    once; the result is byte-identical to ``plan.apply`` followed by
+    :func:`apply_chain`.
+    """
+    rows, cols = plan.indices()
+    matrix = color_matrix_bgr(chain)
+    use_matrix = matrix is not None
+    _resize_chain_kernel(
+        arr, rows, cols, matrix if use_matrix else _NO_MATRIX, use_matrix, effects_lut(chain), out
+    )
+    return out
@@ -0,0 +1,150 @@
+import functools
+import math
+from typing import NamedTuple, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+IDENTITY_MIX = ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0))
+
+# Rec. 709 luma weights, as in the CSS filter matrices.
+_LUMA = (0.2126, 0.7152, 0.0722)
+
+
+class EffectsChain(NamedTuple):
+    """Per-pixel point effects, folded into one color matrix and one LUT.
+
+    Order: channel mix / hue / saturation (the 3x4 matrix, on RGB), then
+    levels, gamma, contrast and brightness (the 256-entry LUT, on every
+    color channel). Hashable, so the folded forms are cached by value.
+    """
+
+    brightness: float = 1.0
+    contrast: float = 1.0
+    gamma: float = 1.0
+    saturation: float = 1.0
+    hue: float = 0.0  # degrees
+    black: int = 0  # levels
+    white: int = 255
+    mix: Tuple[Tuple[float, float, float], ...] = IDENTITY_MIX  # rows: output R, G, B
+
+    @classmethod
+    def from_dict(cls, data: dict, base: Optional["EffectsChain"] = None) -> "EffectsChain":
+        base = base if base is not None else cls()
+        if not isinstance(data, dict):
+            return base
+        values = base._asdict()
+        for key in ("brightness", "contrast", "gamma", "saturation", "hue"):
+            if key in data:
+                values[key] = float(data[key])
+        for key in ("black", "white"):
+            if key in data:
+                values[key] = max(0, min(255, int(data[key])))
+        if values["white"] <= values["black"]:
+            values["white"] = min(255, values["black"] + 1)
+            values["black"] = values["white"] - 1
+        mix = data.get("mix")
+        if isinstance(mix, (list, tuple)) and len(mix) == 3 and all(len(row) == 3 for row in mix):
+            values["mix"] = tuple(tuple(float(v) for v in row) for row in mix)
+        values["gamma"] = max(0.05, values["gamma"])
+        return cls(**values)
+
+    def to_dict(self) -> dict:
+        data = self._asdict()
+        data["mix"] = [list(row) for row in self.mix]
+        return data
+
+    def is_identity(self) -> bool:
+        return self == EffectsChain()
+
+    def has_matrix(self) -> bool:
+        return self.saturation != 1.0 or self.hue % 360.0 != 0.0 or self.mix != IDENTITY_MIX
+
+    def has_lut(self) -> bool:
+        return (
+            self.brightness != 1.0
+            or self.contrast != 1.0
+            or self.gamma != 1.0
+            or self.black != 0
+            or self.white != 255
+        )
+
+
+def _matmul(a, b):
+    return tuple(tuple(sum(a[i][k] * b[k][j] for k in range(3)) for j in range(3)) for i in range(3))
+
+
+def rgb_matrix(chain: EffectsChain) -> Tuple[Tuple[float, ...], ...]:
+    """3x4 RGB matrix (offset in the last column, 0..255 scale)."""
+    s = chain.saturation
+    lr, lg, lb = _LUMA
+    saturation = (
+        (lr + (1 - lr) * s, lg - lg * s, lb - lb * s),
+        (lr - lr * s, lg + (1 - lg) * s, lb - lb * s),
+        (lr - lr * s, lg - lg * s, lb + (1 - lb) * s),
+    )
+    angle = math.radians(chain.hue)
+    c, n = math.cos(angle), math.sin(angle)
+    hue = (
+        (lr + c * (1 - lr) - n * lr, lg - c * lg - n * lg, lb - c * lb + n * (1 - lb)),
+        (lr - c * lr + n * 0.143, lg + c * (1 - lg) + n * 0.140, lb - c * lb - n * 0.283),
+        (lr - c * lr - n * (1 - lr), lg - c * lg + n * lg, lb + c * (1 - lb) + n * lb),
+    )
+    matrix = _matmul(chain.mix, _matmul(hue, saturation))
+    return tuple(row + (0.0,) for row in matrix)
+
+
+@functools.lru_cache(maxsize=32)
+def color_matrix_bgr(chain: EffectsChain):
+    """float32 (3, 4) matrix for BGR(A) pixels, or None when it is the identity."""
+    if not chain.has_matrix():
+        return None
+    rgb = rgb_matrix(chain)
+    # Reverse both the output rows and the input columns: B, G, R.
+    bgr = [[rgb[2 - i][2 - j] for j in range(3)] + [rgb[2 - i][3]] for i in range(3)]
+    matrix = np.array(bgr, dtype=np.float32)
+    matrix.flags.writeable = False
+    return matrix
+
+
+@functools.lru_cache(maxsize=32)
+def effects_lut(chain: EffectsChain):
+    """256-entry uint8 table for levels, gamma, contrast and brightness.
+
+    Contrast and brightness use the same float32 steps as the original
+    per-pixel code, so a chain with only those two is byte-identical to it.
+    """
+    values = np.arange(256, dtype=np.float32)
+    if chain.black != 0 or chain.white != 255:
+        values = np.clip((values - chain.black) * (255.0 / (chain.white - chain.black)), 0, 255)
+    if chain.gamma != 1.0:
+        values = np.power(values / 255.0, 1.0 / chain.gamma).astype(np.float32) * 255.0
+    if chain.contrast != 1.0:
+        values = (values - 128.0) * chain.contrast + 128.0
+    if chain.brightness != 1.0:
+        values = values * chain.brightness
+    lut = np.clip(values, 0, 255).astype(np.uint8)
+    lut.flags.writeable = False
+    return lut
+
+
+def effects_table(chain: EffectsChain) -> list:
+    """:func:`effects_lut` as a list of ints, for Pillow's ``Image.point``."""
+    if np is not None:
+        return effects_lut(chain).tolist()
+    table = []
+    for value in range(256):
+        v = float(value)
+        if chain.black != 0 or chain.white != 255:
+            v = min(255.0, max(0.0, (v - chain.black) * (255.0 / (chain.white - chain.black))))
+        if chain.gamma != 1.0:
+            v = (v / 255.0) ** (1.0 / chain.gamma) * 255.0
+        if chain.contrast != 1.0:
+            v = (v - 128.0) * chain.contrast + 128.0
+        if chain.brightness != 1.0:
+            v = v * chain.brightness
+        table.append(int(min(255.0, max(0.0, v))))
+    return table
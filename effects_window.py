@@ -1,3 +1,5 @@
+import os
+
 from PyQt5 import QtCore, QtWidgets
 
 from config_store import load_configs, save_configs
@@ -6,16 +8,21 @@ from logger_utils import LOG_PATH
 
 class EffectsWindow(QtWidgets.QWidget):
     effects_changed = QtCore.pyqtSignal(float, float)  # brightness, contrast
+    effects_chain_changed = QtCore.pyqtSignal(dict)  # gamma, saturation, hue, levels, mix
     fps_changed = QtCore.pyqtSignal(int)
     scale_changed = QtCore.pyqtSignal(int)
     perf_changed = QtCore.pyqtSignal(bool)
+    downscale_changed = QtCore.pyqtSignal(str)
     gpu_changed = QtCore.pyqtSignal(bool)
     client_area_changed = QtCore.pyqtSignal(bool)
     dxcam_async_changed = QtCore.pyqtSignal(bool)
+    shared_capture_changed = QtCore.pyqtSignal(bool)
+    adaptive_quality_changed = QtCore.pyqtSignal(bool)
     crop_changed = QtCore.pyqtSignal(int, int, int, int)
     blob_changed = QtCore.pyqtSignal(dict)
     backend_changed = QtCore.pyqtSignal(str)
     effects_backend_changed = QtCore.pyqtSignal(str)
+    effects_workers_changed = QtCore.pyqtSignal(int)
 
     def __init__(
         self,
@@ -24,6 +31,7 @@ class EffectsWindow(QtWidgets.QWidget):
         has_gl: bool,
         has_wgc: bool,
         has_opencv: bool,
+        has_numba: bool = False,
     ):
         super().__init__()
         self.setWindowTitle("Reglages (luminosite / contraste)")
@@ -40,12 +48,32 @@ class EffectsWindow(QtWidgets.QWidget):
 
         self.brightness_slider = self._make_slider(50, 200, 100)
         self.contrast_slider = self._make_slider(50, 200, 100)
+        self.gamma_slider = self._make_slider(20, 300, 100)
+        self.saturation_slider = self._make_slider(0, 200, 100)
+        self.hue_slider = self._make_slider(-180, 180, 0)
+        self.levels_black = self._make_spinbox(0, 254, 0)
+        self.levels_white = self._make_spinbox(1, 255, 255)
+        self.mix_boxes = [[self._make_mix_box(1.0 if row == col else 0.0) for col in range(3)] for row in range(3)]
         self.fps_slider = self._make_slider(5, 120, 30)
         self.scale_slider = self._make_slider(10, 100, 100)
         self.fast_checkbox = QtWidgets.QCheckBox("Mode performance")
+        self.downscale_combo = QtWidgets.QComboBox()
+        self.downscale_combo.addItem("Plus proche", "nearest")
+        self.downscale_combo.addItem("Moyenne (box)", "box")
+        self.downscale_combo.setToolTip(
+            "Moyenne: reduction lissee (pyramide de demi-resolutions, puis moyenne ponderee par surface).\n"
+            "Sans Numba, les rapports non entiers utilisent une approximation a deux points."
+        )
         self.gpu_checkbox = QtWidgets.QCheckBox("Rendu GPU (OpenGL)")
         self.client_checkbox = QtWidgets.QCheckBox("Zone client")
         self.dxcam_async_checkbox = QtWidgets.QCheckBox("DXCAM async")
+        self.shared_checkbox = QtWidgets.QCheckBox("Capture partagee")
+        self.adaptive_checkbox = QtWidgets.QCheckBox("Qualite adaptative")
+        self.workers_spin = self._make_spinbox(1, max(1, os.cpu_count() or 1), min(4, os.cpu_count() or 1))
+        self.workers_spin.setToolTip("Bandes traitees en parallele par les effets NumPy / OpenCV")
+        self.adaptive_checkbox.setToolTip(
+            "Baisse l'echelle de rendu puis celle du blob tracker quand le FPS cible n'est pas tenu"
+        )
         self.crop_left = self._make_spinbox()
         self.crop_top = self._make_spinbox()
         self.crop_right = self._make_spinbox()
@@ -91,6 +119,7 @@ class EffectsWindow(QtWidgets.QWidget):
         self.blob_b = self._make_spinbox(0, 255, 0)
 
         self.backend_combo = QtWidgets.QComboBox()
+        self.backend_combo.addItem("Auto", "auto")
         self.backend_combo.addItem("MSS", "mss")
         if has_dxcam:
             self.backend_combo.addItem("DXCAM", "dxcam")
@@ -99,16 +128,32 @@ class EffectsWindow(QtWidgets.QWidget):
 
         self.effects_combo = QtWidgets.QComboBox()
         self.effects_combo.addItem("Auto", "auto")
+        self.effects_combo.setItemData(
+            0, "Mesure chaque backend sur les premieres images et garde le plus rapide", QtCore.Qt.ToolTipRole
+        )
         if has_numpy:
             self.effects_combo.addItem("NumPy", "numpy")
         if has_opencv:
             self.effects_combo.addItem("OpenCV", "opencv")
+        if has_numba:
+            self.effects_combo.addItem("Numba", "numba")
 
         self.fps_value = QtWidgets.QLabel("56")
         self.fps_actual = QtWidgets.QLabel("--")
+        self.capture_stats = QtWidgets.QLabel("--")
+        self.capture_probe = QtWidgets.QLabel("--")
+        self.capture_probe.setWordWrap(True)
+        self.frame_timing = QtWidgets.QLabel("--")
+        self.latency_stats = QtWidgets.QLabel("--")
+        self.latency_stats.setWordWrap(True)
+        self.quality_status = QtWidgets.QLabel("--")
+        self.quality_status.setWordWrap(True)
         self.fps_badge = QtWidgets.QLabel("FPS: --")
         self.fps_badge.setObjectName("FpsBadge")
         self.fps_badge.setAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        self._fps_text = "--"
+        self._change_text = ""
+        self._latency_text = ""
         self.scale_value = QtWidgets.QLabel("100%")
         self.title_label = QtWidgets.QLabel("Visuef")
         self.title_label.setObjectName("Title")
@@ -157,12 +202,24 @@ class EffectsWindow(QtWidgets.QWidget):
 
         self.brightness_slider.valueChanged.connect(self._emit_effects)
         self.contrast_slider.valueChanged.connect(self._emit_effects)
+        self.gamma_slider.valueChanged.connect(self._emit_effects_chain)
+        self.saturation_slider.valueChanged.connect(self._emit_effects_chain)
+        self.hue_slider.valueChanged.connect(self._emit_effects_chain)
+        self.levels_black.valueChanged.connect(self._emit_effects_chain)
+        self.levels_white.valueChanged.connect(self._emit_effects_chain)
+        for row in self.mix_boxes:
+            for box in row:
+                box.valueChanged.connect(self._emit_effects_chain)
         self.fps_slider.valueChanged.connect(self._emit_fps)
         self.scale_slider.valueChanged.connect(self._emit_scale)
         self.fast_checkbox.toggled.connect(self._emit_perf)
+        self.downscale_combo.currentIndexChanged.connect(self._emit_downscale)
         self.gpu_checkbox.toggled.connect(self._emit_gpu)
         self.client_checkbox.toggled.connect(self._emit_client)
         self.dxcam_async_checkbox.toggled.connect(self._emit_dxcam_async)
+        self.shared_checkbox.toggled.connect(self._emit_shared_capture)
+        self.adaptive_checkbox.toggled.connect(self._emit_adaptive_quality)
+        self.workers_spin.valueChanged.connect(self._emit_effects_workers)
         self.crop_left.valueChanged.connect(self._emit_crop)
         self.crop_top.valueChanged.connect(self._emit_crop)
         self.crop_right.valueChanged.connect(self._emit_crop)
@@ -214,12 +271,17 @@ class EffectsWindow(QtWidgets.QWidget):
 
     def emit_current(self) -> None:
         self._emit_effects()
+        self._emit_effects_chain()
         self._emit_fps()
         self._emit_scale()
         self._emit_perf()
+        self._emit_downscale()
         self._emit_gpu()
         self._emit_client()
         self._emit_dxcam_async()
+        self._emit_shared_capture()
+        self._emit_adaptive_quality()
+        self._emit_effects_workers()
         self._emit_crop()
         self._emit_blob()
         self._emit_backend()
@@ -232,6 +294,7 @@ class EffectsWindow(QtWidgets.QWidget):
         rec_form.addRow("Rendu GPU", self.gpu_checkbox)
         rec_form.addRow("Zone client", self.client_checkbox)
         rec_form.addRow("DXCAM async", self.dxcam_async_checkbox)
+        rec_form.addRow("Capture partagee", self.shared_checkbox)
 
         fps_layout = QtWidgets.QHBoxLayout()
         fps_layout.addWidget(self.fps_slider)
@@ -247,8 +310,16 @@ class EffectsWindow(QtWidgets.QWidget):
 
         rec_form.addRow("FPS cible", fps_container)
         rec_form.addRow("Echelle rendu", scale_container)
+        rec_form.addRow("Reduction", self.downscale_combo)
+        rec_form.addRow("Qualite adaptative", self.adaptive_checkbox)
+        rec_form.addRow("Threads effets", self.workers_spin)
         rec_form.addRow("Rognage (px)", self._build_crop_widget())
         rec_form.addRow("FPS reel", self.fps_actual)
+        rec_form.addRow("Cadence", self.frame_timing)
+        rec_form.addRow("Tampon capture /s", self.capture_stats)
+        rec_form.addRow("Sonde auto", self.capture_probe)
+        rec_form.addRow("Latence p50/p95/p99 (ms)", self.latency_stats)
+        rec_form.addRow("Qualite auto", self.quality_status)
 
         container = QtWidgets.QWidget()
         layout = QtWidgets.QVBoxLayout()
@@ -261,6 +332,11 @@ class EffectsWindow(QtWidgets.QWidget):
         effects_form = QtWidgets.QFormLayout()
         effects_form.addRow("Luminosite", self.brightness_slider)
         effects_form.addRow("Contraste", self.contrast_slider)
+        effects_form.addRow("Gamma", self.gamma_slider)
+        effects_form.addRow("Saturation", self.saturation_slider)
+        effects_form.addRow("Teinte", self.hue_slider)
+        effects_form.addRow("Niveaux (noir / blanc)", self._build_levels_widget())
+        effects_form.addRow("Melange canaux (R, V, B)", self._build_mix_widget())
         effects_form.addRow("Backend effets", self.effects_combo)
 
         container = QtWidgets.QWidget()
@@ -333,6 +409,33 @@ class EffectsWindow(QtWidgets.QWidget):
         box.setValue(val)
         return box
 
+    def _make_mix_box(self, val: float) -> QtWidgets.QDoubleSpinBox:
+        box = QtWidgets.QDoubleSpinBox()
+        box.setRange(-2.0, 2.0)
+        box.setSingleStep(0.05)
+        box.setDecimals(2)
+        box.setValue(val)
+        return box
+
+    def _build_levels_widget(self) -> QtWidgets.QWidget:
+        layout = QtWidgets.QHBoxLayout()
+        layout.addWidget(self.levels_black)
+        layout.addWidget(self.levels_white)
+        layout.setContentsMargins(0, 0, 0, 0)
+        container = QtWidgets.QWidget()
+        container.setLayout(layout)
+        return container
+
+    def _build_mix_widget(self) -> QtWidgets.QWidget:
+        grid = QtWidgets.QGridLayout()
+        for row, boxes in enumerate(self.mix_boxes):
+            for col, box in enumerate(boxes):
+                grid.addWidget(box, row, col)
+        grid.setContentsMargins(0, 0, 0, 0)
+        container = QtWidgets.QWidget()
+        container.setLayout(grid)
+        return container
+
     def _build_crop_widget(self) -> QtWidgets.QWidget:
         grid = QtWidgets.QGridLayout()
         grid.addWidget(QtWidgets.QLabel("Gauche"), 0, 0)
@@ -544,6 +647,15 @@ class EffectsWindow(QtWidgets.QWidget):
             self.dxcam_async_checkbox.setChecked(False)
             self.dxcam_async_checkbox.setToolTip("DXCAM non installe.")
 
+        self.shared_checkbox.setEnabled(has_numpy)
+        self.shared_checkbox.setChecked(False)
+        self.shared_checkbox.setToolTip(
+            "Une seule capture par ecran pour toutes les fenetres (MSS / DXCAM).\n"
+            "A activer avec plusieurs fenetres sur le meme ecran: ajoute une boucle de capture."
+            if has_numpy
+            else "NumPy non installe."
+        )
+
         if has_wgc:
             self._set_combo_by_data(self.backend_combo, "wgc")
         elif has_dxcam:
@@ -582,12 +694,17 @@ class EffectsWindow(QtWidgets.QWidget):
             "effects_backend": self.effects_combo.currentData(),
             "brightness": self.brightness_slider.value() / 100.0,
             "contrast": self.contrast_slider.value() / 100.0,
+            "effects_chain": self._effects_chain_params(),
             "fps": self.fps_slider.value(),
             "scale": self.scale_slider.value(),
             "performance": self.fast_checkbox.isChecked(),
+            "downscale": self.downscale_combo.currentData(),
             "gpu": self.gpu_checkbox.isChecked(),
             "client_area": self.client_checkbox.isChecked(),
             "dxcam_async": self.dxcam_async_checkbox.isChecked(),
+            "shared_capture": self.shared_checkbox.isChecked(),
+            "adaptive_quality": self.adaptive_checkbox.isChecked(),
+            "effects_workers": self.workers_spin.value(),
             "crop": {
                 "left": self.crop_left.value(),
                 "top": self.crop_top.value(),
@@ -637,13 +754,32 @@ class EffectsWindow(QtWidgets.QWidget):
 
         self._set_slider_value(self.brightness_slider, int(round(settings.get("brightness", 1.0) * 100)))
         self._set_slider_value(self.contrast_slider, int(round(settings.get("contrast", 1.0) * 100)))
+        chain = settings.get("effects_chain", {})
+        if isinstance(chain, dict):
+            self._set_slider_value(self.gamma_slider, int(round(float(chain.get("gamma", 1.0)) * 100)))
+            self._set_slider_value(self.saturation_slider, int(round(float(chain.get("saturation", 1.0)) * 100)))
+            self._set_slider_value(self.hue_slider, int(round(float(chain.get("hue", 0.0)))))
+            self._set_spin_value(self.levels_black, int(chain.get("black", 0)))
+            self._set_spin_value(self.levels_white, int(chain.get("white", 255)))
+            mix = chain.get("mix")
+            if not (isinstance(mix, list) and len(mix) == 3 and all(len(row) == 3 for row in mix)):
+                mix = [[1.0 if row == col else 0.0 for col in range(3)] for row in range(3)]
+            for boxes, values in zip(self.mix_boxes, mix):
+                for box, value in zip(boxes, values):
+                    old = box.blockSignals(True)
+                    box.setValue(float(value))
+                    box.blockSignals(old)
         self._set_slider_value(self.fps_slider, int(settings.get("fps", self.fps_slider.value())))
         self._set_slider_value(self.scale_slider, int(settings.get("scale", self.scale_slider.value())))
 
         self._set_checked(self.fast_checkbox, settings.get("performance", self.fast_checkbox.isChecked()))
+        self._set_combo_data(self.downscale_combo, settings.get("downscale"))
         self._set_checked(self.gpu_checkbox, settings.get("gpu", self.gpu_checkbox.isChecked()))
         self._set_checked(self.client_checkbox, settings.get("client_area", self.client_checkbox.isChecked()))
         self._set_checked(self.dxcam_async_checkbox, settings.get("dxcam_async", self.dxcam_async_checkbox.isChecked()))
+        self._set_checked(self.shared_checkbox, settings.get("shared_capture", self.shared_checkbox.isChecked()))
+        self._set_checked(self.adaptive_checkbox, settings.get("adaptive_quality", self.adaptive_checkbox.isChecked()))
+        self._set_spin_value(self.workers_spin, int(settings.get("effects_workers", self.workers_spin.value())))
 
         crop = settings.get("crop", {})
         if isinstance(crop, dict):
@@ -748,6 +884,19 @@ class EffectsWindow(QtWidgets.QWidget):
         contrast = self.contrast_slider.value() / 100.0
         self.effects_changed.emit(brightness, contrast)
 
+    def _effects_chain_params(self) -> dict:
+        return {
+            "gamma": self.gamma_slider.value() / 100.0,
+            "saturation": self.saturation_slider.value() / 100.0,
+            "hue": float(self.hue_slider.value()),
+            "black": self.levels_black.value(),
+            "white": self.levels_white.value(),
+            "mix": [[box.value() for box in row] for row in self.mix_boxes],
+        }
+
+    def _emit_effects_chain(self) -> None:
+        self.effects_chain_changed.emit(self._effects_chain_params())
+
     def _update_fps_value(self) -> None:
         self.fps_value.setText(str(self.fps_slider.value()))
 
@@ -765,6 +914,11 @@ class EffectsWindow(QtWidgets.QWidget):
     def _emit_perf(self) -> None:
         self.perf_changed.emit(self.fast_checkbox.isChecked())
 
+    def _emit_downscale(self) -> None:
+        mode = self.downscale_combo.currentData()
+        if mode:
+            self.downscale_changed.emit(mode)
+
     def _emit_gpu(self) -> None:
         self.gpu_changed.emit(self.gpu_checkbox.isChecked())
 
@@ -774,6 +928,15 @@ class EffectsWindow(QtWidgets.QWidget):
     def _emit_dxcam_async(self) -> None:
         self.dxcam_async_changed.emit(self.dxcam_async_checkbox.isChecked())
 
+    def _emit_shared_capture(self) -> None:
+        self.shared_capture_changed.emit(self.shared_checkbox.isChecked())
+
+    def _emit_adaptive_quality(self) -> None:
+        self.adaptive_quality_changed.emit(self.adaptive_checkbox.isChecked())
+
+    def _emit_effects_workers(self) -> None:
+        self.effects_workers_changed.emit(self.workers_spin.value())
+
     def _emit_blob(self) -> None:
         params = {
             "enabled": self.blob_group.isChecked(),
@@ -839,4 +1002,74 @@ class EffectsWindow(QtWidgets.QWidget):
     def set_actual_fps(self, fps: float) -> None:
         text = f"{fps:.1f}"
         self.fps_actual.setText(text)
-        self.fps_badge.setText(f"FPS: {text}")
+        self._fps_text = text
+        self._update_fps_badge()
+
+    @QtCore.pyqtSlot(int, int)
+    def set_change_stats(self, unchanged: int, changed: int) -> None:
+        total = unchanged + changed
+        if total <= 0:
+            self._change_text = ""
+        else:
+            self._change_text = f"inchangees {unchanged}/{total}"
+        self._update_fps_badge()
+
+    def _update_fps_badge(self) -> None:
+        text = f"FPS: {self._fps_text}"
+        if self._change_text:
+            text = f"{text} | {self._change_text}"
+        if self._latency_text:
+            text = f"{text} | {self._latency_text}"
+        self.fps_badge.setText(text)
+
+    @QtCore.pyqtSlot(dict)
+    def set_frame_timing(self, stats: dict) -> None:
+        self.frame_timing.setText(
+            f"moy {stats.get('mean_ms', 0.0):.1f} ms | ecart-type {stats.get('std_ms', 0.0):.1f} ms | "
+            f"max {stats.get('max_ms', 0.0):.1f} ms | manquees {stats.get('missed', 0)} | "
+            f"alloc. tampons {stats.get('buffer_allocs', 0)}"
+        )
+
+    @QtCore.pyqtSlot(str)
+    def set_quality_status(self, text: str) -> None:
+        self.quality_status.setText(text or "--")
+
+    @QtCore.pyqtSlot(dict)
+    def set_latency_stats(self, stats: dict) -> None:
+        if not stats:
+            self.latency_stats.setText("--")
+            self._latency_text = ""
+        else:
+            self.latency_stats.setText(
+                " | ".join(f"{stage} {p50:.1f}/{p95:.1f}/{p99:.1f}" for stage, (p50, p95, p99) in stats.items())
+            )
+            total = stats.get("total")
+            self._latency_text = f"lat {total[0]:.0f}/{total[1]:.0f}/{total[2]:.0f} ms" if total else ""
+        self._update_fps_badge()
+
+    @QtCore.pyqtSlot(dict)
+    def set_capture_stats(self, stats: dict) -> None:
+        self.capture_stats.setText(
+            f"capturees {stats.get('produced', 0):.0f} | affichees {stats.get('consumed', 0):.0f} | "
+            f"ecrasees {stats.get('overwritten', 0):.0f} | perdues {stats.get('dropped', 0):.0f} | "
+            f"doublons {stats.get('stale', 0):.0f} | pool plein {stats.get('pool_drops', 0):.0f} | "
+            f"allocs pool {stats.get('pool_allocations', 0):.0f}"
+        )
+
+    @QtCore.pyqtSlot(list)
+    def set_capture_probe(self, results: list) -> None:
+        if not results:
+            self.capture_probe.setText("aucun backend utilisable")
+            return
+        parts = []
+        for result in results:
+            text = (
+                f"{result['name'].upper()} {result['latency_ms']:.1f} ms, "
+                f"age {result['age_ms']:.1f} ms, echecs {result['failure_rate']:.0%}"
+            )
+            if result["active"]:
+                text = f"[{text}]"
+            elif not result["usable"]:
+                text = f"{text} (ecarte)"
+            parts.append(text)
+        self.capture_probe.setText(" | ".join(parts))
@@ -0,0 +1,112 @@
+import math
+import time
+from typing import Dict
+
+from PyQt5 import QtCore
+
+
+class FrameScheduler(QtCore.QObject):
+    """Emits ``tick`` on absolute deadlines ``start + n / fps``.
+
+    Each tick re-arms a single-shot timer for the next deadline, so the time
+    spent handling a tick does not push the cadence back. Deadlines missed by
+    half a period or more are skipped (and counted) rather than fired in a
+    burst.
+    """
+
+    tick = QtCore.pyqtSignal()
+
+    def __init__(self, fps: int = 30, parent=None, window: int = 240):
+        super().__init__(parent)
+        self._period = 1.0 / max(1, fps)
+        self._deadline = 0.0
+        self._running = False
+        self._last_tick = None
+        self._window = max(2, int(window))
+        self._intervals = []
+        self._busy = []
+        self._sample_idx = 0
+        self._missed = 0
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def set_fps(self, fps: int) -> None:
+        self._period = 1.0 / max(1, fps)
+        if self._running:
+            # Restart the grid from now so a lower fps does not wait on an
+            # old, far deadline.
+            self._deadline = time.perf_counter() + self._period
+            self._arm()
+
+    def start(self) -> None:
+        self._running = True
+        self._last_tick = None
+        self._deadline = time.perf_counter()
+        self._arm()
+
+    def stop(self) -> None:
+        self._running = False
+        self._timer.stop()
+
+    def stats(self) -> Dict[str, float]:
+        """Frame-time mean / std dev / max in ms over the window, the p95 time
+        spent in tick handlers (``busy_p95_ms``) and missed slots since last call."""
+        intervals = self._intervals
+        missed, self._missed = self._missed, 0
+        if not intervals:
+            return {"mean_ms": 0.0, "std_ms": 0.0, "max_ms": 0.0, "busy_p95_ms": 0.0, "missed": missed}
+        mean = sum(intervals) / len(intervals)
+        var = sum((value - mean) ** 2 for value in intervals) / len(intervals)
+        busy = sorted(self._busy)
+        return {
+            "mean_ms": mean * 1000.0,
+            "std_ms": math.sqrt(var) * 1000.0,
+            "max_ms": max(intervals) * 1000.0,
+            "busy_p95_ms": busy[int(0.95 * (len(busy) - 1))] * 1000.0 if busy else 0.0,
+            "missed": missed,
+        }
+
+    def reset_stats(self) -> None:
+        self._intervals = []
+        self._busy = []
+        self._sample_idx = 0
+        self._last_tick = None
+
+    def _on_timeout(self) -> None:
+        if not self._running:
+            return
+        now = time.perf_counter()
+        last_tick, self._last_tick = self._last_tick, now
+        self.tick.emit()
+        if not self._running:
+            return
+        done = time.perf_counter()
+        if last_tick is not None:
+            self._record(now - last_tick, done - now)
+        period = self._period
+        self._deadline += period
+        now = done
+        behind = now - self._deadline
+        if behind >= period * 0.5:
+            # Too late for this slot: drop it (and any other missed one)
+            # and wait for the next slot on the grid. Slightly late slots
+            # still fire right away.
+            missed = int(behind / period) + 1
+            self._missed += missed
+            self._deadline += missed * period
+        self._arm()
+
+    def _arm(self) -> None:
+        delay_ms = max(0, int(round((self._deadline - time.perf_counter()) * 1000.0)))
+        self._timer.start(delay_ms)
+
+    def _record(self, interval: float, busy: float) -> None:
+        if len(self._intervals) < self._window:
+            self._intervals.append(interval)
+            self._busy.append(busy)
+        else:
+            self._intervals[self._sample_idx] = interval
+            self._busy[self._sample_idx] = busy
+            self._sample_idx = (self._sample_idx + 1) % self._window
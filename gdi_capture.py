@@ -0,0 +1,130 @@
+import ctypes
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+GDI_AVAILABLE = sys.platform == "win32" and hasattr(ctypes, "WinDLL") and np is not None
+
+SRCCOPY = 0x00CC0020
+CAPTUREBLT = 0x40000000
+DIB_RGB_COLORS = 0
+
+
+if GDI_AVAILABLE:
+    from ctypes import wintypes
+
+    class BITMAPINFOHEADER(ctypes.Structure):
+        _fields_ = [
+            ("biSize", wintypes.DWORD),
+            ("biWidth", wintypes.LONG),
+            ("biHeight", wintypes.LONG),
+            ("biPlanes", wintypes.WORD),
+            ("biBitCount", wintypes.WORD),
+            ("biCompression", wintypes.DWORD),
+            ("biSizeImage", wintypes.DWORD),
+            ("biXPelsPerMeter", wintypes.LONG),
+            ("biYPelsPerMeter", wintypes.LONG),
+            ("biClrUsed", wintypes.DWORD),
+            ("biClrImportant", wintypes.DWORD),
+        ]
+
+    class BITMAPINFO(ctypes.Structure):
+        _fields_ = [("bmiHeader", BITMAPINFOHEADER), ("bmiColors", wintypes.DWORD * 3)]
+
+
+class GdiGrabber:
+    """BitBlt + GetDIBits straight into a caller-provided BGRA ndarray.
+
+    This is the same GDI sequence mss runs, minus the copy of its internal
+    buffer into a new ``bytearray`` on every grab. The handles belong to the
+    thread that created the grabber; use and close it from that thread.
+    """
+
+    def __init__(self):
+        user32 = ctypes.WinDLL("user32")
+        gdi32 = ctypes.WinDLL("gdi32")
+        user32.GetWindowDC.argtypes = [wintypes.HWND]
+        user32.GetWindowDC.restype = wintypes.HDC
+        user32.ReleaseDC.argtypes = [wintypes.HWND, wintypes.HDC]
+        gdi32.CreateCompatibleDC.argtypes = [wintypes.HDC]
+        gdi32.CreateCompatibleDC.restype = wintypes.HDC
+        gdi32.CreateCompatibleBitmap.argtypes = [wintypes.HDC, ctypes.c_int, ctypes.c_int]
+        gdi32.CreateCompatibleBitmap.restype = wintypes.HBITMAP
+        gdi32.SelectObject.argtypes = [wintypes.HDC, wintypes.HGDIOBJ]
+        gdi32.SelectObject.restype = wintypes.HGDIOBJ
+        gdi32.DeleteObject.argtypes = [wintypes.HGDIOBJ]
+        gdi32.DeleteDC.argtypes = [wintypes.HDC]
+        gdi32.BitBlt.argtypes = [
+            wintypes.HDC,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            wintypes.HDC,
+            ctypes.c_int,
+            ctypes.c_int,
+            wintypes.DWORD,
+        ]
+        gdi32.BitBlt.restype = wintypes.BOOL
+        gdi32.GetDIBits.argtypes = [
+            wintypes.HDC,
+            wintypes.HBITMAP,
+            wintypes.UINT,
+            wintypes.UINT,
+            ctypes.c_void_p,
+            ctypes.POINTER(BITMAPINFO),
+            wintypes.UINT,
+        ]
+        gdi32.GetDIBits.restype = ctypes.c_int
+        self._user32 = user32
+        self._gdi32 = gdi32
+        self._srcdc = user32.GetWindowDC(0)
+        self._memdc = gdi32.CreateCompatibleDC(self._srcdc)
+        self._bmp = None
+        self._size = (0, 0)
+        bmi = BITMAPINFO()
+        bmi.bmiHeader.biSize = ctypes.sizeof(BITMAPINFOHEADER)
+        bmi.bmiHeader.biPlanes = 1
+        bmi.bmiHeader.biBitCount = 32
+        bmi.bmiHeader.biCompression = 0  # BI_RGB
+        self._bmi = bmi
+
+    def grab_into(self, left: int, top: int, out) -> bool:
+        """Fill ``out`` (C-contiguous uint8, shape (h, w, 4)) from the screen at (left, top)."""
+        height, width = out.shape[0], out.shape[1]
+        gdi32 = self._gdi32
+        if self._size != (width, height):
+            if self._bmp:
+                gdi32.DeleteObject(self._bmp)
+            self._bmp = gdi32.CreateCompatibleBitmap(self._srcdc, width, height)
+            gdi32.SelectObject(self._memdc, self._bmp)
+            self._bmi.bmiHeader.biWidth = width
+            self._bmi.bmiHeader.biHeight = -height  # top-down rows
+            self._size = (width, height)
+        if not gdi32.BitBlt(self._memdc, 0, 0, width, height, self._srcdc, left, top, SRCCOPY | CAPTUREBLT):
+            return False
+        lines = gdi32.GetDIBits(
+            self._memdc,
+            self._bmp,
+            0,
+            height,
+            out.ctypes.data_as(ctypes.c_void_p),
+            ctypes.byref(self._bmi),
+            DIB_RGB_COLORS,
+        )
+        return lines == height
+
+    def close(self) -> None:
+        if self._bmp:
+            self._gdi32.DeleteObject(self._bmp)
+            self._bmp = None
+        if self._memdc:
+            self._gdi32.DeleteDC(self._memdc)
+            self._memdc = None
+        if self._srcdc:
+            self._user32.ReleaseDC(0, self._srcdc)
+            self._srcdc = None
@@ -3,6 +3,8 @@ from typing import Optional
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
+from effects_chain import EffectsChain, rgb_matrix
+
 try:
     from PyQt5.QtGui import QOpenGLFunctions
 except Exception:  # pragma: no cover - fallback for older PyQt5
@@ -49,15 +51,20 @@ void main() {
 FRAG_SRC = """
 #version 120
 uniform sampler2D u_texture;
+uniform mat4 u_color;
+uniform vec2 u_levels;
+uniform float u_inv_gamma;
 uniform float u_brightness;
 uniform float u_contrast;
 varying vec2 v_uv;
 void main() {
     vec4 color = texture2D(u_texture, v_uv);
-    color.rgb = (color.rgb - 0.5) * u_contrast + 0.5;
-    color.rgb *= u_brightness;
-    color.rgb = clamp(color.rgb, 0.0, 1.0);
-    gl_FragColor = vec4(color.rgb, 1.0);
+    vec3 rgb = clamp((u_color * vec4(color.rgb, 1.0)).rgb, 0.0, 1.0);
+    rgb = clamp((rgb - u_levels.x) / (u_levels.y - u_levels.x), 0.0, 1.0);
+    rgb = pow(rgb, vec3(u_inv_gamma));
+    rgb = (rgb - 0.5) * u_contrast + 0.5;
+    rgb *= u_brightness;
+    gl_FragColor = vec4(clamp(rgb, 0.0, 1.0), 1.0);
 }
 """
 
@@ -79,13 +86,15 @@ if GL_AVAILABLE:
             self._frame_data: Optional[bytes] = None
             self._frame_w = 0
             self._frame_h = 0
-            self._brightness = 1.0
-            self._contrast = 1.0
+            self._chain = EffectsChain()
+            self._color_matrix = QtGui.QMatrix4x4()
             self._fast_mode = False
 
-        def set_effects(self, brightness: float, contrast: float) -> None:
-            self._brightness = brightness
-            self._contrast = contrast
+        def set_effects_chain(self, chain: EffectsChain) -> None:
+            self._chain = chain
+            rows = rgb_matrix(chain)
+            values = [v for row in rows for v in (row[0], row[1], row[2], row[3] / 255.0)]
+            self._color_matrix = QtGui.QMatrix4x4(*values, 0.0, 0.0, 0.0, 1.0)
             self.update()
 
         def set_fast_mode(self, enabled: bool) -> None:
@@ -181,8 +190,12 @@ if GL_AVAILABLE:
 
             self._program.bind()
             self._program.setUniformValue("u_texture", 0)
-            self._program.setUniformValue("u_brightness", float(self._brightness))
-            self._program.setUniformValue("u_contrast", float(self._contrast))
+            chain = self._chain
+            self._program.setUniformValue("u_color", self._color_matrix)
+            self._program.setUniformValue("u_levels", QtGui.QVector2D(chain.black / 255.0, chain.white / 255.0))
+            self._program.setUniformValue("u_inv_gamma", float(1.0 / chain.gamma))
+            self._program.setUniformValue("u_brightness", float(chain.brightness))
+            self._program.setUniformValue("u_contrast", float(chain.contrast))
 
             self._vao.bind()
             self._gl.glDrawArrays(GL_TRIANGLE_STRIP, 0, 4)
@@ -264,7 +277,7 @@ else:
             self.setAlignment(QtCore.Qt.AlignCenter)
             self.setText("OpenGL indisponible")
 
-        def set_effects(self, brightness: float, contrast: float) -> None:
+        def set_effects_chain(self, chain: EffectsChain) -> None:
             return None
 
         def set_fast_mode(self, enabled: bool) -> None:
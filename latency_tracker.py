@@ -0,0 +1,65 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Display order. Each stage is the time since the previous mark of the same
+# frame ("capture" is capture -> picked up by the UI thread); "blob" is the
+# worker time of an asynchronous blob pass and "total" is capture -> present.
+LATENCY_STAGES = ("capture", "blob_submit", "convert", "effects", "present", "blob", "total")
+
+
+class FrameTimeline:
+    """Timestamps of one frame through the pipeline (``time.perf_counter``)."""
+
+    __slots__ = ("start", "last", "stages")
+
+    def __init__(self, start: float):
+        self.start = start
+        self.last = start
+        self.stages: List[Tuple[str, float]] = []
+
+    def mark(self, stage: str, now: Optional[float] = None) -> None:
+        now = time.perf_counter() if now is None else now
+        self.stages.append((stage, now - self.last))
+        self.last = now
+
+
+class LatencyTracker:
+    """Fixed-size ring buffer of per-stage durations with percentile readout."""
+
+    def __init__(self, capacity: int = 512):
+        self._capacity = max(1, int(capacity))
+        self._samples: Dict[str, List[float]] = {}
+        self._next: Dict[str, int] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples[stage] = []
+            self._next[stage] = 0
+        if len(samples) < self._capacity:
+            samples.append(seconds)
+        else:
+            idx = self._next[stage]
+            samples[idx] = seconds
+            self._next[stage] = (idx + 1) % self._capacity
+
+    def record(self, timeline: FrameTimeline) -> None:
+        for stage, seconds in timeline.stages:
+            self.add(stage, seconds)
+        self.add("total", timeline.last - timeline.start)
+
+    def percentiles(self, points=(50, 95, 99)) -> Dict[str, Tuple[float, ...]]:
+        """{stage: (p50, p95, p99)} in milliseconds, for stages with samples."""
+        result = {}
+        for stage in LATENCY_STAGES + tuple(s for s in self._samples if s not in LATENCY_STAGES):
+            samples = self._samples.get(stage)
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            last = len(ordered) - 1
+            result[stage] = tuple(ordered[min(last, int(round(p / 100.0 * last)))] * 1000.0 for p in points)
+        return result
+
+    def clear(self) -> None:
+        self._samples.clear()
+        self._next.clear()
@@ -0,0 +1,151 @@
+from typing import Dict, List, NamedTuple, Optional
+
+from logger_utils import get_logger
+
+
+class QualityKnob(NamedTuple):
+    name: str
+    label: str
+    step: int
+    minimum: int
+
+
+# Steps are in the knob's own unit (percent or fps); ``minimum`` is the floor
+# the controller never goes below (or the user's value, if that is lower).
+KNOBS = {
+    "scale": QualityKnob("scale", "echelle", 10, 40),
+    "blob_scale": QualityKnob("blob_scale", "blob echelle", 10, 20),
+    "blob_fps": QualityKnob("blob_fps", "blob fps", 5, 5),
+}
+
+
+class QualityDecision(NamedTuple):
+    knob: str
+    direction: int  # -1 lowered, +1 raised
+    reason: str
+
+
+class QualityController:
+    """Lowers/raises quality knobs one step at a time to hold a frame-time budget.
+
+    Knob values are expressed as a number of steps below the user's setting,
+    so the user's value is always the ceiling. Hysteresis: a step down needs
+    ``over_evals`` consecutive over-budget evaluations (busy p95 above
+    ``high`` x budget, or the blob worker slower than its own rate), a step
+    back up needs ``under_evals`` consecutive ones below ``low`` x budget, and
+    nothing changes within ``cooldown`` evaluations of the last change.
+    """
+
+    def __init__(
+        self,
+        high: float = 0.9,
+        low: float = 0.6,
+        over_evals: int = 2,
+        under_evals: int = 4,
+        cooldown: int = 3,
+    ):
+        self._high = high
+        self._low = low
+        self._over_evals = over_evals
+        self._under_evals = under_evals
+        self._cooldown = cooldown
+        self._levels: Dict[str, int] = {name: 0 for name in KNOBS}
+        self._history: List[str] = []
+        self._over = 0
+        self._under = 0
+        self._since_change = cooldown
+        self._log = get_logger()
+
+    def reset(self) -> None:
+        self._levels = {name: 0 for name in KNOBS}
+        self._history = []
+        self._over = 0
+        self._under = 0
+        self._since_change = self._cooldown
+
+    def value(self, knob: str, user_value: int) -> int:
+        spec = KNOBS[knob]
+        lowered = user_value - self._levels[knob] * spec.step
+        return max(min(spec.minimum, user_value), lowered)
+
+    def evaluate(
+        self,
+        target_fps: int,
+        busy_p95_ms: float,
+        missed: int,
+        blob_ms: Optional[float],
+        blob_interval_ms: Optional[float],
+        user_values: Dict[str, int],
+    ) -> Optional[QualityDecision]:
+        """Feed one second of measurements; returns the change made, if any."""
+        budget = 1000.0 / max(1, target_fps)
+        blob_over = blob_ms is not None and blob_interval_ms is not None and blob_ms > blob_interval_ms
+        display_over = busy_p95_ms > budget * self._high or missed > max(1, target_fps // 20)
+        headroom = busy_p95_ms < budget * self._low and missed == 0 and not blob_over
+
+        self._since_change += 1
+        if display_over or blob_over:
+            self._over += 1
+            self._under = 0
+        elif headroom:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = 0
+            self._under = 0
+        if self._since_change < self._cooldown:
+            return None
+
+        if self._over >= self._over_evals:
+            if blob_over and not display_over:
+                reason = f"blob {blob_ms:.0f} ms > {blob_interval_ms:.0f} ms"
+            else:
+                reason = f"frame {busy_p95_ms:.1f} ms > {budget:.1f} ms"
+            if blob_over or (blob_ms is not None and blob_ms > busy_p95_ms):
+                # The blob worker is the dominant cost (and competes for the
+                # GIL): shrink it before the display.
+                order = ("blob_scale", "blob_fps", "scale")
+            else:
+                order = ("scale", "blob_scale", "blob_fps")
+            for knob in order:
+                if self._can_lower(knob, user_values.get(knob)):
+                    return self._change(knob, -1, reason)
+            return None
+
+        if self._under >= self._under_evals and self._history:
+            knob = self._history[-1]
+            return self._change(knob, +1, f"frame {busy_p95_ms:.1f} ms < {budget * self._low:.1f} ms")
+        return None
+
+    def describe(self, user_values: Dict[str, int]) -> str:
+        parts = []
+        for name, spec in KNOBS.items():
+            if name in user_values and self._levels[name]:
+                parts.append(f"{spec.label} {self.value(name, user_values[name])}")
+        return ", ".join(parts) if parts else "pleine qualite"
+
+    def _can_lower(self, knob: str, user_value: Optional[int]) -> bool:
+        if user_value is None:
+            return False
+        spec = KNOBS[knob]
+        return self.value(knob, user_value) - spec.step >= min(spec.minimum, user_value)
+
+    def _change(self, knob: str, direction: int, reason: str) -> QualityDecision:
+        if direction < 0:
+            self._levels[knob] += 1
+            self._history.append(knob)
+        else:
+            self._levels[knob] -= 1
+            self._history.pop()
+        self._over = 0
+        self._under = 0
+        self._since_change = 0
+        decision = QualityDecision(knob, direction, reason)
+        self._log.info(
+            "adaptive quality: %s %s (%s)",
+            "lower" if direction < 0 else "raise",
+            KNOBS[knob].label,
+            reason,
+        )
+        return decision
+
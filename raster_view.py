@@ -0,0 +1,91 @@
+from typing import Callable, Optional, Tuple
+
+from PyQt5 import QtCore, QtGui, QtWidgets, sip
+
+
+def qimage_from_array(arr) -> Optional[QtGui.QImage]:
+    """QImage over a uint8 BGRA / BGR / grayscale array's memory, without a copy.
+
+    The real row stride is passed, so crops and other views with packed
+    pixels work as is. The array is attached to the returned wrapper and
+    lives as long as it does. None for layouts Qt cannot address.
+    """
+    if arr.dtype.itemsize != 1 or arr.ndim not in (2, 3):
+        return None
+    channels = arr.shape[2] if arr.ndim == 3 else 1
+    formats = {4: QtGui.QImage.Format_ARGB32, 3: QtGui.QImage.Format_BGR888, 1: QtGui.QImage.Format_Grayscale8}
+    fmt = formats.get(channels)
+    if fmt is None or arr.strides[1] != channels or arr.strides[0] <= 0:
+        return None
+    if arr.ndim == 3 and arr.strides[2] != 1:
+        return None
+    if channels == 4 and (arr.strides[0] % 4 or arr.ctypes.data % 4):
+        return None
+    image = QtGui.QImage(sip.voidptr(arr.ctypes.data), arr.shape[1], arr.shape[0], arr.strides[0], fmt)
+    image.keepalive = arr
+    return image
+
+
+FitFn = Callable[[int, int, int, int], Tuple[int, int, int, int]]
+OverlayFn = Callable[[QtGui.QPainter, int, int, int, int], None]
+
+
+class RasterFrameView(QtWidgets.QWidget):
+    """CPU present path: paints the frame QImage into its letterboxed rect.
+
+    The image is scaled by the paint itself, straight into the backing
+    store, and the overlay callback draws on top in the same pass, so no
+    QPixmap or pre-scaled copy of the frame is made. The image may wrap
+    caller memory (see :func:`qimage_from_array`): the caller must not
+    write into it, or hand it back to a pool, while it is shown.
+    """
+
+    def __init__(self, fit: FitFn, parent=None):
+        super().__init__(parent)
+        self.setAttribute(QtCore.Qt.WA_OpaquePaintEvent, True)
+        self.setMinimumSize(1, 1)
+        self._fit = fit
+        self._image = None
+        self._text = ""
+        self._smooth = True
+        self._overlay = None
+
+    def setText(self, text: str) -> None:
+        # Same contract as QLabel.setText: text replaces the frame.
+        self._text = text
+        self._image = None
+        self.update()
+
+    def set_frame(self, image: Optional[QtGui.QImage]) -> None:
+        self._image = image
+        self._text = ""
+        self.update()
+
+    def set_smooth(self, enabled: bool) -> None:
+        self._smooth = bool(enabled)
+        self.update()
+
+    def set_overlay_painter(self, fn: Optional[OverlayFn]) -> None:
+        self._overlay = fn
+        self.update()
+
+    def target_rect(self) -> Tuple[int, int, int, int]:
+        if self._image is None:
+            return 0, 0, self.width(), self.height()
+        return self._fit(self._image.width(), self._image.height(), self.width(), self.height())
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        painter = QtGui.QPainter(self)
+        painter.fillRect(self.rect(), self.palette().window())
+        if self._image is None:
+            if self._text:
+                painter.drawText(self.rect(), QtCore.Qt.AlignCenter | QtCore.Qt.TextWordWrap, self._text)
+            painter.end()
+            return
+        off_x, off_y, disp_w, disp_h = self.target_rect()
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform, self._smooth)
+        painter.drawImage(QtCore.QRect(off_x, off_y, disp_w, disp_h), self._image)
+        if self._overlay is not None:
+            painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform, False)
+            self._overlay(painter, off_x, off_y, disp_w, disp_h)
+        painter.end()
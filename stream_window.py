@@ -1,22 +1,44 @@
 import time
 import threading
 from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
+from typing import Optional, Tuple
 
-import mss
-from PIL import Image, ImageEnhance
-import win32api
-import win32gui
+from PIL import Image
 from PyQt5 import QtCore, QtGui, QtWidgets
 
+from backend_calibrator import BackendCalibrator
+from capture_sources import (
+    DXCAM_AVAILABLE,
+    AutoCaptureSource,
+    CaptureSource,
+    CapturedFrame,
+    DxcamCaptureSource,
+    capture_source_available,
+    create_capture_source,
+    release_thread_capture_resources,
+)
+from capture_hub import CAPTURE_HUB_AVAILABLE, SHARED_BACKENDS, SharedCaptureSource
+from capture_thread import CaptureThread, FrameMailbox, MailboxStats
+from change_detector import FrameChangeDetector
+from circuit_breaker import CircuitBreaker
+from effects_chain import EffectsChain, effects_table, rgb_matrix
+from cpu_effects import (
+    NUMBA_AVAILABLE,
+    BandRunner,
+    MipPyramid,
+    OutputBuffers,
+    ResizePlanCache,
+    apply_chain,
+    apply_chain_cv2,
+    resize_chain_numba,
+)
+from frame_scheduler import FrameScheduler
 from gl_view import GLFrameView, GL_AVAILABLE
-from wgc_capture import WGCCapture, WGC_AVAILABLE
+from latency_tracker import FrameTimeline, LatencyTracker
 from logger_utils import get_logger
-
-try:
-    import dxcam
-except ImportError:  # pragma: no cover - optional dependency
-    dxcam = None
+from quality_controller import KNOBS, QualityController
+from raster_view import RasterFrameView, qimage_from_array
+from window_geometry import WindowGeometryTracker
 
 try:
     import numpy as np
@@ -29,22 +51,38 @@ except ImportError:  # pragma: no cover - optional dependency
     cv2 = None
 
 
-DXCAM_AVAILABLE = dxcam is not None
 NUMPY_AVAILABLE = np is not None
 OPENCV_AVAILABLE = cv2 is not None
 
 
 class StreamWindow(QtWidgets.QMainWindow):
     fps_updated = QtCore.pyqtSignal(float)
-
-    def __init__(self, hwnd: int):
+    capture_stats_updated = QtCore.pyqtSignal(dict)
+    change_stats_updated = QtCore.pyqtSignal(int, int)  # unchanged, changed per second
+    capture_probe_updated = QtCore.pyqtSignal(list)
+    latency_updated = QtCore.pyqtSignal(dict)  # stage -> (p50, p95, p99) ms
+    frame_timing_updated = QtCore.pyqtSignal(dict)
+    quality_changed = QtCore.pyqtSignal(str)
+    status_changed = QtCore.pyqtSignal(str)
+
+    def __init__(self, hwnd: int, calibrator: Optional[BackendCalibrator] = None):
         super().__init__()
         self.hwnd = hwnd
+        self._geometry = WindowGeometryTracker(hwnd)
+        self._geometry.watch_events()
+        # Monitor layout and DPI changes move the window without any
+        # window event: re-read its geometry then.
+        app = QtGui.QGuiApplication.instance()
+        app.screenAdded.connect(self._on_screen_added)
+        app.screenRemoved.connect(self._on_screens_changed)
+        for screen in app.screens():
+            screen.geometryChanged.connect(self._on_screens_changed)
         self.setWindowTitle("Flux de la fenetre")
         self.setMinimumSize(640, 360)
 
-        self.label = QtWidgets.QLabel(alignment=QtCore.Qt.AlignCenter)
-        self.label.setText("Initialisation du flux...")
+        self._raster = RasterFrameView(self._fit_viewport)
+        self._raster.setText("Initialisation du flux...")
+        self._raster.set_overlay_painter(self._paint_raster_overlay)
         self._gl_view = GLFrameView()
         self._overlay = QtWidgets.QLabel(alignment=QtCore.Qt.AlignCenter)
         self._overlay.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents, True)
@@ -58,31 +96,35 @@ class StreamWindow(QtWidgets.QMainWindow):
         gpu_layout.addWidget(self._overlay, 0, 0)
         self._gpu_container.setLayout(gpu_layout)
         self._stack = QtWidgets.QStackedWidget()
-        self._stack.addWidget(self.label)
+        self._stack.addWidget(self._raster)
         self._stack.addWidget(self._gpu_container)
-        self._stack.setCurrentWidget(self.label)
+        self._stack.setCurrentWidget(self._raster)
         self.setCentralWidget(self._stack)
 
-        self._brightness = 1.0
-        self._contrast = 1.0
+        self._effects_chain = EffectsChain()
         self._borderless = False
-        self._sct = mss.mss()
-        self._dxcam = None
+        self._sources = {}
+        self._source_options = {}
+        self._source_lock = threading.Lock()
+        self._breakers = {}
+        self._probe_version = 0
+        self._shared_capture = False
+        self._mailbox = FrameMailbox()
+        self._mailbox_last = self._mailbox.stats()
+        self._capture_counters_last = {}
+        self._capture_thread = None
+        self._capture_threaded = True
         self._capture_backend = "mss"
         self._effects_backend = "numpy" if NUMPY_AVAILABLE else "pillow"
+        self._calibrator = calibrator if calibrator is not None else BackendCalibrator()
+        self._auto_backend = None
         self._scale_percent = 100
         self._fast_mode = False
+        self._downscale_mode = "nearest"
         self._use_gpu = False
         self._gpu_available = GL_AVAILABLE
         self._capture_client = False
         self._dxcam_async = False
-        self._dxcam_started = False
-        self._dxcam_region = None
-        self._dxcam_output_idx = None
-        self._dxcam_output_rect = None
-        self._dxcam_last_error = 0.0
-        self._wgc = WGCCapture(hwnd) if WGC_AVAILABLE else None
-        self._wgc_started = False
         self._auto_foreground_fallback = True
         self._fallback_last_log = 0.0
         self._crop_left = 0
@@ -132,50 +174,136 @@ class StreamWindow(QtWidgets.QMainWindow):
         self._blob_overlay_params = None
         self._blob_executor = ThreadPoolExecutor(max_workers=1)
         self._blob_future = None
-        self._blob_pending = None
         self._blob_lock = threading.Lock()
         self._blob_reset = False
+        # User settings for the knobs the adaptive quality controller may lower.
+        self._quality = None
+        self._quality_user = {"scale": 100, "blob_scale": 50, "blob_fps": 15}
+
+        self._presented_seq = None
+        self._presented_blob_id = 0
+        self._frame_image = None
+        self._frame_lease = None
+        self._frame_size = (0, 0)
+        self._change_detector = FrameChangeDetector()
+        self._latency = LatencyTracker()
+        # Two sets: the raster view paints straight from the last output
+        # buffer, so the next frame is always written into the other set.
+        self._effects_buffer_sets = (OutputBuffers(), OutputBuffers())
+        self._effects_buffers = self._effects_buffer_sets[0]
+        self._shown_buffers = None
+        self._effects_allocations = 0
+        self._effects_bands = BandRunner(1)
+        self._band_scratch = [OutputBuffers()]
+        self._resize_plans = ResizePlanCache()
+        # Box-filtered levels of the frame being processed (box downscale mode).
+        self._pyramid = MipPyramid()
+        # Used from the blob worker thread only.
+        self._blob_resize_plans = ResizePlanCache()
+        self._blob_buffers = OutputBuffers(max_shapes=1)
+        self._blob_pyramid = MipPyramid()
+        self._timeline = None
+        self._gl_timeline = None
 
         self._target_fps = 30
         self._frame_count = 0
         self._fps_last = time.perf_counter()
         self._log = get_logger()
+        self.status_changed.connect(self._raster.setText)
+        if GL_AVAILABLE:
+            self._gl_view.frameSwapped.connect(self._on_gl_frame_swapped)
 
-        self.timer = QtCore.QTimer(self)
-        self.timer.timeout.connect(self.update_frame)
-        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.scheduler = FrameScheduler(self._target_fps, self)
+        self.scheduler.tick.connect(self.update_frame)
         self.set_target_fps(self._target_fps)
-        self.timer.start()
+        self.scheduler.start()
+        self._start_capture_thread()
+
+    def _on_screen_added(self, screen: QtGui.QScreen) -> None:
+        screen.geometryChanged.connect(self._on_screens_changed)
+        self._geometry.invalidate()
+
+    def _on_screens_changed(self, *args) -> None:
+        self._geometry.invalidate()
 
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
-        self.timer.stop()
-        self._stop_dxcam()
-        self._stop_wgc()
+        self.scheduler.stop()
+        self._stop_capture_thread()
+        with self._source_lock:
+            for name in list(self._sources):
+                self._stop_capture_source(name)
+        self._geometry.close()
         self._blob_executor.shutdown(wait=False, cancel_futures=True)
+        self._effects_bands.shutdown()
+        self._raster.set_frame(None)
+        self._hold_frame_lease(None)
         return super().closeEvent(event)
 
     def set_effects(self, brightness: float, contrast: float) -> None:
-        self._brightness = brightness
-        self._contrast = contrast
-        self._gl_view.set_effects(brightness, contrast)
+        self._set_effects_chain(self._effects_chain._replace(brightness=brightness, contrast=contrast))
+
+    def set_effects_chain(self, params: dict) -> None:
+        self._set_effects_chain(EffectsChain.from_dict(params, base=self._effects_chain))
+
+    def _set_effects_chain(self, chain: EffectsChain) -> None:
+        self._effects_chain = chain
+        self._gl_view.set_effects_chain(chain)
+        self._invalidate_presented()
 
     def set_target_fps(self, fps: int) -> None:
         if fps <= 0:
             fps = 1
+        changed = fps != self._target_fps
         self._target_fps = fps
-        interval = max(1, int(1000 / fps))
-        self.timer.setInterval(interval)
-        if self._dxcam_async and self._capture_backend == "dxcam":
-            self._restart_dxcam()
-        if self._capture_backend == "wgc":
-            self._restart_wgc()
+        self.scheduler.set_fps(fps)
+        if self._capture_thread is not None:
+            self._capture_thread.set_fps(fps)
+        with self._source_lock:
+            source = self._sources.get(self._capture_backend)
+            if source is not None and source.is_running():
+                source.start(fps)
+        if changed:
+            self._reset_quality()
 
     def set_scale_percent(self, percent: int) -> None:
-        self._scale_percent = max(10, min(100, int(percent)))
+        self._quality_user["scale"] = max(10, min(100, int(percent)))
+        self._apply_quality()
+        self._invalidate_presented()
+
+    def set_adaptive_quality(self, enabled: bool) -> None:
+        if bool(enabled) == (self._quality is not None):
+            return
+        self._quality = QualityController() if enabled else None
+        self.scheduler.reset_stats()
+        self._apply_quality()
+        self._invalidate_presented()
+        self.quality_changed.emit(self._quality_status() if enabled else "")
+
+    def _reset_quality(self) -> None:
+        # A new source or rate has its own costs: start again from the user's
+        # values instead of carrying the old hysteresis over.
+        if self._quality is None:
+            return
+        self._quality.reset()
+        self.scheduler.reset_stats()
+        self._apply_quality()
+        self._invalidate_presented()
+        self.quality_changed.emit(self._quality_status())
 
     def set_fast_mode(self, enabled: bool) -> None:
         self._fast_mode = bool(enabled)
         self._gl_view.set_fast_mode(enabled)
+        self._raster.set_smooth(not self._fast_mode)
+        self._invalidate_presented()
+
+    def set_downscale_mode(self, mode: str) -> None:
+        mode = mode.lower()
+        if mode not in ("nearest", "box") or mode == self._downscale_mode:
+            return
+        self._downscale_mode = mode
+        self._pyramid.clear()
+        self._blob_reset = True
+        self._invalidate_presented()
 
     def set_gpu_mode(self, enabled: bool) -> None:
         if enabled and not self._gpu_available:
@@ -184,25 +312,32 @@ class StreamWindow(QtWidgets.QMainWindow):
         if self._use_gpu:
             self._stack.setCurrentWidget(self._gpu_container)
         else:
-            self._stack.setCurrentWidget(self.label)
+            self._stack.setCurrentWidget(self._raster)
         self._clear_blob_overlay()
+        self._invalidate_presented()
 
     def set_capture_client_area(self, enabled: bool) -> None:
         self._capture_client = bool(enabled)
+        self._invalidate_presented()
 
     def set_dxcam_async(self, enabled: bool) -> None:
         self._dxcam_async = bool(enabled)
-        if self._capture_backend == "dxcam":
-            if self._dxcam_async:
-                self._restart_dxcam()
-            else:
-                self._stop_dxcam()
+        with self._source_lock:
+            for source in self._sources.values():
+                if isinstance(source, (DxcamCaptureSource, AutoCaptureSource, SharedCaptureSource)):
+                    source.set_async(self._dxcam_async)
 
     def set_blob_params(self, params: dict) -> None:
         self._blob_params.update(params)
+        if "scale" in params:
+            self._quality_user["blob_scale"] = int(params["scale"])
+        if "max_fps" in params:
+            self._quality_user["blob_fps"] = int(params["max_fps"] or 0)
+        self._apply_quality()
         self._blob_reset = True
         self._blob_last_submit = 0.0
         self._blob_overlay_pixmap = None
+        self._invalidate_presented()
         if not self._blob_params.get("enabled"):
             self._blob_prev = None
             self._blob_bg = None
@@ -212,7 +347,6 @@ class StreamWindow(QtWidgets.QMainWindow):
             if self._blob_future and not self._blob_future.done():
                 self._blob_future.cancel()
             self._blob_future = None
-            self._blob_pending = None
             self._clear_blob_overlay()
 
     def set_crop(self, left: int, top: int, right: int, bottom: int) -> None:
@@ -220,25 +354,56 @@ class StreamWindow(QtWidgets.QMainWindow):
         self._crop_top = max(0, int(top))
         self._crop_right = max(0, int(right))
         self._crop_bottom = max(0, int(bottom))
+        self._invalidate_presented()
 
-    def set_capture_backend(self, backend: str) -> None:
+    def set_capture_backend(self, backend: str, **options) -> None:
         backend = backend.lower()
-        if backend == self._capture_backend:
+        if backend == self._capture_backend and not options:
             return
-        if backend == "dxcam" and not DXCAM_AVAILABLE:
+        if not capture_source_available(backend):
             return
-        if backend == "wgc" and not WGC_AVAILABLE:
+        with self._source_lock:
+            self._stop_capture_source(self._capture_backend)
+            self._stop_capture_source(backend)
+            if options:
+                self._source_options[backend] = options
+            self._breaker(backend).reset()
+            self._capture_backend = backend
+            # The new backend must not start from a cached rect or monitor.
+            self._geometry.invalidate()
+            if self._capture_source(backend) is None:
+                self._fallback_to_mss()
+            self._mailbox.clear()
+        self._reset_quality()
+
+    def set_shared_capture(self, enabled: bool) -> None:
+        enabled = bool(enabled) and CAPTURE_HUB_AVAILABLE
+        if enabled == self._shared_capture:
             return
-        if self._capture_backend == "dxcam":
-            self._stop_dxcam()
-        if self._capture_backend == "wgc":
-            self._stop_wgc()
-        self._capture_backend = backend
-        self._init_capture_backend()
-        if self._capture_backend == "dxcam" and self._dxcam_async:
-            self._restart_dxcam()
-        if self._capture_backend == "wgc":
-            self._start_wgc()
+        with self._source_lock:
+            self._shared_capture = enabled
+            for name in SHARED_BACKENDS:
+                self._stop_capture_source(name)
+            self._mailbox.clear()
+        self._invalidate_presented()
+
+    def set_capture_threaded(self, enabled: bool) -> None:
+        self._capture_threaded = bool(enabled)
+        if self._capture_threaded:
+            # Grabbers the GUI thread made while unthreaded are its to close.
+            release_thread_capture_resources()
+            self._start_capture_thread()
+        else:
+            self._stop_capture_thread()
+
+    def set_effects_workers(self, workers: int) -> None:
+        workers = max(1, int(workers))
+        if workers == self._effects_bands.workers:
+            return
+        self._effects_bands.shutdown()
+        self._effects_bands = BandRunner(workers)
+        self._band_scratch = [OutputBuffers() for _ in range(workers)]
+        self._invalidate_presented()
 
     def set_effects_backend(self, backend: str) -> None:
         backend = backend.lower()
@@ -246,9 +411,12 @@ class StreamWindow(QtWidgets.QMainWindow):
             return
         if backend == "opencv" and not OPENCV_AVAILABLE:
             return
-        if backend not in ("numpy", "opencv", "auto"):
+        if backend == "numba" and not NUMBA_AVAILABLE:
+            return
+        if backend not in ("numpy", "opencv", "numba", "auto"):
             return
         self._effects_backend = backend
+        self._invalidate_presented()
 
     def toggle_fullscreen(self) -> None:
         self._borderless = not self._borderless
@@ -268,20 +436,45 @@ class StreamWindow(QtWidgets.QMainWindow):
         self.toggle_fullscreen()
 
     def update_frame(self) -> None:
-        if not win32gui.IsWindow(self.hwnd):
-            self.label.setText("Fenetre cible introuvable ou fermee.")
+        if not self._capture_threaded:
+            captured = self._capture_once()
+            if captured is None:
+                self._mailbox.drop()
+            else:
+                self._mailbox.put(captured)
+        taken = self._mailbox.take()
+        if taken is not None and taken[1].seq == self._presented_seq:
+            if taken[1].release is not None:
+                taken[1].release()
+            taken = None
+        if taken is None:
+            # Nothing new captured: skip effects, upload and blob scheduling,
+            # only redraw if a blob result arrived in the meantime. The
+            # timing stats still tick, without counting a frame.
+            self._refresh_presented()
+            self._tick_fps(presented=False)
             return
+        _, captured = taken
+        timeline = FrameTimeline(captured.timestamp)
+        timeline.mark("capture")
+        self._timeline = timeline
         try:
-            left, top, right, bottom = self._get_capture_rect()
-            width, height = right - left, bottom - top
-            if width <= 0 or height <= 0:
-                self.label.setText("Rognage invalide ou fenetre hors ecran.")
-                return
-
-            frame, f_width, f_height = self._grab_frame(left, top, right, bottom, width, height)
-            if frame is None:
+            frame, f_width, f_height = captured.data, captured.width, captured.height
+
+            if self._frame_size == (f_width, f_height) and self._change_detector.is_unchanged(
+                self._frame_to_bgra_array(frame, f_width, f_height)
+            ):
+                # Pixel-identical to what is on screen: keep the current
+                # image/texture and the last blob result.
+                self._presented_seq = captured.seq
+                self._refresh_presented()
+                self._tick_fps()
                 return
 
+            if self._downscale_mode == "box":
+                # Keyed by seq: re-rendering this capture (resize, settings)
+                # reuses the levels already built for it.
+                self._pyramid.set_frame(self._frame_to_bgra_array(frame, f_width, f_height), key=captured.seq)
             blob_enabled = self._blob_params.get("enabled")
             if blob_enabled:
                 self._schedule_blob(frame, f_width, f_height)
@@ -291,52 +484,92 @@ class StreamWindow(QtWidgets.QMainWindow):
                 data, out_w, out_h = self._frame_to_gpu_bytes(frame, f_width, f_height)
                 if data is None:
                     return
+                self._mark("convert")
                 self._present_gpu_frame(data, out_w, out_h)
+                # "present" is marked once the GL upload has been swapped.
+                self._gl_timeline = timeline
+                self._frame_image = None
+                self._raster.set_frame(None)
+                self._hold_frame_lease(None)
+                self._frame_size = (f_width, f_height)
                 if blob_enabled:
                     self._update_gpu_overlay(f_width, f_height)
                 else:
                     self._clear_blob_overlay()
+                self._presented_blob_id = self._blob_result_id
             else:
-                pixmap = self._frame_to_pixmap(frame, f_width, f_height)
-                if pixmap is None:
+                first, second = self._effects_buffer_sets
+                self._effects_buffers = second if self._shown_buffers is first else first
+                image, borrowed = self._frame_to_image(frame, f_width, f_height)
+                if image is None:
                     return
-                pixmap = self._apply_blob_overlay(pixmap, f_width, f_height)
-                self._present_pixmap(pixmap)
-                self._clear_blob_overlay()
+                self._frame_image = image
+                self._shown_buffers = self._effects_buffers
+                # A borrowed image keeps its capture lease until replaced.
+                self._hold_frame_lease(captured if borrowed else None)
+                self._frame_size = (f_width, f_height)
+                self._present_frame_image()
+                self._mark("present")
+                self._latency.record(timeline)
+            self._presented_seq = captured.seq
             self._tick_fps()
         except Exception as exc:  # pragma: no cover - UI feedback only
             self._log.exception("update_frame failed")
-            self.label.setText(f"Erreur de capture: {exc}")
-
-    def _init_capture_backend(self) -> None:
-        if self._capture_backend == "dxcam" and DXCAM_AVAILABLE:
-            self._ensure_dxcam_instance()
-        else:
-            self._dxcam = None
-
-    def _ensure_dxcam_instance(self) -> None:
-        if not DXCAM_AVAILABLE:
-            self._dxcam = None
-            self._dxcam_output_idx = None
-            self._dxcam_output_rect = None
+            self._raster.setText(f"Erreur de capture: {exc}")
+        finally:
+            self._timeline = None
+            self._pyramid.set_frame(None)
+            if captured.release is not None and captured is not self._frame_lease:
+                captured.release()
+
+    def _mark(self, stage: str) -> None:
+        if self._timeline is not None:
+            self._timeline.mark(stage)
+
+    def _on_gl_frame_swapped(self) -> None:
+        timeline, self._gl_timeline = self._gl_timeline, None
+        if timeline is not None:
+            timeline.mark("present")
+            self._latency.record(timeline)
+
+    def _invalidate_presented(self) -> None:
+        # Settings changed: the next capture must be processed even if its
+        # seq matches the frame on screen.
+        self._presented_seq = None
+        self._mailbox.invalidate()
+        self._change_detector.reset()
+
+    def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
+        super().resizeEvent(event)
+        # The output size follows the viewport: re-render even a static frame.
+        self._invalidate_presented()
+        self._refresh_presented(force=True)
+
+    def _refresh_presented(self, force: bool = False) -> None:
+        if self._blob_params.get("enabled"):
+            self._poll_blob_future()
+        if not force and self._presented_blob_id == self._blob_result_id:
             return
-        output_idx, output_rect = self._get_monitor_index()
-        if output_rect is None:
-            output_idx = None
-        if self._dxcam is None or output_idx != self._dxcam_output_idx:
-            self._stop_dxcam()
-            try:
-                if output_idx is None:
-                    self._dxcam = dxcam.create(output_color="BGRA")
-                else:
-                    self._dxcam = dxcam.create(output_color="BGRA", output_idx=output_idx)
-            except Exception:
-                self._dxcam = None
-                self._dxcam_output_idx = None
-                self._dxcam_output_rect = None
-                return
-        self._dxcam_output_idx = output_idx
-        self._dxcam_output_rect = output_rect
+        f_width, f_height = self._frame_size
+        if f_width <= 0 or f_height <= 0:
+            return
+        if self._use_gpu and self._gpu_available:
+            if self._blob_params.get("enabled"):
+                self._update_gpu_overlay(f_width, f_height)
+            self._presented_blob_id = self._blob_result_id
+        elif self._frame_image is not None:
+            self._present_frame_image()
+
+    def _hold_frame_lease(self, captured: Optional[CapturedFrame]) -> None:
+        previous, self._frame_lease = self._frame_lease, captured
+        if previous is not None and previous is not captured and previous.release is not None:
+            previous.release()
+
+    def _present_frame_image(self) -> None:
+        # The blob overlay is painted by the view, see _paint_raster_overlay.
+        self._raster.set_frame(self._frame_image)
+        self._clear_blob_overlay()
+        self._presented_blob_id = self._blob_result_id
 
     def _log_foreground_fallback(self, backend: str) -> None:
         now = time.perf_counter()
@@ -344,205 +577,139 @@ class StreamWindow(QtWidgets.QMainWindow):
             self._log.info("Foreground fallback: %s", backend)
             self._fallback_last_log = now
 
-    def _get_monitor_index(self):
-        rect = win32gui.GetWindowRect(self.hwnd)
-        cx = (rect[0] + rect[2]) // 2
-        cy = (rect[1] + rect[3]) // 2
-        monitors = win32api.EnumDisplayMonitors()
-        for idx, (_, _, mrect) in enumerate(monitors):
-            if mrect[0] <= cx < mrect[2] and mrect[1] <= cy < mrect[3]:
-                return idx, mrect
-        if monitors:
-            return 0, monitors[0][2]
-        return None, None
-
-    def _dxcam_region_from_absolute(self, region):
-        if region is None:
-            return None
-        if self._dxcam_output_rect is None:
-            return region
-        left, top, right, bottom = region
-        mon_left, mon_top, mon_right, mon_bottom = self._dxcam_output_rect
-        left = max(left, mon_left)
-        top = max(top, mon_top)
-        right = min(right, mon_right)
-        bottom = min(bottom, mon_bottom)
-        if right <= left or bottom <= top:
+    def _start_capture_thread(self) -> None:
+        if self._capture_thread is not None or not self._capture_threaded:
+            return
+        self._capture_thread = CaptureThread(
+            self._capture_once, self._mailbox, self._target_fps, on_exit=release_thread_capture_resources
+        )
+        self._capture_thread.start()
+
+    def _stop_capture_thread(self) -> None:
+        if self._capture_thread is None:
+            return
+        self._capture_thread.stop()
+        self._capture_thread = None
+
+    def _capture_once(self) -> Optional[CapturedFrame]:
+        # Runs on the capture thread: report status through status_changed only.
+        with self._source_lock:
+            fixed_rect = self._fixed_capture_rect()
+            rect = fixed_rect
+            if rect is None and self._geometry.is_window():
+                rect = self._get_capture_rect()
+        if rect is None:
+            self.status_changed.emit("Fenetre cible introuvable ou fermee.")
             return None
-        return (left - mon_left, top - mon_top, right - mon_left, bottom - mon_top)
-
-    def _grab_frame(self, left: int, top: int, right: int, bottom: int, width: int, height: int):
-        if (
-            self._capture_backend == "mss"
-            and self._auto_foreground_fallback
-            and win32gui.GetForegroundWindow() == self.hwnd
-        ):
-            region = (left, top, right, bottom)
-            if DXCAM_AVAILABLE:
-                self._ensure_dxcam_instance()
-                region = self._dxcam_region_from_absolute(region)
-                if self._dxcam is not None and region is not None:
-                    if self._dxcam_async:
-                        if self._ensure_dxcam_started(region):
-                            frame = self._dxcam.get_latest_frame()
-                        else:
-                            frame = None
-                    else:
-                        try:
-                            frame = self._dxcam.grab(region=region)
-                        except Exception:
-                            frame = None
-                    if frame is not None:
-                        self._log_foreground_fallback("DXCAM")
-                        return frame, frame.shape[1], frame.shape[0]
-            if WGC_AVAILABLE:
-                self._ensure_wgc_started()
-                frame = self._wgc.get_latest() if self._wgc else None
-                data, w, h = self._coerce_wgc_frame(frame, left, top, right, bottom)
-                if data is not None:
-                    self._log_foreground_fallback("WGC")
-                    return data, w, h
-
-        if self._capture_backend == "wgc" and WGC_AVAILABLE:
-            self._ensure_wgc_started()
-            frame = self._wgc.get_latest() if self._wgc else None
-            return self._coerce_wgc_frame(frame, left, top, right, bottom)
-        if self._capture_backend == "dxcam" and DXCAM_AVAILABLE:
-            if self._dxcam is None:
-                self._ensure_dxcam_instance()
-            region = self._dxcam_region_from_absolute((left, top, right, bottom))
-            if region is None:
-                return None, 0, 0
-            if self._dxcam_async:
-                if self._ensure_dxcam_started(region):
-                    frame = self._dxcam.get_latest_frame() if self._dxcam else None
-                else:
-                    frame = None
-            else:
-                try:
-                    frame = self._dxcam.grab(region=region)
-                except Exception:
-                    frame = None
-            if frame is None:
-                return None, 0, 0
-            return frame, frame.shape[1], frame.shape[0]
-
-        monitor = {"left": left, "top": top, "width": width, "height": height}
-        raw = self._sct.grab(monitor)
-        return raw, raw.width, raw.height
-
-    def _stop_dxcam(self) -> None:
-        if self._dxcam and self._dxcam_started:
-            try:
-                self._dxcam.stop()
-            except Exception:
-                pass
-        self._dxcam_started = False
-        self._dxcam_region = None
-
-    def _restart_dxcam(self) -> None:
-        self._stop_dxcam()
-        # Start lazily on next grab with current region.
-
-    def _ensure_dxcam_started(self, region) -> bool:
-        if not self._dxcam:
-            return False
-        if self._dxcam_started and self._dxcam_region == region:
-            return True
-        self._stop_dxcam()
         try:
-            self._dxcam.start(target_fps=self._target_fps, region=region)
-        except TypeError:
-            try:
-                self._dxcam.start(target_fps=self._target_fps)
-            except TypeError:
-                self._dxcam.start()
-        except ValueError as exc:
-            now = time.perf_counter()
-            if now - self._dxcam_last_error >= 2.0:
-                self._log.warning("DXCAM region invalid: %s", exc)
-                self._dxcam_last_error = now
-            return False
+            left, top, right, bottom = rect
+            if right - left <= 0 or bottom - top <= 0:
+                self.status_changed.emit("Rognage invalide ou fenetre hors ecran.")
+                return None
+            return self._grab_frame((left, top, right, bottom))
         except Exception as exc:
-            now = time.perf_counter()
-            if now - self._dxcam_last_error >= 2.0:
-                self._log.warning("DXCAM start failed: %s", exc)
-                self._dxcam_last_error = now
-            return False
-        self._dxcam_started = True
-        self._dxcam_region = region
-        return True
-
-    def _start_wgc(self) -> None:
-        if not self._wgc or self._wgc_started:
-            return
-        self._wgc_started = self._wgc.start(self._target_fps)
-        if not self._wgc_started:
-            self._capture_backend = "mss"
-            self._init_capture_backend()
-            self.label.setText("WGC indisponible, retour MSS.")
-
-    def _restart_wgc(self) -> None:
-        self._stop_wgc()
-        self._start_wgc()
-
-    def _ensure_wgc_started(self) -> None:
-        if not self._wgc_started:
-            self._start_wgc()
-
-    def _stop_wgc(self) -> None:
-        if self._wgc:
-            self._wgc.stop()
-        self._wgc_started = False
-
-    def _coerce_wgc_frame(self, frame, left: int, top: int, right: int, bottom: int):
-        if frame is None:
-            return None, 0, 0
-        data = frame
-        for attr in ("image", "frame", "data", "buffer"):
-            if hasattr(data, attr):
-                data = getattr(data, attr)
-                break
+            self._log.exception("capture failed")
+            self.status_changed.emit(f"Erreur de capture: {exc}")
+            return None
 
-        if isinstance(data, tuple) and len(data) >= 3:
-            buf, w, h = data[0], int(data[1]), int(data[2])
-            return buf, w, h
+    def _capture_source(self, name: str) -> Optional[CaptureSource]:
+        source = self._sources.get(name)
+        if source is None:
+            if self._shared_capture and name in SHARED_BACKENDS:
+                # Windows on the same monitor share one grab through the hub.
+                source = SharedCaptureSource(
+                    name, self.hwnd, geometry=self._geometry, **self._source_options.get(name, {})
+                )
+            else:
+                source = create_capture_source(
+                    name, self.hwnd, geometry=self._geometry, **self._source_options.get(name, {})
+                )
+            if source is None:
+                return None
+            if isinstance(source, (DxcamCaptureSource, AutoCaptureSource, SharedCaptureSource)):
+                source.set_async(self._dxcam_async)
+            self._sources[name] = source
+        if not source.is_running() and not source.start(self._target_fps):
+            return None
+        return source
+
+    def _stop_capture_source(self, name: str) -> None:
+        source = self._sources.pop(name, None)
+        if source is not None:
+            source.stop()
+
+    def _fixed_capture_rect(self):
+        source = self._sources.get(self._capture_backend)
+        return source.fixed_rect() if source is not None else None
+
+    def _grab_frame(self, rect) -> Optional[CapturedFrame]:
+        # Sources are looked up under _source_lock and grabbed outside it, so
+        # the GUI thread never waits a whole capture for the lock.
+        with self._source_lock:
+            name = self._capture_backend
+        if name == "mss" and self._auto_foreground_fallback and self._geometry.is_foreground():
+            for fallback in ("dxcam", "wgc"):
+                if not capture_source_available(fallback) or not self._breaker(fallback).allow():
+                    continue
+                source = self._locked_capture_source(fallback)
+                captured = self._grab_from(fallback, source, rect) if source is not None else None
+                if captured is not None:
+                    self._log_foreground_fallback(fallback.upper())
+                    return captured
+
+        if self._breaker(name).allow():
+            with self._source_lock:
+                source = self._capture_source(name) if name == self._capture_backend else None
+                if source is None:
+                    if name == self._capture_backend:
+                        self._fallback_to_mss()
+                    return None
+            captured = self._grab_from(name, source, rect)
+            if captured is not None or self._breaker(name).allow():
+                return captured
+        if name == "mss":
+            return None
+        # Keep the stream alive on MSS while the backend's breaker is open.
+        source = self._locked_capture_source("mss")
+        return self._grab_from("mss", source, rect) if source is not None else None
 
-        if np is not None and isinstance(data, np.ndarray):
-            data = self._crop_from_wgc(data, left, top, right, bottom)
-            return data, data.shape[1], data.shape[0]
+    def _locked_capture_source(self, name: str) -> Optional[CaptureSource]:
+        with self._source_lock:
+            return self._capture_source(name)
 
-        w = getattr(data, "width", None)
-        h = getattr(data, "height", None)
-        if w and h and isinstance(data, (bytes, bytearray, memoryview)):
-            return data, int(w), int(h)
+    def _grab_from(self, name: str, source: CaptureSource, rect) -> Optional[CapturedFrame]:
+        breaker = self._breaker(name)
+        try:
+            captured = source.grab(rect)
+        except Exception as exc:
+            # A source the GUI thread stopped mid-grab is not a backend failure.
+            if self._sources.get(name) is source:
+                breaker.record_failure(exc)
+            return None
+        breaker.record_success()
+        return captured
 
-        return None, 0, 0
+    def _breaker(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name.upper())
+            self._breakers[name] = breaker
+        return breaker
 
-    def _crop_from_wgc(self, frame, left: int, top: int, right: int, bottom: int):
-        if np is None:
-            return frame
-        target_left, target_top, target_right, target_bottom = left, top, right, bottom
-        mon_rect = self._wgc.get_monitor_rect() if self._wgc else None
-        if not mon_rect:
-            return frame
-        mon_left, mon_top, mon_right, mon_bottom = mon_rect
-        rel_left = max(0, target_left - mon_left)
-        rel_top = max(0, target_top - mon_top)
-        rel_right = min(mon_right - mon_left, target_right - mon_left)
-        rel_bottom = min(mon_bottom - mon_top, target_bottom - mon_top)
-        if rel_right <= rel_left or rel_bottom <= rel_top:
-            return frame
-        return frame[rel_top:rel_bottom, rel_left:rel_right]
+    def _fallback_to_mss(self) -> None:
+        if self._capture_backend == "wgc":
+            self.status_changed.emit("WGC indisponible, retour MSS.")
+        self._stop_capture_source(self._capture_backend)
+        self._capture_backend = "mss"
 
     def _get_capture_rect(self):
+        geo = self._geometry.geometry()
+        if geo is None:
+            return None
         if not self._capture_client:
-            left, top, right, bottom = win32gui.GetWindowRect(self.hwnd)
+            left, top, right, bottom = geo.window_rect
         else:
-            left, top, right, bottom = win32gui.GetClientRect(self.hwnd)
-            tl = win32gui.ClientToScreen(self.hwnd, (left, top))
-            br = win32gui.ClientToScreen(self.hwnd, (right, bottom))
-            left, top, right, bottom = tl[0], tl[1], br[0], br[1]
+            left, top, right, bottom = geo.client_rect
         left += self._crop_left
         top += self._crop_top
         right -= self._crop_right
@@ -552,14 +719,17 @@ class StreamWindow(QtWidgets.QMainWindow):
     def _maybe_crop_client(self, frame, left: int, top: int, right: int, bottom: int):
         if not self._capture_client or np is None:
             return frame
-        win_left, win_top, win_right, win_bottom = win32gui.GetWindowRect(self.hwnd)
+        geo = self._geometry.geometry()
+        if geo is None:
+            return frame
+        win_left, win_top, win_right, win_bottom = geo.window_rect
         win_w = win_right - win_left
         win_h = win_bottom - win_top
         if frame.shape[1] != win_w or frame.shape[0] != win_h:
             return frame
-        cl_left, cl_top, cl_right, cl_bottom = win32gui.GetClientRect(self.hwnd)
-        tl = win32gui.ClientToScreen(self.hwnd, (cl_left, cl_top))
-        br = win32gui.ClientToScreen(self.hwnd, (cl_right, cl_bottom))
+        cl_left, cl_top, cl_right, cl_bottom = geo.client_rect
+        tl = (cl_left, cl_top)
+        br = (cl_right, cl_bottom)
         off_x = tl[0] - win_left
         off_y = tl[1] - win_top
         c_w = br[0] - tl[0]
@@ -568,63 +738,103 @@ class StreamWindow(QtWidgets.QMainWindow):
             return frame
         return frame[off_y : off_y + c_h, off_x : off_x + c_w]
 
-    def _frame_to_pixmap(self, frame, width: int, height: int) -> Optional[QtGui.QPixmap]:
+    def _output_size(self, width: int, height: int, view: QtWidgets.QWidget):
+        """Final frame size: ``scale_percent`` of the source, capped at the
+        letterboxed viewport in device pixels, so the frame is resized once
+        and effects never run on pixels the paint would throw away."""
         scale = max(0.1, self._scale_percent / 100.0)
         out_w = max(1, int(width * scale))
         out_h = max(1, int(height * scale))
+        dpr = view.devicePixelRatioF()
+        view_w = int(view.width() * dpr)
+        view_h = int(view.height() * dpr)
+        if view_w > 0 and view_h > 0:
+            _, _, disp_w, disp_h = self._fit_viewport(width, height, view_w, view_h)
+            if 0 < disp_w < out_w and 0 < disp_h < out_h:
+                out_w, out_h = disp_w, disp_h
+        return out_w, out_h
+
+    def _frame_to_image(self, frame, width: int, height: int) -> Tuple[Optional[QtGui.QImage], bool]:
+        """(image, borrowed): a borrowed image wraps the capture buffer itself."""
+        out_w, out_h = self._output_size(width, height, self._raster)
         use_fast = self._fast_mode
 
-        if (
-            self._brightness == 1.0
-            and self._contrast == 1.0
-            and out_w == width
-            and out_h == height
-        ):
+        if self._effects_chain.is_identity() and out_w == width and out_h == height:
             qimage = self._qimage_from_raw(frame, width, height)
             if qimage is not None:
-                return QtGui.QPixmap.fromImage(qimage)
+                self._mark("convert")
+                return qimage, True
+
+        if self._effects_backend == "auto":
+            return self._image_from_auto(frame, width, height, out_w, out_h, use_fast), False
 
-        if self._effects_backend in ("numpy", "auto") and NUMPY_AVAILABLE:
-            pixmap = self._pixmap_from_numpy(frame, width, height, out_w, out_h, use_fast)
-            if pixmap is not None:
-                return pixmap
+        if self._effects_backend == "numba" and NUMBA_AVAILABLE:
+            image = self._image_from_numba(frame, width, height, out_w, out_h)
+            if image is not None:
+                return image, False
 
-        if self._effects_backend in ("opencv", "auto") and OPENCV_AVAILABLE:
-            pixmap = self._pixmap_from_opencv(frame, width, height, out_w, out_h, use_fast)
-            if pixmap is not None:
-                return pixmap
+        if self._effects_backend == "numpy" and NUMPY_AVAILABLE:
+            image = self._image_from_numpy(frame, width, height, out_w, out_h, use_fast)
+            if image is not None:
+                return image, False
 
-        return self._pixmap_from_pillow(frame, width, height, out_w, out_h, use_fast)
+        if self._effects_backend == "opencv" and OPENCV_AVAILABLE:
+            image = self._image_from_opencv(frame, width, height, out_w, out_h, use_fast)
+            if image is not None:
+                return image, False
+
+        return self._image_from_pillow(frame, width, height, out_w, out_h, use_fast), False
+
+    def _image_from_auto(
+        self,
+        frame,
+        width: int,
+        height: int,
+        out_w: int,
+        out_h: int,
+        use_fast: bool,
+    ) -> Optional[QtGui.QImage]:
+        renderers = {}
+        if NUMBA_AVAILABLE:
+            renderers["numba"] = lambda: self._image_from_numba(frame, width, height, out_w, out_h)
+        if NUMPY_AVAILABLE:
+            renderers["numpy"] = lambda: self._image_from_numpy(frame, width, height, out_w, out_h, use_fast)
+        if OPENCV_AVAILABLE:
+            renderers["opencv"] = lambda: self._image_from_opencv(frame, width, height, out_w, out_h, use_fast)
+        renderers["pillow"] = lambda: self._image_from_pillow(frame, width, height, out_w, out_h, use_fast)
+
+        key = self._auto_key(width, height, out_w, out_h, use_fast)
+        backend = self._calibrator.pick(key, list(renderers))
+        start = time.perf_counter()
+        image = renderers[backend]()
+        self._calibrator.record(key, backend, time.perf_counter() - start, image is not None)
+        self._auto_backend = backend
+        if image is None and backend != "pillow":
+            image = renderers["pillow"]()
+        return image
+
+    def _auto_key(self, width: int, height: int, out_w: int, out_h: int, use_fast: bool) -> str:
+        # Effect values do not change the cost, only which stages run. The
+        # output size follows the viewport, so it is bucketed by quarters of
+        # the source width: resizing the window must not recalibrate per step.
+        chain = self._effects_chain
+        stages = [name for name, used in (("matrix", chain.has_matrix()), ("lut", chain.has_lut())) if used]
+        quarters = max(1, min(4, -(-4 * out_w // max(1, width))))
+        return (
+            f"{width}x{height}>{quarters}/4 {'+'.join(stages) or 'none'} "
+            f"{self._downscale_mode} {'fast' if use_fast else 'smooth'} x{self._effects_bands.workers}"
+        )
 
     def _qimage_from_raw(self, frame, width: int, height: int) -> Optional[QtGui.QImage]:
-        if isinstance(frame, mss.base.ScreenShot):
-            return QtGui.QImage(
-                frame.bgra,
-                frame.width,
-                frame.height,
-                QtGui.QImage.Format_ARGB32,
-            ).copy()
-        if np is not None and isinstance(frame, np.ndarray):
-            if frame.ndim != 3:
-                return None
-            height, width = frame.shape[0], frame.shape[1]
-            if frame.shape[2] >= 4:
-                fmt = QtGui.QImage.Format_ARGB32
-            elif frame.shape[2] == 3:
-                fmt = QtGui.QImage.Format_BGR888
-            else:
-                return None
-            return QtGui.QImage(frame.data, width, height, fmt).copy()
+        # Wraps the capture memory as is, crops included (real row stride).
+        arr = self._frame_to_bgra_array(frame, width, height)
+        if arr is not None:
+            return qimage_from_array(arr)
         if isinstance(frame, (bytes, bytearray, memoryview)):
-            return QtGui.QImage(
-                frame,
-                width,
-                height,
-                QtGui.QImage.Format_ARGB32,
-            ).copy()
+            return QtGui.QImage(frame, width, height, width * 4, QtGui.QImage.Format_ARGB32).copy()
         return None
 
-    def _pixmap_from_numpy(
+    def _image_from_numpy(
         self,
         frame,
         width: int,
@@ -632,56 +842,73 @@ class StreamWindow(QtWidgets.QMainWindow):
         out_w: int,
         out_h: int,
         use_fast: bool,
-    ) -> Optional[QtGui.QPixmap]:
-        if np is None:
+    ) -> Optional[QtGui.QImage]:
+        arr = self._frame_to_bgra_array(frame, width, height)
+        if arr is None or arr.ndim != 3:
             return None
 
-        if isinstance(frame, mss.base.ScreenShot):
-            arr = np.frombuffer(frame.bgra, dtype=np.uint8).reshape(height, width, 4)
-        else:
-            arr = np.asarray(frame)
-            if arr.ndim != 3:
-                return None
-
-        if out_w != width or out_h != height:
-            y_idx = (np.linspace(0, height - 1, out_h)).astype(np.int32)
-            x_idx = (np.linspace(0, width - 1, out_w)).astype(np.int32)
-            arr = arr[y_idx[:, None], x_idx]
-            height, width = arr.shape[0], arr.shape[1]
-
-        if arr.shape[2] == 4:
-            rgb = arr[:, :, :3].astype(np.float32)
-            alpha = arr[:, :, 3:4]
-        else:
-            rgb = arr.astype(np.float32)
-            alpha = None
-
-        if self._contrast != 1.0:
-            rgb = (rgb - 128.0) * self._contrast + 128.0
-        if self._brightness != 1.0:
-            rgb = rgb * self._brightness
-        rgb = np.clip(rgb, 0, 255).astype(np.uint8)
-
-        if alpha is not None:
-            out = np.concatenate((rgb, alpha), axis=2)
-            qimage = QtGui.QImage(
-                out.data,
-                width,
-                height,
-                QtGui.QImage.Format_ARGB32,
-            ).copy()
+        owned = False
+        box = self._resize_box(out_w, out_h) if out_w != width or out_h != height else None
+        if box is not None:
+            arr, owned = box
+        elif out_w != width or out_h != height:
+            plan = self._resize_plans.get(arr.shape[1], arr.shape[0], out_w, out_h)
+            if plan.strided:
+                arr = plan.apply(arr)
+            else:
+                src = arr
+                arr = self._effects_buffers.get((out_h, out_w) + src.shape[2:])
+                self._effects_bands.run(out_h, lambda y0, y1, band: plan.apply_rows(src, arr, y0, y1))
+                owned = True
+        self._mark("convert")
+
+        # The capture buffer is not ours to modify: effects go to a reused
+        # output buffer unless the resize already gathered into one.
+        chain = self._effects_chain
+        if not chain.is_identity():
+            out = arr if owned else self._effects_buffers.get(arr.shape)
+            scratch = self._band_scratch
+            self._effects_bands.run(
+                arr.shape[0],
+                lambda y0, y1, band: apply_chain(arr[y0:y1], chain, out[y0:y1], scratch[band]),
+            )
+        elif owned:
+            out = arr
         else:
-            out = rgb
-            qimage = QtGui.QImage(
-                out.data,
-                width,
-                height,
-                QtGui.QImage.Format_BGR888,
-            ).copy()
-
-        return QtGui.QPixmap.fromImage(qimage)
+            # Capture memory or a pyramid level: not ours to show in place.
+            out = self._effects_buffers.get(arr.shape)
+            np.copyto(out, arr)
+        self._mark("effects")
+        return self._image_from_bgr_array(out)
 
-    def _pixmap_from_pillow(
+    def _image_from_numba(
+        self,
+        frame,
+        width: int,
+        height: int,
+        out_w: int,
+        out_h: int,
+    ) -> Optional[QtGui.QImage]:
+        arr = self._frame_to_bgra_array(frame, width, height)
+        if arr is None or arr.ndim != 3 or arr.shape[2] not in (3, 4):
+            return None
+        if self._downscale_mode == "box" and self._pyramid.has_frame() and (out_w, out_h) != (width, height):
+            # Box filter first; the kernel then only applies the effects.
+            arr = self._pyramid.downscale(out_w, out_h)
+        # Resize and effects are one kernel: "convert" only covers the setup.
+        plan = self._resize_plans.get(arr.shape[1], arr.shape[0], out_w, out_h)
+        out = self._effects_buffers.get((out_h, out_w, arr.shape[2]))
+        self._mark("convert")
+        resize_chain_numba(arr, plan, self._effects_chain, out)
+        self._mark("effects")
+        return self._image_from_bgr_array(out)
+
+    def _image_from_bgr_array(self, out) -> QtGui.QImage:
+        # No copy: the raster view paints straight from ``out``, which stays
+        # untouched while shown (the next frame uses the other buffer set).
+        return qimage_from_array(out)
+
+    def _image_from_pillow(
         self,
         frame,
         width: int,
@@ -689,37 +916,43 @@ class StreamWindow(QtWidgets.QMainWindow):
         out_w: int,
         out_h: int,
         use_fast: bool,
-    ) -> Optional[QtGui.QPixmap]:
-        if isinstance(frame, mss.base.ScreenShot):
-            img = Image.frombytes("RGB", (width, height), frame.rgb)
+    ) -> Optional[QtGui.QImage]:
+        # Pillow's raw decoder swizzles BGR(X) to RGB in C.
+        if isinstance(frame, (bytes, bytearray, memoryview)):
+            img = Image.frombuffer("RGB", (width, height), frame, "raw", "BGRX", 0, 1)
         else:
             if np is None:
                 return None
-            arr = np.asarray(frame)
-            if arr.ndim != 3 or arr.shape[2] < 3:
+            arr = np.ascontiguousarray(frame)
+            if arr.ndim != 3 or arr.shape[2] not in (3, 4):
                 return None
-            # dxcam returns BGR(A); convert to RGB for Pillow.
-            rgb = arr[:, :, :3][:, :, ::-1]
-            img = Image.fromarray(rgb, mode="RGB")
+            mode = "BGRX" if arr.shape[2] == 4 else "BGR"
+            img = Image.frombuffer("RGB", (arr.shape[1], arr.shape[0]), arr, "raw", mode, 0, 1)
 
         if out_w != width or out_h != height:
-            resample = Image.NEAREST if use_fast else Image.BILINEAR
+            if self._downscale_mode == "box":
+                resample = Image.BOX
+            else:
+                resample = Image.NEAREST if use_fast else Image.BILINEAR
             img = img.resize((out_w, out_h), resample=resample)
+        self._mark("convert")
 
-        if self._brightness != 1.0:
-            img = ImageEnhance.Brightness(img).enhance(self._brightness)
-        if self._contrast != 1.0:
-            img = ImageEnhance.Contrast(img).enhance(self._contrast)
+        chain = self._effects_chain
+        if chain.has_matrix():
+            img = img.convert("RGB", tuple(v for row in rgb_matrix(chain) for v in row))
+        if chain.has_lut():
+            img = img.point(effects_table(chain) * 3)
+        self._mark("effects")
 
-        qimage = QtGui.QImage(
+        return QtGui.QImage(
             img.tobytes(),
             img.width,
             img.height,
+            img.width * 3,
             QtGui.QImage.Format_RGB888,
         ).copy()
-        return QtGui.QPixmap.fromImage(qimage)
 
-    def _pixmap_from_opencv(
+    def _image_from_opencv(
         self,
         frame,
         width: int,
@@ -727,140 +960,109 @@ class StreamWindow(QtWidgets.QMainWindow):
         out_w: int,
         out_h: int,
         use_fast: bool,
-    ) -> Optional[QtGui.QPixmap]:
+    ) -> Optional[QtGui.QImage]:
         if cv2 is None:
             return None
 
-        if isinstance(frame, mss.base.ScreenShot):
-            arr = np.frombuffer(frame.bgra, dtype=np.uint8).reshape(height, width, 4)
-        else:
-            if np is None:
-                return None
-            arr = np.asarray(frame)
-            if arr.ndim != 3:
-                return None
-
-        if out_w != width or out_h != height:
-            interp = cv2.INTER_NEAREST if use_fast else cv2.INTER_LINEAR
-            arr = cv2.resize(arr, (out_w, out_h), interpolation=interp)
-            height, width = arr.shape[0], arr.shape[1]
+        arr = self._frame_to_bgra_array(frame, width, height)
+        if arr is None or arr.ndim != 3:
+            return None
 
-        if arr.shape[2] >= 3:
-            rgb = arr[:, :, :3].astype(np.float32)
-        else:
+        if arr.shape[2] not in (3, 4):
             return None
 
-        if self._contrast != 1.0:
-            rgb = (rgb - 128.0) * self._contrast + 128.0
-        if self._brightness != 1.0:
-            rgb = rgb * self._brightness
-        rgb = np.clip(rgb, 0, 255).astype(np.uint8)
-
-        if arr.shape[2] >= 4:
-            alpha = arr[:, :, 3:4]
-            out = np.concatenate((rgb, alpha), axis=2)
-            qimage = QtGui.QImage(
-                out.data,
-                width,
-                height,
-                QtGui.QImage.Format_ARGB32,
-            ).copy()
+        owned = False
+        if out_w != width or out_h != height:
+            if self._downscale_mode == "box":
+                interp = cv2.INTER_AREA
+            else:
+                interp = cv2.INTER_NEAREST if use_fast else cv2.INTER_LINEAR
+            dst = self._effects_buffers.get((out_h, out_w, arr.shape[2]))
+            arr = cv2.resize(arr, (out_w, out_h), dst=dst, interpolation=interp)
+            owned = True
+        self._mark("convert")
+
+        chain = self._effects_chain
+        if not chain.is_identity():
+            out = arr if owned else self._effects_buffers.get(arr.shape)
+            self._effects_bands.run(
+                arr.shape[0],
+                lambda y0, y1, band: apply_chain_cv2(arr[y0:y1], chain, out[y0:y1]),
+            )
+        elif owned:
+            out = arr
         else:
-            qimage = QtGui.QImage(
-                rgb.data,
-                width,
-                height,
-                QtGui.QImage.Format_BGR888,
-            ).copy()
+            # Capture memory or a pyramid level: not ours to show in place.
+            out = self._effects_buffers.get(arr.shape)
+            np.copyto(out, arr)
+        self._mark("effects")
+        return self._image_from_bgr_array(out)
+
+    def pipeline_stats(self) -> dict:
+        """Buffer allocations so far, latency percentiles per stage and the backend "auto" last used."""
+        return {
+            "buffer_allocs": self._effects_allocation_count(),
+            "latency": self._latency.percentiles(),
+            "auto_backend": self._auto_backend,
+        }
 
-        return QtGui.QPixmap.fromImage(qimage)
+    def _capture_counter(self, attr: str) -> int:
+        # Counter exposed by the current source (the active one under auto), 0
+        # if none. Plain ints: read without taking _source_lock.
+        source = self._sources.get(self._capture_backend)
+        if isinstance(source, AutoCaptureSource):
+            source = source.active_source()
+        counter = getattr(source, attr, None)
+        return counter() if callable(counter) else 0
+
+    def _effects_allocation_count(self) -> int:
+        return (
+            sum(buffers.allocations for buffers in self._effects_buffer_sets)
+            + self._pyramid.buffers.allocations
+            + sum(buffers.allocations for buffers in self._band_scratch)
+        )
+
+    def _resize_nearest(self, arr, out_w: int, out_h: int):
+        """(resized, owned): a strided view of ``arr``, or a reused buffer."""
+        plan = self._resize_plans.get(arr.shape[1], arr.shape[0], out_w, out_h)
+        if plan.strided:
+            return plan.apply(arr), False
+        return plan.apply(arr, self._effects_buffers.get((out_h, out_w) + arr.shape[2:])), True
+
+    def _resize_box(self, out_w: int, out_h: int):
+        """(resized, owned) from the frame's mip pyramid, or None outside box mode."""
+        if self._downscale_mode != "box" or not self._pyramid.has_frame():
+            return None
+        src = self._pyramid.level(0)
+        dst = self._effects_buffers.get((out_h, out_w) + src.shape[2:])
+        arr = self._pyramid.downscale(out_w, out_h, dst)
+        return arr, arr is dst
 
     def _frame_to_gpu_bytes(self, frame, width: int, height: int):
-        scale = max(0.1, self._scale_percent / 100.0)
-        out_w = max(1, int(width * scale))
-        out_h = max(1, int(height * scale))
+        out_w, out_h = self._output_size(width, height, self._gl_view)
 
         if out_w != width or out_h != height:
-            if NUMPY_AVAILABLE:
-                if isinstance(frame, mss.base.ScreenShot):
-                    arr = np.frombuffer(frame.bgra, dtype=np.uint8).reshape(height, width, 4)
-                else:
-                    arr = np.asarray(frame)
-                y_idx = (np.linspace(0, height - 1, out_h)).astype(np.int32)
-                x_idx = (np.linspace(0, width - 1, out_w)).astype(np.int32)
-                arr = arr[y_idx[:, None], x_idx]
+            arr = self._frame_to_bgra_array(frame, width, height)
+            if arr is not None:
+                box = self._resize_box(out_w, out_h)
+                arr, _ = box if box is not None else self._resize_nearest(arr, out_w, out_h)
                 return arr.tobytes(), out_w, out_h
             # No numpy: fallback to full size to avoid blank output.
 
-        if isinstance(frame, mss.base.ScreenShot):
-            return frame.bgra, width, height
         if isinstance(frame, (bytes, bytearray, memoryview)):
             return frame, width, height
         if np is None:
             return None, 0, 0
         return np.asarray(frame).tobytes(), width, height
 
-    def _present_pixmap(self, pixmap: QtGui.QPixmap) -> None:
-        label_size = self.label.size()
-        if pixmap.size() == label_size:
-            self.label.setPixmap(pixmap)
-            return
-
-        transform = QtCore.Qt.FastTransformation if self._fast_mode else QtCore.Qt.SmoothTransformation
-        scaled = pixmap.scaled(label_size, QtCore.Qt.KeepAspectRatio, transform)
-        self.label.setPixmap(scaled)
-
     def _present_gpu_frame(self, data: bytes, width: int, height: int) -> None:
         self._gl_view.set_frame(data, width, height)
 
-    def _apply_blob_overlay(self, pixmap: QtGui.QPixmap, width: int, height: int) -> QtGui.QPixmap:
+    def _paint_raster_overlay(self, painter: QtGui.QPainter, off_x: int, off_y: int, disp_w: int, disp_h: int) -> None:
         if not self._blob_params.get("enabled"):
-            return pixmap
-        boxes = self._blob_last_boxes
-        mask = self._blob_last_mask
-        if not boxes and not (self._blob_params.get("show_mask") and mask is not None):
-            return pixmap
-
-        out = QtGui.QPixmap(pixmap)
-        painter = QtGui.QPainter(out)
-        painter.setRenderHint(QtGui.QPainter.Antialiasing, False)
-        scale_x = out.width() / width if width > 0 else 1.0
-        scale_y = out.height() / height if height > 0 else 1.0
-
-        if self._blob_params.get("show_mask") and mask is not None:
-            mask_img = self._mask_to_image(mask, out.width(), out.height())
-            if mask_img is not None:
-                painter.setOpacity(0.35)
-                painter.drawImage(0, 0, mask_img)
-                painter.setOpacity(1.0)
-
-        if self._blob_params.get("show_boxes"):
-            color = self._blob_params.get("color", (0, 255, 0))
-            pen = QtGui.QPen(QtGui.QColor(*color))
-            pen.setWidth(self._blob_params.get("line", 2))
-            painter.setPen(pen)
-            for x, y, w, h in boxes:
-                rx = int(x * scale_x)
-                ry = int(y * scale_y)
-                rw = max(1, int(w * scale_x))
-                rh = max(1, int(h * scale_y))
-                painter.drawRect(rx, ry, rw, rh)
-
-        if self._blob_params.get("show_centers"):
-            color = self._blob_params.get("color", (0, 255, 0))
-            pen = QtGui.QPen(QtGui.QColor(*color))
-            pen.setWidth(1)
-            painter.setPen(pen)
-            for x, y, w, h in boxes:
-                cx = int((x + w * 0.5) * scale_x)
-                cy = int((y + h * 0.5) * scale_y)
-                painter.drawLine(cx - 6, cy, cx + 6, cy)
-                painter.drawLine(cx, cy - 6, cx, cy + 6)
-
-        self._draw_blob_links_and_labels(painter, boxes, scale_x, scale_y, 0, 0)
-
-        painter.end()
-        return out
+            return
+        f_width, f_height = self._frame_size
+        self._paint_blob_overlay(painter, f_width, f_height, off_x, off_y, disp_w, disp_h)
 
     def _update_gpu_overlay(self, frame_w: int, frame_h: int) -> None:
         if not self._blob_params.get("enabled"):
@@ -911,6 +1113,28 @@ class StreamWindow(QtWidgets.QMainWindow):
         overlay = QtGui.QPixmap(view_w, view_h)
         overlay.fill(QtCore.Qt.transparent)
         painter = QtGui.QPainter(overlay)
+        self._paint_blob_overlay(painter, frame_w, frame_h, off_x, off_y, disp_w, disp_h)
+        painter.end()
+        self._blob_overlay_pixmap = overlay
+        self._blob_overlay_params = params
+        self._overlay.setPixmap(overlay)
+
+    def _paint_blob_overlay(
+        self,
+        painter: QtGui.QPainter,
+        frame_w: int,
+        frame_h: int,
+        off_x: int,
+        off_y: int,
+        disp_w: int,
+        disp_h: int,
+    ) -> None:
+        """Mask, boxes, centres, links and labels in display coordinates."""
+        boxes = self._blob_last_boxes
+        mask = self._blob_last_mask
+        show_mask = self._blob_params.get("show_mask")
+        if disp_w <= 0 or disp_h <= 0:
+            return
         painter.setRenderHint(QtGui.QPainter.Antialiasing, False)
 
         if show_mask and mask is not None:
@@ -949,11 +1173,6 @@ class StreamWindow(QtWidgets.QMainWindow):
 
             self._draw_blob_links_and_labels(painter, boxes, scale_x, scale_y, off_x, off_y)
 
-        painter.end()
-        self._blob_overlay_pixmap = overlay
-        self._blob_overlay_params = params
-        self._overlay.setPixmap(overlay)
-
     def _draw_blob_links_and_labels(
         self,
         painter: QtGui.QPainter,
@@ -1049,9 +1268,11 @@ class StreamWindow(QtWidgets.QMainWindow):
         h, w = mask.shape
         if h <= 0 or w <= 0:
             return None
-        qimg = QtGui.QImage(mask.data, w, h, QtGui.QImage.Format_Grayscale8).copy()
+        qimg = qimage_from_array(mask)
+        if qimg is None:
+            return None
         if w != out_w or h != out_h:
-            qimg = qimg.scaled(out_w, out_h, QtCore.Qt.IgnoreAspectRatio, QtCore.Qt.FastTransformation)
+            return qimg.scaled(out_w, out_h, QtCore.Qt.IgnoreAspectRatio, QtCore.Qt.FastTransformation)
         return qimg
 
     def _schedule_blob(self, frame, width: int, height: int) -> None:
@@ -1064,12 +1285,14 @@ class StreamWindow(QtWidgets.QMainWindow):
             if now - self._blob_last_submit < 1.0 / max_fps:
                 return
         if self._blob_future and not self._blob_future.done():
-            self._blob_pending = (frame, width, height)
+            # The next frame is submitted once the worker is free; capture
+            # buffers may be pooled, so frames are never kept for later.
             return
         frame_copy = self._copy_frame_for_blob(frame, width, height)
         if frame_copy is None:
             return
         params = dict(self._blob_params)
+        params["downscale"] = self._downscale_mode
         state = self._get_blob_state()
         self._blob_future = self._blob_executor.submit(
             self._compute_blob_boxes_worker,
@@ -1080,12 +1303,14 @@ class StreamWindow(QtWidgets.QMainWindow):
             state,
         )
         self._blob_last_submit = time.perf_counter()
+        self._mark("blob_submit")
 
     def _poll_blob_future(self) -> None:
         if not self._blob_future or not self._blob_future.done():
             return
         try:
-            boxes, mask, prev, bg, skip_count = self._blob_future.result()
+            boxes, mask, prev, bg, skip_count, started, done = self._blob_future.result()
+            self._latency.add("blob", done - started)
             with self._blob_lock:
                 self._blob_prev = prev
                 self._blob_bg = bg
@@ -1099,10 +1324,6 @@ class StreamWindow(QtWidgets.QMainWindow):
             self._log.exception("blob compute failed")
         finally:
             self._blob_future = None
-            if self._blob_pending:
-                pending = self._blob_pending
-                self._blob_pending = None
-                self._schedule_blob(*pending)
 
     def _get_blob_state(self):
         with self._blob_lock:
@@ -1119,9 +1340,11 @@ class StreamWindow(QtWidgets.QMainWindow):
         arr = self._frame_to_bgra_array(frame, width, height)
         if arr is None:
             return None
-        return np.ascontiguousarray(arr)
+        # Always a real copy: the capture buffer may go back to its pool.
+        return np.array(arr, copy=True, order="C")
 
     def _compute_blob_boxes_worker(self, arr, width: int, height: int, params: dict, state):
+        started = time.perf_counter()
         prev, bg, skip_count = state
         boxes, mask, prev, bg, skip_count = self._compute_blob_boxes_data(
             arr,
@@ -1132,7 +1355,7 @@ class StreamWindow(QtWidgets.QMainWindow):
             bg,
             skip_count,
         )
-        return boxes, mask, prev, bg, skip_count
+        return boxes, mask, prev, bg, skip_count, started, time.perf_counter()
 
     def _compute_blob_boxes_data(
         self,
@@ -1156,16 +1379,23 @@ class StreamWindow(QtWidgets.QMainWindow):
             skip_count = 0
 
         scale = max(0.1, params.get("scale", 50) / 100.0)
-        if scale < 1.0 and cv2 is not None:
-            new_w = max(1, int(width * scale))
-            new_h = max(1, int(height * scale))
+        new_w = max(1, int(width * scale))
+        new_h = max(1, int(height * scale))
+        resize = scale < 1.0 and arr.shape[:2] != (new_h, new_w)
+        if resize and cv2 is not None:
             arr = cv2.resize(arr, (new_w, new_h), interpolation=cv2.INTER_AREA)
-        elif scale < 1.0 and np is not None:
-            new_w = max(1, int(width * scale))
-            new_h = max(1, int(height * scale))
-            y_idx = (np.linspace(0, arr.shape[0] - 1, new_h)).astype(np.int32)
-            x_idx = (np.linspace(0, arr.shape[1] - 1, new_w)).astype(np.int32)
-            arr = arr[y_idx[:, None], x_idx]
+        elif resize and np is not None and params.get("downscale") == "box":
+            # The worker's own pyramid: its buffers are reused by the next
+            # job only, which starts after this one returned.
+            self._blob_pyramid.set_frame(arr)
+            try:
+                arr = self._blob_pyramid.downscale(new_w, new_h)
+            finally:
+                self._blob_pyramid.set_frame(None)
+        elif resize and np is not None:
+            plan = self._blob_resize_plans.get(arr.shape[1], arr.shape[0], new_w, new_h)
+            out = None if plan.strided else self._blob_buffers.get((new_h, new_w) + arr.shape[2:])
+            arr = plan.apply(arr, out)
 
         gray = None
         if cv2 is not None:
@@ -1263,11 +1493,9 @@ class StreamWindow(QtWidgets.QMainWindow):
         return boxes, mask, prev, bg, skip_count
 
     def _frame_to_bgra_array(self, frame, width: int, height: int):
+        # Single place where capture data becomes an array view (no copy).
         if np is None:
             return None
-        if isinstance(frame, mss.base.ScreenShot):
-            arr = np.frombuffer(frame.bgra, dtype=np.uint8).reshape(height, width, 4)
-            return arr
         if isinstance(frame, (bytes, bytearray, memoryview)):
             arr = np.frombuffer(frame, dtype=np.uint8)
             if arr.size == width * height * 4:
@@ -1277,12 +1505,120 @@ class StreamWindow(QtWidgets.QMainWindow):
             return frame
         return None
 
-    def _tick_fps(self) -> None:
-        self._frame_count += 1
+    def _emit_probe_results(self) -> None:
+        source = self._sources.get("auto")
+        if not isinstance(source, AutoCaptureSource):
+            return
+        version, results = source.probe_results()
+        if version == self._probe_version:
+            return
+        self._probe_version = version
+        active = source.active_backend()
+        self.capture_probe_updated.emit(
+            [
+                {
+                    "name": result.name,
+                    "latency_ms": result.latency_ms,
+                    "age_ms": result.age_ms,
+                    "failure_rate": result.failure_rate,
+                    "usable": result.usable,
+                    "active": result.name == active,
+                }
+                for result in results
+            ]
+        )
+
+    def _quality_user_values(self) -> dict:
+        user = self._quality_user
+        values = {"scale": user["scale"]}
+        if self._blob_params.get("enabled"):
+            values["blob_scale"] = user["blob_scale"]
+            if user["blob_fps"] > 0:
+                values["blob_fps"] = user["blob_fps"]
+        return values
+
+    def _quality_status(self, decision=None) -> str:
+        text = self._quality.describe(self._quality_user_values())
+        if decision is not None:
+            action = "baisse" if decision.direction < 0 else "hausse"
+            text = f"{text} ({action} {KNOBS[decision.knob].label}: {decision.reason})"
+        return text
+
+    def _apply_quality(self) -> None:
+        """Write the effective knobs: the user's value, lowered by the controller."""
+        user = self._quality_user
+        quality = self._quality
+        scale = quality.value("scale", user["scale"]) if quality else user["scale"]
+        blob_scale = quality.value("blob_scale", user["blob_scale"]) if quality else user["blob_scale"]
+        blob_fps = user["blob_fps"]
+        if quality and blob_fps > 0:
+            blob_fps = quality.value("blob_fps", blob_fps)
+        if scale != self._scale_percent:
+            self._scale_percent = scale
+            self._resize_plans.clear()
+        if self._blob_params.get("scale") != blob_scale:
+            self._blob_params["scale"] = blob_scale
+            self._blob_reset = True
+        self._blob_params["max_fps"] = blob_fps
+
+    def _update_quality(self, timing: dict, latency: dict) -> None:
+        blob_ms = blob_interval_ms = None
+        if self._blob_params.get("enabled") and "blob" in latency:
+            blob_ms = latency["blob"][0]
+            max_fps = float(self._blob_params.get("max_fps", 0) or 0)
+            if max_fps > 0:
+                blob_interval_ms = 1000.0 / max_fps
+        decision = self._quality.evaluate(
+            self._target_fps,
+            timing.get("busy_p95_ms", 0.0),
+            timing.get("missed", 0),
+            blob_ms,
+            blob_interval_ms,
+            self._quality_user_values(),
+        )
+        if decision is None:
+            return
+        self._apply_quality()
+        self._invalidate_presented()
+        # Measure the new setting only, not a window mixing both.
+        self.scheduler.reset_stats()
+        self._latency.clear()
+        self.quality_changed.emit(self._quality_status(decision))
+
+    def _tick_fps(self, presented: bool = True) -> None:
+        if presented:
+            self._frame_count += 1
         now = time.perf_counter()
         elapsed = now - self._fps_last
         if elapsed >= 1.0:
             fps = self._frame_count / elapsed
             self.fps_updated.emit(fps)
+            stats = self._mailbox.stats()
+            rates = {
+                field: (getattr(stats, field) - getattr(self._mailbox_last, field)) / elapsed
+                for field in MailboxStats._fields
+            }
+            self._mailbox_last = stats
+            for counter in ("pool_drops", "pool_allocations"):
+                value = self._capture_counter(counter)
+                last = self._capture_counters_last.get(counter, 0)
+                # The counter restarts with a new source.
+                rates[counter] = (value - last if value >= last else value) / elapsed
+                self._capture_counters_last[counter] = value
+            self.capture_stats_updated.emit(rates)
+            detector = self._change_detector
+            self.change_stats_updated.emit(detector.hits, detector.misses)
+            detector.hits = 0
+            detector.misses = 0
+            self._emit_probe_results()
+            latency = self._latency.percentiles()
+            timing = self.scheduler.stats()
+            allocations = self._effects_allocation_count()
+            timing["buffer_allocs"] = max(0, allocations - self._effects_allocations)
+            self._effects_allocations = allocations
+            self.latency_updated.emit(latency)
+            self.frame_timing_updated.emit(timing)
+            if self._quality is not None:
+                self._update_quality(timing, latency)
             self._frame_count = 0
             self._fps_last = now
@@ -0,0 +1,116 @@
+import threading
+
+import pytest
+
+import capture_sources
+from capture_sources import MssCaptureSource, release_thread_capture_resources
+from capture_thread import CaptureThread, FrameMailbox
+
+
+class FakeGrabber:
+    created = []
+
+    def __init__(self):
+        self.thread = threading.get_ident()
+        self.closed_on = None
+        FakeGrabber.created.append(self)
+
+    def grab_into(self, left, top, out):
+        assert threading.get_ident() == self.thread
+        return True
+
+    def close(self):
+        self.closed_on = threading.get_ident()
+
+
+class FakeMss:
+    def grab(self, monitor):
+        raise AssertionError("GDI path expected")
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def source(monkeypatch):
+    monkeypatch.setattr(capture_sources, "GDI_AVAILABLE", True)
+    monkeypatch.setattr(capture_sources, "GdiGrabber", FakeGrabber)
+    monkeypatch.setattr(capture_sources.mss, "mss", FakeMss)
+    FakeGrabber.created = []
+    source = MssCaptureSource(0)
+    source.start(30)
+    yield source
+    source.stop()
+    release_thread_capture_resources()
+
+
+def _run_threaded(source, frames=3):
+    mailbox = FrameMailbox()
+    done = threading.Event()
+    count = []
+
+    def grab():
+        frame = source.grab((0, 0, 8, 4))
+        count.append(frame)
+        if len(count) >= frames:
+            done.set()
+        return frame
+
+    thread = CaptureThread(grab, mailbox, 200, on_exit=release_thread_capture_resources)
+    thread.start()
+    assert done.wait(5.0)
+    thread.stop()
+    assert not thread.is_alive()
+    return thread
+
+
+def test_grabber_per_thread_across_threaded_toggle(source):
+    main = threading.get_ident()
+
+    _run_threaded(source)
+    assert len(FakeGrabber.created) == 1
+    first = FakeGrabber.created[0]
+    assert first.thread != main
+    assert first.closed_on == first.thread
+
+    # Unthreaded: the GUI thread grabs with a grabber of its own.
+    assert source.grab((0, 0, 8, 4)) is not None
+    assert len(FakeGrabber.created) == 2
+    second = FakeGrabber.created[1]
+    assert second.thread == main
+
+    # Threaded again: the GUI thread closes its grabber, the new thread makes one.
+    release_thread_capture_resources()
+    assert second.closed_on == main
+    _run_threaded(source)
+    assert len(FakeGrabber.created) == 3
+    third = FakeGrabber.created[2]
+    assert third.thread != main
+    assert third.closed_on == third.thread
+
+
+def test_stop_leaves_other_threads_grabbers_to_them(source):
+    ready = threading.Event()
+    stopped = threading.Event()
+    grabbed_again = threading.Event()
+
+    def worker():
+        source.grab((0, 0, 8, 4))
+        ready.set()
+        stopped.wait(5.0)
+        source.start(30)
+        source.grab((0, 0, 8, 4))
+        grabbed_again.set()
+        release_thread_capture_resources()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    assert ready.wait(5.0)
+    first = FakeGrabber.created[0]
+    source.stop()
+    assert first.closed_on is None
+    stopped.set()
+    assert grabbed_again.wait(5.0)
+    thread.join(5.0)
+    assert first.closed_on == first.thread
+    assert len(FakeGrabber.created) == 2
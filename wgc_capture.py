@@ -1,8 +1,13 @@
 import threading
+import time
 from typing import Optional
 
-import win32api
-import win32gui
+try:
+    import win32api
+    import win32gui
+except ImportError:  # pragma: no cover - non-Windows host
+    win32api = None
+    win32gui = None
 
 try:
     import numpy as np
@@ -15,7 +20,33 @@ except Exception:  # pragma: no cover - optional dependency
     wcap = None
 
 
-WGC_AVAILABLE = wcap is not None
+WGC_AVAILABLE = wcap is not None and win32gui is not None
+
+POOL_SIZE = 3
+
+
+class FrameLease:
+    """A frame handed out by ``WGCCapture.get_latest``; call ``release`` when done.
+
+    ``rect`` is the screen rectangle covered by ``data`` (None if unknown),
+    ``frame_id`` increases with every frame delivered by the capture and
+    ``timestamp`` is its arrival time (``time.perf_counter``).
+    """
+
+    __slots__ = ("data", "rect", "frame_id", "timestamp", "_release")
+
+    def __init__(self, data, release=None, rect=None, frame_id=0, timestamp=0.0):
+        self.data = data
+        self.rect = rect
+        self.frame_id = frame_id
+        self.timestamp = timestamp
+        self._release = release
+
+    def release(self) -> None:
+        release = self._release
+        self._release = None
+        if release is not None:
+            release()
 
 
 class WGCCapture:
@@ -25,9 +56,20 @@ class WGCCapture:
         self._control = None
         self._latest = None
         self._lock = threading.Lock()
+        # Triple-buffered pool: one slot being written, one latest, one leased.
+        self._slots = []
+        self._slot_rects = []
+        self._slot_stamps = []
+        self._leases = []
+        self._frame_id = 0
+        self._latest_stamp = (0, 0.0)
+        self._latest_idx = None
+        self._writing = set()
+        self._pool_drops = 0
         self._fps = 30
         self._running = False
         self._monitor_rect = None
+        self._capture_rect = None
 
     def start(self, fps: int) -> bool:
         if not WGC_AVAILABLE:
@@ -58,14 +100,16 @@ class WGCCapture:
             buf = getattr(frame, "frame_buffer", None)
             if buf is None:
                 return
-            if np is not None:
-                buf = np.ascontiguousarray(buf)
-            else:
-                try:
-                    buf = buf.copy()
-                except Exception:
-                    return
+            if np is not None and isinstance(buf, np.ndarray):
+                self._store_pooled(buf)
+                return
+            try:
+                buf = buf.copy()
+            except Exception:
+                return
             with self._lock:
+                self._frame_id += 1
+                self._latest_stamp = (self._frame_id, time.perf_counter())
                 self._latest = buf
 
         @self._capture.event
@@ -93,10 +137,91 @@ class WGCCapture:
                 pass
         self._control = None
         self._capture = None
+        with self._lock:
+            self._latest = None
+            self._latest_idx = None
+
+    def get_latest(self) -> Optional[FrameLease]:
+        with self._lock:
+            idx = self._latest_idx
+            if idx is not None:
+                self._leases[idx] += 1
+                frame_id, stamp = self._slot_stamps[idx]
+                return FrameLease(
+                    self._slots[idx],
+                    lambda: self._release_slot(idx),
+                    self._slot_rects[idx],
+                    frame_id,
+                    stamp,
+                )
+            if self._latest is None:
+                return None
+            frame_id, stamp = self._latest_stamp
+            return FrameLease(self._latest, rect=self._monitor_rect, frame_id=frame_id, timestamp=stamp)
+
+    def set_capture_rect(self, rect) -> None:
+        """Only copy this screen rectangle out of each monitor frame (None: whole monitor)."""
+        with self._lock:
+            self._capture_rect = tuple(rect) if rect is not None else None
 
-    def get_latest(self):
+    def pool_drops(self) -> int:
+        with self._lock:
+            return self._pool_drops
+
+    def _store_pooled(self, buf) -> None:
+        stamp = time.perf_counter()
+        with self._lock:
+            src, rect = self._crop_source(buf)
+            idx = self._acquire_slot(src.shape, src.dtype)
+            if idx is None:
+                self._pool_drops += 1
+                return
+            slot = self._slots[idx]
+            self._writing.add(idx)
+        # The slot is neither latest nor leased, so no reader can see it yet.
+        np.copyto(slot, src)
+        with self._lock:
+            self._writing.discard(idx)
+            self._frame_id += 1
+            self._slot_rects[idx] = rect
+            self._slot_stamps[idx] = (self._frame_id, stamp)
+            self._latest_idx = idx
+            self._latest = None
+
+    def _crop_source(self, buf):
+        mon_rect = self._monitor_rect
+        target = self._capture_rect
+        if mon_rect is None or target is None:
+            return buf, mon_rect
+        mon_left, mon_top = mon_rect[0], mon_rect[1]
+        rel_left = max(0, target[0] - mon_left)
+        rel_top = max(0, target[1] - mon_top)
+        rel_right = min(buf.shape[1], target[2] - mon_left)
+        rel_bottom = min(buf.shape[0], target[3] - mon_top)
+        if rel_right <= rel_left or rel_bottom <= rel_top:
+            return buf, mon_rect
+        rect = (mon_left + rel_left, mon_top + rel_top, mon_left + rel_right, mon_top + rel_bottom)
+        return buf[rel_top:rel_bottom, rel_left:rel_right], rect
+
+    def _acquire_slot(self, shape, dtype) -> Optional[int]:
+        for idx, slot in enumerate(self._slots):
+            if idx == self._latest_idx or idx in self._writing or self._leases[idx] > 0:
+                continue
+            if slot.shape != shape or slot.dtype != dtype:
+                self._slots[idx] = np.empty(shape, dtype=dtype)
+            return idx
+        if len(self._slots) < POOL_SIZE:
+            self._slots.append(np.empty(shape, dtype=dtype))
+            self._slot_rects.append(None)
+            self._slot_stamps.append((0, 0.0))
+            self._leases.append(0)
+            return len(self._slots) - 1
+        return None
+
+    def _release_slot(self, idx: int) -> None:
         with self._lock:
-            return self._latest
+            if self._leases[idx] > 0:
+                self._leases[idx] -= 1
 
     def get_monitor_rect(self):
         return self._monitor_rect
@@ -0,0 +1,291 @@
+import ctypes
+import threading
+import time
+from typing import Callable, List, NamedTuple, Optional, Protocol, Tuple
+
+from logger_utils import get_logger
+
+try:
+    import win32api
+    import win32gui
+except ImportError:  # pragma: no cover - non-Windows host
+    win32api = None
+    win32gui = None
+
+
+Rect = Tuple[int, int, int, int]
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_DESTROY = 0x8001
+EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+WINEVENT_OUTOFCONTEXT = 0x0000
+OBJID_WINDOW = 0
+
+
+class WindowGeometry(NamedTuple):
+    window_rect: Rect
+    client_rect: Rect  # client area in screen coordinates
+    monitor_index: Optional[int]
+    monitor_rect: Optional[Rect]
+
+
+class GeometryProvider(Protocol):
+    """OS access used by WindowGeometryTracker; swap it for a fake off Windows."""
+
+    def is_window(self, hwnd: int) -> bool:
+        ...
+
+    def window_rect(self, hwnd: int) -> Rect:
+        ...
+
+    def client_rect(self, hwnd: int) -> Rect:
+        ...
+
+    def monitor_rects(self) -> List[Rect]:
+        ...
+
+    def foreground_window(self) -> int:
+        ...
+
+    def watch(self, hwnd: int, on_change: Callable[[str], None]) -> Optional[Callable[[], None]]:
+        """Call ``on_change("geometry" | "foreground" | "destroyed")`` on OS events.
+
+        Returns an unwatch callable, or None when events are not available.
+        """
+        ...
+
+
+class Win32GeometryProvider:
+    def is_window(self, hwnd: int) -> bool:
+        return bool(win32gui.IsWindow(hwnd))
+
+    def window_rect(self, hwnd: int) -> Rect:
+        return tuple(win32gui.GetWindowRect(hwnd))
+
+    def client_rect(self, hwnd: int) -> Rect:
+        left, top, right, bottom = win32gui.GetClientRect(hwnd)
+        tl = win32gui.ClientToScreen(hwnd, (left, top))
+        br = win32gui.ClientToScreen(hwnd, (right, bottom))
+        return tl[0], tl[1], br[0], br[1]
+
+    def monitor_rects(self) -> List[Rect]:
+        return [tuple(mrect) for _, _, mrect in win32api.EnumDisplayMonitors()]
+
+    def foreground_window(self) -> int:
+        return win32gui.GetForegroundWindow()
+
+    def watch(self, hwnd: int, on_change: Callable[[str], None]) -> Optional[Callable[[], None]]:
+        # Out-of-context hooks are delivered through the message loop of the
+        # calling thread, so this must run on the Qt GUI thread.
+        windll = getattr(ctypes, "windll", None)
+        if windll is None:
+            return None
+        from ctypes import wintypes
+
+        user32 = windll.user32
+        proc_type = ctypes.WINFUNCTYPE(
+            None,
+            wintypes.HANDLE,
+            wintypes.DWORD,
+            wintypes.HWND,
+            wintypes.LONG,
+            wintypes.LONG,
+            wintypes.DWORD,
+            wintypes.DWORD,
+        )
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        user32.SetWinEventHook.argtypes = [
+            wintypes.DWORD,
+            wintypes.DWORD,
+            wintypes.HMODULE,
+            proc_type,
+            wintypes.DWORD,
+            wintypes.DWORD,
+            wintypes.DWORD,
+        ]
+        user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+
+        def on_event(_hook, event, event_hwnd, id_object, _id_child, _thread, _time):
+            if event == EVENT_SYSTEM_FOREGROUND:
+                on_change("foreground")
+                return
+            if event_hwnd != hwnd or id_object != OBJID_WINDOW:
+                return
+            on_change("destroyed" if event == EVENT_OBJECT_DESTROY else "geometry")
+
+        proc = proc_type(on_event)
+        pid = wintypes.DWORD()
+        user32.GetWindowThreadProcessId(wintypes.HWND(hwnd), ctypes.byref(pid))
+        hooks = [
+            user32.SetWinEventHook(
+                EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND, None, proc, 0, 0, WINEVENT_OUTOFCONTEXT
+            ),
+            user32.SetWinEventHook(
+                EVENT_OBJECT_DESTROY, EVENT_OBJECT_DESTROY, None, proc, pid.value, 0, WINEVENT_OUTOFCONTEXT
+            ),
+            user32.SetWinEventHook(
+                EVENT_OBJECT_LOCATIONCHANGE,
+                EVENT_OBJECT_LOCATIONCHANGE,
+                None,
+                proc,
+                pid.value,
+                0,
+                WINEVENT_OUTOFCONTEXT,
+            ),
+        ]
+        hooks = [hook for hook in hooks if hook]
+        if not hooks:
+            return None
+        # The ctypes callback must stay alive for as long as the hooks exist.
+        keepalive = [proc]
+
+        def unwatch() -> None:
+            for hook in hooks:
+                user32.UnhookWinEvent(hook)
+            hooks.clear()
+            keepalive.clear()
+
+        return unwatch
+
+
+def default_geometry_provider() -> Optional[GeometryProvider]:
+    if win32gui is None or win32api is None:
+        return None
+    return Win32GeometryProvider()
+
+
+class WindowGeometryTracker:
+    """Cached geometry of one window, refreshed on OS events.
+
+    Without events (or if one is missed) the cache is re-validated every
+    ``revalidate_interval`` seconds with a single GetWindowRect; the client
+    area and monitor are only queried again when that rect changed.
+    """
+
+    def __init__(
+        self,
+        hwnd: int,
+        provider: Optional[GeometryProvider] = None,
+        revalidate_interval: float = 0.5,
+        fallback_interval: float = 0.1,
+    ):
+        self._hwnd = hwnd
+        self._provider = provider if provider is not None else default_geometry_provider()
+        self._revalidate_interval = revalidate_interval
+        self._fallback_interval = fallback_interval
+        self._interval = fallback_interval
+        self._lock = threading.Lock()
+        self._unwatch = None
+        self._generation = 0
+        self._foreground_generation = 0
+        self._geometry = None
+        self._geometry_gen = -1
+        self._geometry_checked = 0.0
+        self._alive = False
+        self._alive_gen = -1
+        self._alive_checked = 0.0
+        self._foreground = False
+        self._foreground_gen = -1
+        self._foreground_checked = 0.0
+        self._log = get_logger()
+
+    def watch_events(self) -> bool:
+        if self._provider is None or self._unwatch is not None:
+            return self._unwatch is not None
+        try:
+            self._unwatch = self._provider.watch(self._hwnd, self._on_event)
+        except Exception:
+            self._log.exception("window event hooks failed")
+            self._unwatch = None
+        self._interval = self._revalidate_interval if self._unwatch else self._fallback_interval
+        return self._unwatch is not None
+
+    def close(self) -> None:
+        if self._unwatch is not None:
+            try:
+                self._unwatch()
+            except Exception:
+                pass
+        self._unwatch = None
+        self._interval = self._fallback_interval
+
+    def invalidate(self) -> None:
+        """Drop the cached geometry and focus, for changes no event reports."""
+        self._generation += 1
+        self._foreground_generation += 1
+
+    def geometry(self) -> Optional[WindowGeometry]:
+        if self._provider is None:
+            return None
+        now = time.perf_counter()
+        with self._lock:
+            geo = self._geometry
+            fresh = geo is not None and self._geometry_gen == self._generation
+            if fresh and now - self._geometry_checked < self._interval:
+                return geo
+            gen = self._generation
+            try:
+                if not fresh or self._provider.window_rect(self._hwnd) != geo.window_rect:
+                    geo = self._query()
+            except Exception:
+                self._geometry = None
+                return None
+            self._geometry = geo
+            self._geometry_gen = gen
+            self._geometry_checked = now
+            return geo
+
+    def is_window(self) -> bool:
+        if self._provider is None:
+            return False
+        now = time.perf_counter()
+        with self._lock:
+            if self._alive_gen == self._generation and now - self._alive_checked < self._interval:
+                return self._alive
+            gen = self._generation
+            try:
+                self._alive = self._provider.is_window(self._hwnd)
+            except Exception:
+                self._alive = False
+            self._alive_gen = gen
+            self._alive_checked = now
+            return self._alive
+
+    def is_foreground(self) -> bool:
+        if self._provider is None:
+            return False
+        now = time.perf_counter()
+        with self._lock:
+            gen = self._foreground_generation
+            if self._foreground_gen == gen and now - self._foreground_checked < self._interval:
+                return self._foreground
+            try:
+                self._foreground = self._provider.foreground_window() == self._hwnd
+            except Exception:
+                self._foreground = False
+            self._foreground_gen = gen
+            self._foreground_checked = now
+            return self._foreground
+
+    def _on_event(self, kind: str) -> None:
+        # Called on the GUI thread; readers compare generations under the lock.
+        if kind == "foreground":
+            self._foreground_generation += 1
+        else:
+            self._generation += 1
+
+    def _query(self) -> WindowGeometry:
+        window_rect = self._provider.window_rect(self._hwnd)
+        client_rect = self._provider.client_rect(self._hwnd)
+        monitor_index, monitor_rect = None, None
+        cx = (window_rect[0] + window_rect[2]) // 2
+        cy = (window_rect[1] + window_rect[3]) // 2
+        monitors = self._provider.monitor_rects()
+        for idx, mrect in enumerate(monitors):
+            if mrect[0] <= cx < mrect[2] and mrect[1] <= cy < mrect[3]:
+                monitor_index, monitor_rect = idx, mrect
+                break
+        else:
+            if monitors:
+                monitor_index, monitor_rect = 0, monitors[0]
+        return WindowGeometry(window_rect, client_rect, monitor_index, monitor_rect)